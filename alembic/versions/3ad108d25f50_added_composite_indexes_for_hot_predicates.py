@@ -0,0 +1,50 @@
+"""Added composite indexes for hot predicates
+
+Revision ID: 3ad108d25f50
+Revises: aebdc1c38237
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3ad108d25f50'
+down_revision: Union[str, Sequence[str], None] = 'aebdc1c38237'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_bookings_bike_status_window', 'bookings', ['bike_id', 'status', 'start_time', 'end_time']),
+    ('ix_bookings_customer_created', 'bookings', ['customer_id', 'created_at']),
+    ('ix_bikes_type_engine_cc', 'bikes', ['bike_type', 'engine_cc']),
+    ('ix_bikes_shop_type', 'bikes', ['shop_id', 'bike_type']),
+    ('ix_reviews_shop_created', 'reviews', ['shop_id', 'created_at']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block, and
+    # IF NOT EXISTS lets a half-finished run be retried safely.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
@@ -0,0 +1,52 @@
+"""Added pricing_rules table
+
+Revision ID: 5c1e8a7d2f94
+Revises: 9e5fcef114e1
+Create Date: 2026-10-18 18:12:44.318520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e8a7d2f94'
+down_revision: Union[str, Sequence[str], None] = '9e5fcef114e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('pricing_rules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('shop_id', sa.Integer(), nullable=False),
+    sa.Column('bike_id', sa.Integer(), nullable=True),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('multiplier_percent', sa.Integer(), nullable=False),
+    sa.Column('days_of_week', sa.String(), nullable=True),
+    sa.Column('start_hour', sa.Integer(), nullable=True),
+    sa.Column('end_hour', sa.Integer(), nullable=True),
+    sa.Column('start_date', sa.Date(), nullable=True),
+    sa.Column('end_date', sa.Date(), nullable=True),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['bike_id'], ['bikes.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['shop_id'], ['shops.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_pricing_rules_bike_id'), 'pricing_rules', ['bike_id'], unique=False)
+    op.create_index(op.f('ix_pricing_rules_id'), 'pricing_rules', ['id'], unique=False)
+    op.create_index(op.f('ix_pricing_rules_shop_id'), 'pricing_rules', ['shop_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_pricing_rules_shop_id'), table_name='pricing_rules')
+    op.drop_index(op.f('ix_pricing_rules_id'), table_name='pricing_rules')
+    op.drop_index(op.f('ix_pricing_rules_bike_id'), table_name='pricing_rules')
+    op.drop_table('pricing_rules')
@@ -0,0 +1,44 @@
+"""Added booking_daily_rollup table
+
+Revision ID: 9e5fcef114e1
+Revises: db79ad49f35a
+Create Date: 2026-10-18 16:40:05.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e5fcef114e1'
+down_revision: Union[str, Sequence[str], None] = 'db79ad49f35a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('booking_daily_rollup',
+    sa.Column('bike_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('shop_id', sa.Integer(), nullable=False),
+    sa.Column('bookings', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.Column('cancelled', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Integer(), nullable=False),
+    sa.Column('booked_seconds', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['bike_id'], ['bikes.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['shop_id'], ['shops.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('bike_id', 'day')
+    )
+    op.create_index('ix_booking_daily_rollup_shop_day', 'booking_daily_rollup', ['shop_id', 'day'], unique=False)
+    # Backfill with: python scripts/reconcile_rollups.py --start <first booking day> --end <last booking day>
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_booking_daily_rollup_shop_day', table_name='booking_daily_rollup')
+    op.drop_table('booking_daily_rollup')
@@ -0,0 +1,29 @@
+"""Added bike_inventory version
+
+Revision ID: b7d4e2a91c3f
+Revises: 5c1e8a7d2f94
+Create Date: 2026-10-18 19:05:12.774301
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d4e2a91c3f'
+down_revision: Union[str, Sequence[str], None] = '5c1e8a7d2f94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # server_default fills existing rows; the ORM sets and bumps it from here on
+    op.add_column('bike_inventory', sa.Column('version', sa.Integer(), server_default=sa.text('1'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('bike_inventory', 'version')
@@ -0,0 +1,45 @@
+"""Added deletion_jobs table
+
+Revision ID: c3f8a1d6e5b2
+Revises: b7d4e2a91c3f
+Create Date: 2026-10-19 01:10:41.512907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a1d6e5b2'
+down_revision: Union[str, Sequence[str], None] = 'b7d4e2a91c3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('deletion_jobs',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('target_id', sa.Integer(), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('total_bookings', sa.Integer(), nullable=False),
+    sa.Column('deleted_bookings', sa.Integer(), nullable=False),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_deletion_jobs_owner_id'), 'deletion_jobs', ['owner_id'], unique=False)
+    op.create_index(op.f('ix_deletion_jobs_status'), 'deletion_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_deletion_jobs_status'), table_name='deletion_jobs')
+    op.drop_index(op.f('ix_deletion_jobs_owner_id'), table_name='deletion_jobs')
+    op.drop_table('deletion_jobs')
@@ -0,0 +1,57 @@
+"""Added bookings_archive table
+
+Revision ID: db79ad49f35a
+Revises: 3ad108d25f50
+Create Date: 2026-10-18 14:02:17.551930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'db79ad49f35a'
+down_revision: Union[str, Sequence[str], None] = '3ad108d25f50'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Only creates a new, empty table - bookings itself is not rewritten or
+    # locked. Rows are moved later in small batches by scripts/archive_bookings.py.
+    op.create_table('bookings_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('bike_id', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.DateTime(), nullable=False),
+    sa.Column('end_time', sa.DateTime(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('total_price', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('confirmed_at', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['bike_id'], ['bikes.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['customer_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_bookings_archive_bike_id'), 'bookings_archive', ['bike_id'], unique=False)
+    op.create_index('ix_bookings_archive_customer_created', 'bookings_archive', ['customer_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Move archived rows back before dropping the table so no history is lost
+    op.execute(
+        "INSERT INTO bookings (id, customer_id, bike_id, start_time, end_time, status, total_price, "
+        "created_at, updated_at, confirmed_at, completed_at) "
+        "SELECT id, customer_id, bike_id, start_time, end_time, status, total_price, "
+        "created_at, updated_at, confirmed_at, completed_at FROM bookings_archive"
+    )
+    op.drop_index('ix_bookings_archive_customer_created', table_name='bookings_archive')
+    op.drop_index(op.f('ix_bookings_archive_bike_id'), table_name='bookings_archive')
+    op.drop_table('bookings_archive')
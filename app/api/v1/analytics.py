@@ -0,0 +1,125 @@
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.api.v1.oauth2 import get_current_user
+from app.db.database import get_db
+from app.db.models import Bike, BikeInventory, BookingDailyRollup, Shop, User
+from app.schemas.analytics import ShopAnalyticsOut
+from app.utils import tz
+from app.utils.intervals import DAY_SECONDS
+
+router = APIRouter(prefix="/shops", tags=["analytics"])
+
+MAX_RANGE_DAYS = 366
+COUNTERS = ("revenue", "bookings", "completed", "cancelled", "booked_seconds")
+
+
+def _daily_open_seconds(shop: Shop) -> int:
+    """Seconds per day the shop rents out bikes (24h when opening hours are not set)."""
+    if shop.opening_time and shop.closing_time and shop.closing_time > shop.opening_time:
+        opening = datetime.combine(date.min, shop.opening_time)
+        closing = datetime.combine(date.min, shop.closing_time)
+        return int((closing - opening).total_seconds())
+    return DAY_SECONDS
+
+
+def _stats(totals: dict, booked_seconds, available_seconds) -> dict:
+    return {
+        "revenue": int(totals["revenue"]),
+        "bookings": int(totals["bookings"]),
+        "completed": int(totals["completed"]),
+        "cancelled": int(totals["cancelled"]),
+        "booked_hours": round(float(booked_seconds) / 3600, 2),
+        "available_hours": round(float(available_seconds) / 3600, 2),
+        "utilization": round(float(booked_seconds) / float(available_seconds), 4) if available_seconds else 0.0,
+    }
+
+
+@router.get("/{shop_id}/analytics", response_model=ShopAnalyticsOut)
+def get_shop_analytics(
+    shop_id: int,
+    start: Optional[date] = Query(None, description="First day (UTC), defaults to 29 days before end"),
+    end: Optional[date] = Query(None, description="Last day (UTC, inclusive), defaults to today"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Revenue per day, bike and bike type, plus utilization (booked hours / available hours).
+
+    Reads only booking_daily_rollup, never the raw bookings tables.
+    """
+    shop = db.query(Shop).filter(Shop.id == shop_id).first()
+    if not shop:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Shop with ID {shop_id} not found"
+        )
+    if shop.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only view analytics for your own shop"
+        )
+
+    end = end or tz.now().date()
+    start = start or end - timedelta(days=29)
+    n_days = (end - start).days + 1
+    if n_days < 1 or n_days > MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"start must be on or before end, and the range at most {MAX_RANGE_DAYS} days"
+        )
+
+    in_range = (BookingDailyRollup.shop_id == shop_id, BookingDailyRollup.day.between(start, end))
+    sums = [func.sum(getattr(BookingDailyRollup, name)) for name in COUNTERS]
+
+    by_day = db.query(BookingDailyRollup.day, *sums).filter(*in_range).group_by(
+        BookingDailyRollup.day
+    ).order_by(BookingDailyRollup.day).all()
+    per_bike = {
+        row[0]: row[1:]
+        for row in db.query(BookingDailyRollup.bike_id, *sums).filter(*in_range).group_by(BookingDailyRollup.bike_id)
+    }
+    bikes = db.query(Bike.id, Bike.name, Bike.bike_type, BikeInventory.total_quantity).outerjoin(
+        BikeInventory, BikeInventory.bike_id == Bike.id
+    ).filter(Bike.shop_id == shop_id).order_by(Bike.id).all()
+
+    # Vectorized utilization: one array slot per bike
+    counters = np.array(
+        [[int(v or 0) for v in per_bike.get(b.id, (0,) * len(COUNTERS))] for b in bikes], dtype=np.int64
+    ).reshape(len(bikes), len(COUNTERS))
+    quantity = np.array([b.total_quantity if b.total_quantity is not None else 1 for b in bikes], dtype=np.int64)
+    available = quantity * n_days * _daily_open_seconds(shop)
+    column = {name: counters[:, i] for i, name in enumerate(COUNTERS)}
+
+    types, type_index = np.unique(np.array([b.bike_type for b in bikes], dtype=object), return_inverse=True)
+    by_type = {
+        name: np.bincount(type_index, weights=column[name], minlength=len(types)) for name in COUNTERS
+    }
+    type_available = np.bincount(type_index, weights=available, minlength=len(types))
+
+    totals = {name: column[name].sum() for name in COUNTERS}
+    return {
+        "shop_id": shop_id,
+        "start": start,
+        "end": end,
+        "totals": _stats(totals, totals["booked_seconds"], available.sum()),
+        "by_day": [
+            {"day": row[0], "revenue": int(row[1] or 0), "bookings": int(row[2] or 0),
+             "booked_hours": round(int(row[5] or 0) / 3600, 2)}
+            for row in by_day
+        ],
+        "by_bike": [
+            {"bike_id": b.id, "name": b.name, "bike_type": b.bike_type,
+             **_stats({name: column[name][i] for name in COUNTERS}, column["booked_seconds"][i], available[i])}
+            for i, b in enumerate(bikes)
+        ],
+        "by_bike_type": [
+            {"bike_type": bike_type,
+             **_stats({name: by_type[name][i] for name in COUNTERS}, by_type["booked_seconds"][i], type_available[i])}
+            for i, bike_type in enumerate(types.tolist())
+        ],
+    }
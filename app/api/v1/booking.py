@@ -1,26 +1,36 @@
+from collections import Counter
+
 from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from sqlalchemy import and_, insert, or_
 from sqlalchemy.orm import Session
 from app.utils import tz
 
 from app.utils.limiter import limiter
 from app.db.database import get_db
+from app.db.archive import customer_bookings_with_history, get_booking_with_history
+from app.db.locks import lock_bike, lock_bikes
+from app.db.pricing import price_bikes
+from app.db.retry import retry_on_conflict
+from app.db.rollups import apply_booking_transition
 from app.db.models import Booking, Bike, BikeInventory, User, Shop
-from app.schemas.booking import BookingCreate, BookingUpdate, BookingOut
+from app.schemas.booking import BookingBatchCreate, BookingCreate, BookingUpdate, BookingOut
 from app.api.v1.oauth2 import get_current_user
+from app.utils.batch import id_in
+from app.utils.responses import list_response
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
 
-def calculate_booking_price(bike: Bike, start_time, end_time) -> int:
-    duration = end_time - start_time
-    total_hours = max(duration.total_seconds() / 3600, 1)
-    full_days = int(total_hours // 24)
-    remaining_hours = total_hours - (full_days * 24)
-    return int((full_days * bike.price_per_day) + (remaining_hours * bike.price_per_hour))
+def calculate_booking_price(db: Session, bike: Bike, start_time, end_time) -> int:
+    """Price a booking from the bike's cached hourly price calendar (see app/db/pricing.py)."""
+    return int(price_bikes(db, [bike], [start_time], [end_time])[0, 0])
+
 
+def verify_shop_ownership(booking: Booking, current_user: User, db: Session, action: str = "manage") -> Bike:
+    """Helper function to verify that the current user owns the shop that owns the bike in the booking.
 
-def verify_shop_ownership(booking: Booking, current_user: User, db: Session, action: str = "manage") -> None:
-    """Helper function to verify that the current user owns the shop that owns the bike in the booking"""
+    Returns the booking's bike.
+    """
     if current_user.user_type != "shop_owner":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -41,10 +51,24 @@ def verify_shop_ownership(booking: Booking, current_user: User, db: Session, act
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"You can only {action} bookings for bikes in your shop"
         )
+    return bike
+
+
+def get_locked_booking(db: Session, booking_id: int) -> Booking | None:
+    """Load a booking and lock its bike so status and inventory changes serialize.
+
+    The booking is re-read once the lock is held, in case a concurrent request changed it.
+    """
+    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    if booking:
+        lock_bike(db, booking.bike_id)
+        db.refresh(booking)
+    return booking
 
 
 @router.post("/", response_model=BookingOut, status_code=status.HTTP_201_CREATED)
 @limiter.limit("5/minute")
+@retry_on_conflict
 def create_booking(request: Request, booking: BookingCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     """Create a new booking (customers only)"""
     if current_user.user_type != "customer":
@@ -53,24 +77,35 @@ def create_booking(request: Request, booking: BookingCreate, current_user: User
             detail="Only customers can create bookings"
         )
 
-    # Check if bike exists
-    bike = db.query(Bike).filter(Bike.id == booking.bike_id).first()
-    if not bike:
+    # Check if bike exists and takes bookings (bikes and shops being deleted in the background don't)
+    row = db.query(Bike, Shop.is_active).join(Shop, Shop.id == Bike.shop_id).filter(Bike.id == booking.bike_id).first()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Bike with ID {booking.bike_id} not found"
         )
+    bike, shop_active = row
+    if not bike.is_available or not shop_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bike is not available for booking"
+        )
 
     if booking.end_time <= booking.start_time:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Booking end time must be after the start time"
         )
+    if booking.start_time < tz.now():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Booking start time must be in the future"
+        )
+    total_price = calculate_booking_price(db, bike, booking.start_time, booking.end_time)
 
-    # Check if bike is available with row-level lock to prevent race conditions
-    inventory = db.query(BikeInventory).filter(
-        BikeInventory.bike_id == booking.bike_id
-    ).with_for_update().first()
+    # Serialize writers for this bike; everything above ran without the lock
+    lock_bike(db, booking.bike_id)
+    inventory = db.query(BikeInventory).filter(BikeInventory.bike_id == booking.bike_id).first()
     
     if not inventory or inventory.available_quantity <= 0:
         raise HTTPException(
@@ -90,18 +125,13 @@ def create_booking(request: Request, booking: BookingCreate, current_user: User
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid booking time range"
         )
-    if booking.start_time < tz.now():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Booking start time must be in the future"
-        )
     db_booking = Booking(
         customer_id=current_user.id,
         bike_id=booking.bike_id,
         start_time=booking.start_time,
         end_time=booking.end_time,
         status="pending",
-        total_price=calculate_booking_price(bike, booking.start_time, booking.end_time),
+        total_price=total_price,
     )
 
     # Update inventory
@@ -114,6 +144,120 @@ def create_booking(request: Request, booking: BookingCreate, current_user: User
     return db_booking
 
 
+@router.post("/batch", response_model=list[BookingOut], status_code=status.HTTP_201_CREATED)
+@limiter.limit("5/minute")
+@retry_on_conflict
+def create_booking_batch(
+    request: Request,
+    cart: BookingBatchCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Create several bookings in one transaction (customers only).
+
+    Either every booking in the cart is created or none is. Bikes are
+    locked in ascending bike_id order so concurrent carts sharing bikes
+    queue up instead of deadlocking.
+    """
+    if current_user.user_type != "customer":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only customers can create bookings"
+        )
+
+    items = cart.items
+    now = tz.now()
+    for item in items:
+        if item.end_time <= item.start_time:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Booking end time must be after the start time"
+            )
+        if item.start_time < now:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Booking start time must be in the future"
+            )
+    for i, item in enumerate(items):
+        for other in items[i + 1:]:
+            if item.bike_id == other.bike_id and item.start_time < other.end_time and item.end_time > other.start_time:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Cart contains overlapping bookings for bike {item.bike_id}"
+                )
+
+    bike_ids = sorted({item.bike_id for item in items})
+    rows = db.query(Bike, Shop.is_active).join(Shop, Shop.id == Bike.shop_id).filter(id_in(db, Bike.id, bike_ids)).all()
+    bikes = {bike.id: bike for bike, _ in rows}
+    missing = [bike_id for bike_id in bike_ids if bike_id not in bikes]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Bikes not found: {', '.join(map(str, missing))}"
+        )
+    closed = sorted(bike.id for bike, shop_active in rows if not bike.is_available or not shop_active)
+    if closed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bikes not available for booking: {', '.join(map(str, closed))}"
+        )
+
+    totals = price_bikes(
+        db, [bikes[item.bike_id] for item in items], [item.start_time for item in items], [item.end_time for item in items]
+    ).diagonal()
+
+    # Lock every bike up front, always in bike_id order
+    lock_bikes(db, bike_ids)
+    inventories = {
+        inventory.bike_id: inventory
+        for inventory in db.query(BikeInventory).filter(id_in(db, BikeInventory.bike_id, bike_ids))
+    }
+    wanted = Counter(item.bike_id for item in items)
+    unavailable = [
+        bike_id for bike_id in bike_ids
+        if bike_id not in inventories or inventories[bike_id].available_quantity < wanted[bike_id]
+    ]
+    if unavailable:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bikes not available for booking: {', '.join(map(str, unavailable))}"
+        )
+
+    # Every window checked against existing bookings in one query
+    overlapping = db.query(Booking.bike_id).filter(
+        Booking.status.in_(["pending", "confirmed"]),
+        or_(*[
+            and_(Booking.bike_id == item.bike_id, Booking.start_time < item.end_time, Booking.end_time > item.start_time)
+            for item in items
+        ])
+    ).distinct().all()
+    if overlapping:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bikes already booked for the requested time range: {', '.join(str(row.bike_id) for row in overlapping)}"
+        )
+
+    # One multi-row INSERT ... RETURNING (plain rows, so nothing is reloaded after commit)
+    created = db.execute(insert(Booking.__table__).returning(*Booking.__table__.c, sort_by_parameter_order=True), [
+        {
+            "customer_id": current_user.id,
+            "bike_id": item.bike_id,
+            "start_time": item.start_time,
+            "end_time": item.end_time,
+            "status": "pending",
+            "total_price": int(total),
+        }
+        for item, total in zip(items, totals)
+    ]).all()
+
+    for bike_id, count in wanted.items():
+        inventories[bike_id].available_quantity -= count
+        inventories[bike_id].rented_quantity += count
+
+    db.commit()
+    return list_response(BookingOut, created, status_code=status.HTTP_201_CREATED)
+
+
 @router.get("/user/", response_model=list[BookingOut])
 def get_user_bookings(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
@@ -121,17 +265,14 @@ def get_user_bookings(
     current_user: User = Depends(get_current_user), 
     db: Session = Depends(get_db)
 ):
-    """Get all bookings for current user with pagination"""
-    bookings = db.query(Booking).filter(
-        Booking.customer_id == current_user.id
-    ).offset(skip).limit(limit).all()
-    return bookings
+    """Get all bookings for current user with pagination (including archived ones)"""
+    return list_response(BookingOut, customer_bookings_with_history(db, current_user.id, skip, limit))
 
 
 @router.get("/{booking_id}", response_model=BookingOut)
 def get_booking(booking_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     """Get a booking by ID for the customer or owning shop."""
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = get_booking_with_history(db, booking_id)
 
     if not booking:
         raise HTTPException(
@@ -151,9 +292,10 @@ def get_booking(booking_id: int, db: Session = Depends(get_db), current_user: Us
     return booking
 
 @router.put("/{booking_id}", response_model=BookingOut)
+@retry_on_conflict
 def update_booking(booking_id: int, booking_update: BookingUpdate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     """Update a pending booking's time range."""
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = get_locked_booking(db, booking_id)
     
     if not booking:
         raise HTTPException(
@@ -209,7 +351,7 @@ def update_booking(booking_id: int, booking_update: BookingUpdate, current_user:
     booking.start_time = new_start_time
     booking.end_time = new_end_time
     if bike:
-        booking.total_price = calculate_booking_price(bike, new_start_time, new_end_time)
+        booking.total_price = calculate_booking_price(db, bike, new_start_time, new_end_time)
     
     db.commit()
     db.refresh(booking)
@@ -217,9 +359,10 @@ def update_booking(booking_id: int, booking_update: BookingUpdate, current_user:
 
 
 @router.delete("/{booking_id}", status_code=status.HTTP_204_NO_CONTENT)
+@retry_on_conflict
 def cancel_booking(booking_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     """Cancel a booking"""
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = get_locked_booking(db, booking_id)
     
     if not booking:
         raise HTTPException(
@@ -244,11 +387,17 @@ def cancel_booking(booking_id: int, current_user: User = Depends(get_current_use
         inventory.available_quantity += 1
         inventory.rented_quantity = max(0, inventory.rented_quantity - 1)
 
+    if booking.status == "confirmed":
+        bike = db.query(Bike).filter(Bike.id == booking.bike_id).first()
+        if bike:
+            apply_booking_transition(db, booking, bike.shop_id, "confirmed", "cancelled")
+
     booking.status = "cancelled"
     db.commit()
 
 
 @router.post("/{booking_id}/confirm", response_model=BookingOut)
+@retry_on_conflict
 def confirm_booking(booking_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     """Confirm a pending booking (shop owners only)"""
     if current_user.user_type != "shop_owner":
@@ -257,7 +406,7 @@ def confirm_booking(booking_id: int, current_user: User = Depends(get_current_us
             detail="Only shop owners can confirm bookings"
         )
     
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = get_locked_booking(db, booking_id)
     
     if not booking:
         raise HTTPException(
@@ -266,7 +415,7 @@ def confirm_booking(booking_id: int, current_user: User = Depends(get_current_us
         )
     
         # Verify that the current user owns the shop
-    verify_shop_ownership(booking, current_user, db, "confirm")
+    bike = verify_shop_ownership(booking, current_user, db, "confirm")
     
     # Only pending bookings can be confirmed
     if booking.status != "pending":
@@ -276,6 +425,7 @@ def confirm_booking(booking_id: int, current_user: User = Depends(get_current_us
         )
     
     
+    apply_booking_transition(db, booking, bike.shop_id, "pending", "confirmed")
     booking.status = "confirmed"
     booking.confirmed_at = tz.now()
     db.commit()
@@ -284,6 +434,7 @@ def confirm_booking(booking_id: int, current_user: User = Depends(get_current_us
 
 
 @router.post("/{booking_id}/reject", response_model=BookingOut)
+@retry_on_conflict
 def reject_booking(booking_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     """Reject a pending booking (shop owners only)"""
     if current_user.user_type != "shop_owner":
@@ -292,7 +443,7 @@ def reject_booking(booking_id: int, current_user: User = Depends(get_current_use
             detail="Only shop owners can reject bookings"
         )
     
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = get_locked_booking(db, booking_id)
     
     if not booking:
         raise HTTPException(
@@ -322,9 +473,10 @@ def reject_booking(booking_id: int, current_user: User = Depends(get_current_use
     return booking
 
 @router.post("/{booking_id}/complete", response_model=BookingOut)
+@retry_on_conflict
 def complete_booking(booking_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     """Mark a booking as completed (shop owners only)"""
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = get_locked_booking(db, booking_id)
     
     if not booking:
         raise HTTPException(
@@ -333,7 +485,7 @@ def complete_booking(booking_id: int, current_user: User = Depends(get_current_u
         )
     
     # Verify that the current user owns the shop
-    verify_shop_ownership(booking, current_user, db, "complete")
+    bike = verify_shop_ownership(booking, current_user, db, "complete")
     
     # Only confirmed bookings can be completed
     if booking.status != "confirmed":
@@ -346,6 +498,7 @@ def complete_booking(booking_id: int, current_user: User = Depends(get_current_u
     if inventory:
         inventory.available_quantity += 1
         inventory.rented_quantity = max(0, inventory.rented_quantity - 1)
+    apply_booking_transition(db, booking, bike.shop_id, "confirmed", "completed")
     booking.status = "completed"
     booking.completed_at = tz.now()
     db.commit()
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
@@ -5,8 +7,13 @@ from datetime import datetime
 
 from app.api.v1.oauth2 import get_current_user
 from app.db.database import get_db
+from app.db.locks import lock_bike
+from app.db.retry import retry_on_conflict
 from app.db.models import BikeInventory, Bike, Booking, Shop, User
 from app.schemas.inventory import BikeInventoryCreate, BikeInventoryUpdate, BikeInventoryOut, InventoryAvailability
+from app.schemas.batch import BatchOut
+from app.utils.responses import FIELDS_DESCRIPTION, columns_for, list_response, parse_fields
+from app.utils.batch import IDS_DESCRIPTION, id_in, keyed_batch, parse_ids
 
 router = APIRouter(prefix="/inventory", tags=["inventory"])
 
@@ -79,14 +86,25 @@ def get_inventory_by_bike(bike_id: int, db: Session = Depends(get_db)):
     return inventory
 
 
+@router.get("/bikes", response_model=BatchOut[BikeInventoryOut])
+def get_inventory_batch(ids: str = Query(..., description=IDS_DESCRIPTION), db: Session = Depends(get_db)):
+    """Get inventory for many bikes in one query, keyed by bike ID; bikes without inventory are listed under "missing" """
+    bike_ids = parse_ids(ids)
+    inventories = db.query(BikeInventory).filter(id_in(db, BikeInventory.bike_id, bike_ids)).all()
+    return keyed_batch(inventories, bike_ids, key="bike_id")
+
+
 @router.get("/shop/{shop_id}", response_model=list[BikeInventoryOut])
 def get_shop_inventory(
     shop_id: int,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of records to return"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
     """Get all bike inventory in a shop with pagination"""
+    selected = parse_fields(BikeInventoryOut, fields)
+
     # Check if shop exists
     shop = db.query(Shop).filter(Shop.id == shop_id).first()
     if not shop:
@@ -96,11 +114,13 @@ def get_shop_inventory(
         )
 
     # Get all bikes in this shop with their inventory
-    inventories = db.query(BikeInventory).join(Bike).filter(
+    inventories = db.query(*columns_for(BikeInventory, BikeInventoryOut, selected)).join(
+        Bike, Bike.id == BikeInventory.bike_id
+    ).filter(
         Bike.shop_id == shop_id
     ).offset(skip).limit(limit).all()
 
-    return inventories
+    return list_response(BikeInventoryOut, inventories, fields=selected)
 
 
 @router.get("/available/{bike_id}", response_model=InventoryAvailability)
@@ -123,6 +143,7 @@ def check_availability(bike_id: int, db: Session = Depends(get_db)):
 
 
 @router.put("/{bike_id}", response_model=BikeInventoryOut)
+@retry_on_conflict
 def update_inventory(bike_id: int, inventory_update: BikeInventoryUpdate,current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     """Update total quantity for a bike"""
     # Only shop owners can update inventory
@@ -150,6 +171,10 @@ def update_inventory(bike_id: int, inventory_update: BikeInventoryUpdate,current
                 detail="You do not have permission to update inventory for this bike"
             )
 
+    # Re-read the counters under the bike lock so concurrent bookings are not overwritten
+    lock_bike(db, bike_id)
+    db.refresh(inventory)
+
     # Update total quantity
     old_total = inventory.total_quantity
     inventory.total_quantity = inventory_update.total_quantity
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.api.v1.oauth2 import get_current_user
+from app.db.bulk_delete import get_job
+from app.db.database import get_db
+from app.db.models import User
+from app.schemas.jobs import DeletionJobOut
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}", response_model=DeletionJobOut)
+def get_deletion_job(job_id: str, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Get progress of a background shop/bike deletion started by the current user"""
+    job = get_job(db, job_id)
+
+    if not job or job.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found"
+        )
+
+    return job
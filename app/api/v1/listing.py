@@ -1,9 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
+from app.config import settings
+from app.db.bulk_delete import count_bookings, create_job
 from app.db.database import get_db
 from app.db.models import Bike, Shop, User
 from app.schemas.bikes import BikeCreate, BikeUpdate, BikeOut
+from app.schemas.batch import BatchOut
+from app.schemas.jobs import DeletionJobOut
 from app.api.v1.oauth2 import get_current_user
+from app.utils.responses import FIELDS_DESCRIPTION, columns_for, list_response, parse_fields
+from app.utils.batch import IDS_DESCRIPTION, id_in, keyed_batch, parse_ids
+from app.utils.conditional import (
+    CACHE_BIKE, CACHE_SHOP_BIKES, catalog_version, is_not_modified, not_modified, validator_headers, weak_etag,
+)
 
 router = APIRouter(prefix="/bikes", tags=["bikes"])
 
@@ -38,9 +50,22 @@ def create_bike(bike: BikeCreate, current_user: User = Depends(get_current_user)
     return db_bike
 
 
+@router.get("", response_model=BatchOut[BikeOut])
+def get_bikes_batch(ids: str = Query(..., description=IDS_DESCRIPTION), db: Session = Depends(get_db)):
+    """Get many bikes by ID in one query; unknown ids are listed under "missing" """
+    bike_ids = parse_ids(ids)
+    bikes = db.query(Bike).filter(id_in(db, Bike.id, bike_ids)).all()
+    return keyed_batch(bikes, bike_ids)
+
+
 @router.get("/{bike_id}", response_model=BikeOut)
-def get_bike(bike_id: int, db: Session = Depends(get_db)):
-    """Get a bike by ID"""
+def get_bike(bike_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    """Get a bike by ID (supports If-None-Match / If-Modified-Since)"""
+    last_modified, count = catalog_version(db, Bike, Bike.id == bike_id)
+    headers = validator_headers(weak_etag("bike", bike_id, last_modified, count), last_modified, CACHE_BIKE)
+    if count and is_not_modified(request, headers["ETag"], last_modified):
+        return not_modified(headers)
+
     bike = db.query(Bike).filter(Bike.id == bike_id).first()
     
     if not bike:
@@ -49,29 +74,41 @@ def get_bike(bike_id: int, db: Session = Depends(get_db)):
             detail=f"Bike with ID {bike_id} not found"
         )
     
+    response.headers.update(headers)
     return bike
 
 
 @router.get("/shop/{shop_id}", response_model=list[BikeOut])
 def get_shop_bikes(
     shop_id: int, 
+    request: Request,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of records to return"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
-    """Get all bikes in a shop with pagination"""
-    shop = db.query(Shop).filter(Shop.id == shop_id).first()
-    
-    if not shop:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Shop with ID {shop_id} not found"
-        )
+    """Get all bikes in a shop with pagination (supports If-None-Match / If-Modified-Since)"""
+    selected = parse_fields(BikeOut, fields)
+    last_modified, count = catalog_version(db, Bike, Bike.shop_id == shop_id)
+
+    # Any bike row proves the shop exists (FK); only check the shop when there are none
+    if not count:
+        shop = db.query(Shop.id).filter(Shop.id == shop_id).first()
+        if not shop:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Shop with ID {shop_id} not found"
+            )
+
+    etag = weak_etag("shop_bikes", shop_id, skip, limit, selected, last_modified, count)
+    headers = validator_headers(etag, last_modified, CACHE_SHOP_BIKES)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(headers)
     
-    bikes = db.query(Bike).filter(
+    bikes = db.query(*columns_for(Bike, BikeOut, selected)).filter(
         Bike.shop_id == shop_id
     ).offset(skip).limit(limit).all()
-    return bikes
+    return list_response(BikeOut, bikes, headers=headers, fields=selected)
 
 
 @router.put("/{bike_id}", response_model=BikeOut)
@@ -100,9 +137,22 @@ def update_bike(bike_id: int, bike_update: BikeUpdate, current_user: User = Depe
     return bike
 
 
-@router.delete("/{bike_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_bike(bike_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    """Delete a bike (owner only)"""
+@router.delete(
+    "/{bike_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={status.HTTP_202_ACCEPTED: {"model": DeletionJobOut, "description": "Deletion running in background"}},
+)
+def delete_bike(
+    bike_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delete a bike (owner only).
+
+    Bikes with many bookings are marked unavailable and deleted by a chunked
+    job on the scheduler thread; the response is then 202 with the job to
+    poll at /jobs/{id}.
+    """
     bike = db.query(Bike).filter(Bike.id == bike_id).first()
     
     if not bike:
@@ -118,5 +168,16 @@ def delete_bike(bike_id: int, current_user: User = Depends(get_current_user), db
             detail="You can only delete bikes from your shop"
         )
     
+    total_bookings = count_bookings(db, bike_id=bike_id)
+    if total_bookings > settings.bulk_delete_booking_threshold:
+        bike.is_available = False
+        job = create_job(db, "bike", bike_id, current_user.id, total_bookings)
+        db.commit()
+        return ORJSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=DeletionJobOut.model_validate(job).model_dump(mode="json"),
+        )
+
+    # passive_deletes: inventory and bookings go via ON DELETE CASCADE
     db.delete(bike)
     db.commit()
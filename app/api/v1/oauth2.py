@@ -1,3 +1,7 @@
+import hashlib
+import hmac
+import time
+
 import jwt
 from datetime import timedelta
 from app.utils import tz
@@ -65,9 +69,7 @@ def require_admin_token(request: Request):
         )
 
     client = request.client
-    client_ip = client.host if client else None
-    allowed = [h.strip() for h in settings.admin_allowed_hosts.split(",") if h.strip()]
-    if client_ip not in allowed:
+    if not admin_host_allowed(client.host if client else None):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access allowed only from server network"
@@ -87,4 +89,29 @@ def require_admin_token(request: Request):
             detail="Invalid admin token"
         )
 
-    return True
\ No newline at end of file
+    return True
+
+
+def admin_host_allowed(client_ip: str | None) -> bool:
+    allowed = [h.strip() for h in settings.admin_allowed_hosts.split(",") if h.strip()]
+    return client_ip in allowed
+
+
+def sign_admin_value(expires: int) -> str:
+    """Signed value ``<expires>.<hmac>`` for admin-only request headers, valid until ``expires`` (unix time)."""
+    digest = hmac.new(settings.admin_token.encode(), str(expires).encode(), hashlib.sha256).hexdigest()
+    return f"{expires}.{digest}"
+
+
+def verify_admin_signature(value: str, client_ip: str | None, max_age: int = 3600) -> bool:
+    """Check a signed admin header the way require_admin_token checks the bearer token.
+
+    The admin token must be configured, the client must be an allowed host and
+    the value must be an unexpired signature from ``sign_admin_value``.
+    """
+    if not settings.admin_token or not admin_host_allowed(client_ip):
+        return False
+    expires, _, _ = value.partition(".")
+    if not expires.isdigit() or not time.time() <= int(expires) <= time.time() + max_age:
+        return False
+    return hmac.compare_digest(sign_admin_value(int(expires)), value)
@@ -0,0 +1,121 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.api.v1.oauth2 import get_current_user
+from app.db.database import get_db
+from app.db.models import Bike, PricingRule, Shop, User
+from app.db.pricing import invalidate_shop
+from app.schemas.pricing import PricingRuleCreate, PricingRuleOut, PricingRuleUpdate
+
+router = APIRouter(prefix="/shops", tags=["pricing"])
+
+
+def get_owned_shop(shop_id: int, current_user: User, db: Session) -> Shop:
+    shop = db.query(Shop).filter(Shop.id == shop_id).first()
+    if not shop:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Shop with ID {shop_id} not found"
+        )
+    if shop.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only manage pricing rules for your own shop"
+        )
+    return shop
+
+
+def get_shop_rule(shop_id: int, rule_id: int, db: Session) -> PricingRule:
+    rule = db.query(PricingRule).filter(PricingRule.id == rule_id, PricingRule.shop_id == shop_id).first()
+    if not rule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Pricing rule with ID {rule_id} not found"
+        )
+    return rule
+
+
+def apply_rule_fields(rule: PricingRule, values: dict, db: Session) -> None:
+    """Copy validated fields onto the rule and check the combined conditions."""
+    if "days_of_week" in values:
+        days = values.pop("days_of_week")
+        rule.days_of_week = ",".join(str(day) for day in sorted(set(days))) if days else None
+    for key, value in values.items():
+        setattr(rule, key, value)
+
+    if rule.bike_id is not None and not db.query(Bike.id).filter(
+        Bike.id == rule.bike_id, Bike.shop_id == rule.shop_id
+    ).first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bike with ID {rule.bike_id} does not belong to this shop"
+        )
+    if rule.start_hour is not None and rule.end_hour is not None and rule.start_hour == rule.end_hour:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_hour and end_hour must differ"
+        )
+    if rule.start_date is not None and rule.end_date is not None and rule.start_date > rule.end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must be on or before end_date"
+        )
+
+
+@router.get("/{shop_id}/pricing-rules", response_model=list[PricingRuleOut])
+def get_pricing_rules(shop_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """List a shop's pricing rules (only owner)"""
+    get_owned_shop(shop_id, current_user, db)
+    return db.query(PricingRule).filter(PricingRule.shop_id == shop_id).order_by(
+        PricingRule.priority.desc(), PricingRule.id
+    ).all()
+
+
+@router.post("/{shop_id}/pricing-rules", response_model=PricingRuleOut, status_code=status.HTTP_201_CREATED)
+def create_pricing_rule(
+    shop_id: int,
+    rule: PricingRuleCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Create a pricing rule for the whole shop or one of its bikes (only owner)"""
+    get_owned_shop(shop_id, current_user, db)
+    db_rule = PricingRule(shop_id=shop_id)
+    apply_rule_fields(db_rule, rule.model_dump(), db)
+    db.add(db_rule)
+    db.commit()
+    db.refresh(db_rule)
+    invalidate_shop(shop_id)
+    return db_rule
+
+
+@router.put("/{shop_id}/pricing-rules/{rule_id}", response_model=PricingRuleOut)
+def update_pricing_rule(
+    shop_id: int,
+    rule_id: int,
+    rule_update: PricingRuleUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Update a pricing rule (only owner)"""
+    get_owned_shop(shop_id, current_user, db)
+    rule = get_shop_rule(shop_id, rule_id, db)
+    apply_rule_fields(rule, rule_update.model_dump(exclude_unset=True), db)
+    db.commit()
+    db.refresh(rule)
+    invalidate_shop(shop_id)
+    return rule
+
+
+@router.delete("/{shop_id}/pricing-rules/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_pricing_rule(
+    shop_id: int,
+    rule_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delete a pricing rule (only owner)"""
+    get_owned_shop(shop_id, current_user, db)
+    db.delete(get_shop_rule(shop_id, rule_id, db))
+    db.commit()
+    invalidate_shop(shop_id)
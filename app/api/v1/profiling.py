@@ -0,0 +1,89 @@
+import time
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import PlainTextResponse
+
+from app.api.v1.oauth2 import require_admin_token, sign_admin_value
+from app.config import settings
+from app.schemas.profiling import ProfileOut, ProfileSessionCreate, ProfileSessionOut, ProfileSignatureOut
+from app.utils.profiling import list_profiles, read_profile, sessions
+
+router = APIRouter(prefix="/admin/profiles", tags=["admin"], dependencies=[Depends(require_admin_token)])
+
+
+def require_profiling_enabled():
+    if not settings.profiling_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Profiling is disabled (PROFILING_ENABLED)"
+        )
+
+
+def session_out(session: dict) -> ProfileSessionOut:
+    return ProfileSessionOut(
+        **{**session,
+           "created_at": datetime.fromtimestamp(session["created_at"], timezone.utc),
+           "expires_at": datetime.fromtimestamp(session["expires_at"], timezone.utc)}
+    )
+
+
+@router.get("", response_model=List[ProfileOut], include_in_schema=False)
+def get_profiles(limit: int = Query(100, ge=1, le=1000)):
+    """List written profiles, newest first (operator-only)."""
+    return list_profiles(limit)
+
+
+@router.post("/signature", response_model=ProfileSignatureOut, include_in_schema=False,
+             dependencies=[Depends(require_profiling_enabled)])
+def create_profile_signature(expires_in: int = Query(300, ge=1, le=3600)):
+    """Mint an X-Profile-Request header value; requests sending it from an admin host are profiled."""
+    expires = int(time.time()) + expires_in
+    return ProfileSignatureOut(
+        header="X-Profile-Request",
+        value=sign_admin_value(expires),
+        expires_at=datetime.fromtimestamp(expires, timezone.utc),
+    )
+
+
+@router.get("/sessions", response_model=List[ProfileSessionOut], include_in_schema=False)
+def get_profile_sessions():
+    """List active background profiling sessions."""
+    return [session_out(s) for s in sessions.active()]
+
+
+@router.post("/sessions", response_model=ProfileSessionOut, status_code=status.HTTP_201_CREATED,
+             include_in_schema=False, dependencies=[Depends(require_profiling_enabled)])
+def create_profile_session(session_data: ProfileSessionCreate, request: Request):
+    """Profile one in every N requests to a route, in every worker, for a bounded time."""
+    method = session_data.method.upper()
+    if not any(getattr(route, "path", None) == session_data.route and method in getattr(route, "methods", ())
+               for route in request.app.routes):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"No route {method} {session_data.route}"
+        )
+    return session_out(sessions.add(method, session_data.route, session_data.every_n, session_data.duration_seconds))
+
+
+@router.delete("/sessions/{session_id}", status_code=status.HTTP_204_NO_CONTENT, include_in_schema=False)
+def delete_profile_session(session_id: str):
+    """Stop a background profiling session."""
+    if not sessions.remove(session_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profiling session {session_id} not found"
+        )
+
+
+@router.get("/{name}", response_class=PlainTextResponse, include_in_schema=False)
+def get_profile(name: str):
+    """Download a profile as collapsed stacks (flamegraph.pl / speedscope input)."""
+    content = read_profile(name)
+    if content is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile {name} not found"
+        )
+    return PlainTextResponse(content)
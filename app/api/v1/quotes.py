@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.database import get_db
+from app.db.models import Bike
+from app.db.pricing import price_bikes
+from app.schemas.quotes import QuoteOut, QuoteRequest
+from app.utils.batch import id_in
+from app.utils import tz
+from app.utils.limiter import limiter
+
+router = APIRouter(prefix="/quotes", tags=["quotes"])
+
+MAX_QUOTE_BIKES = 100
+MAX_QUOTE_WINDOWS = 50
+MAX_QUOTE_CELLS = 2000  # bikes x windows
+
+
+@router.post("", response_model=QuoteOut)
+@limiter.limit("30/minute")
+def create_quotes(request: Request, quote: QuoteRequest, db: Session = Depends(get_db)):
+    """
+    Price every requested bike for every candidate window in one pass,
+    including the shops' pricing rules.
+
+    Returns `items` keyed by bike id, each a list of totals (cents) aligned
+    with `windows`; unknown bike ids are listed in `missing`.
+    """
+    bike_ids = list(dict.fromkeys(quote.bike_ids))
+    if len(bike_ids) > MAX_QUOTE_BIKES or len(quote.windows) > MAX_QUOTE_WINDOWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_QUOTE_BIKES} bikes and {MAX_QUOTE_WINDOWS} windows can be quoted at once"
+        )
+    if len(bike_ids) * len(quote.windows) > MAX_QUOTE_CELLS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_QUOTE_CELLS} bike x window quotes can be requested at once"
+        )
+    if any(window.end_time <= window.start_time for window in quote.windows):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each window's end time must be after its start time"
+        )
+    now = tz.now()
+    earliest = now - timedelta(days=settings.pricing_calendar_lookback_days)
+    latest = now + timedelta(days=settings.pricing_calendar_days)
+    if any(window.start_time < earliest or window.end_time > latest for window in quote.windows):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Quote windows must end within the next {settings.pricing_calendar_days} days"
+        )
+
+    bikes = db.query(Bike.id, Bike.shop_id, Bike.price_per_hour, Bike.price_per_day).filter(
+        id_in(db, Bike.id, bike_ids)
+    ).all()
+
+    totals = price_bikes(
+        db, bikes, [w.start_time for w in quote.windows], [w.end_time for w in quote.windows]
+    )
+
+    items = {bike.id: totals[i].tolist() for i, bike in enumerate(bikes)}
+    return {
+        "windows": quote.windows,
+        "items": items,
+        "missing": [i for i in bike_ids if i not in items],
+    }
@@ -2,11 +2,18 @@ from app.utils import tz
 from app.db.database import get_db
 from app.schemas.reviews import ReviewCreate, ReviewOut, ReviewUpdate
 from app.api.v1.oauth2 import get_current_user
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from sqlalchemy.orm import Session
 
-from app.db.models import Booking, User, Bike, Review
+from app.db.archive import has_completed_booking_with_shop
+from app.db.models import User, Review
 from app.utils.sanitization import sanitize_comment
+from app.utils.responses import FIELDS_DESCRIPTION, columns_for, list_response, parse_fields
+from app.utils.conditional import (
+    CACHE_SHOP_REVIEWS, catalog_version, is_not_modified, not_modified, validator_headers, weak_etag,
+)
 
 
 router = APIRouter(prefix="/shops", tags=["reviews"]) 
@@ -23,18 +30,7 @@ def create_review(shop_id: int, review: ReviewCreate, current_user: User = Depen
         )
         
     # Verify that the customer has completed a booking with the shop
-    has_completed = (
-    db.query(Booking.id)
-    .join(Bike, Booking.bike_id == Bike.id)
-    .filter(
-        Booking.customer_id == current_user.id,
-        Booking.status == "completed",
-        Bike.shop_id == shop_id,  
-    )
-    .first()
-    is not None
-    )
-    if not has_completed:
+    if not has_completed_booking_with_shop(db, current_user.id, shop_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can only review shops you have completed a booking with"
@@ -60,15 +56,24 @@ def create_review(shop_id: int, review: ReviewCreate, current_user: User = Depen
 @router.get("/{shop_id}/reviews", response_model=list[ReviewOut])
 def get_shop_reviews(
     shop_id: int, 
+    request: Request,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of records to return"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
-    """Get all reviews for a shop with pagination"""
-    reviews = db.query(Review).filter(
+    """Get all reviews for a shop with pagination (supports If-None-Match / If-Modified-Since)"""
+    selected = parse_fields(ReviewOut, fields)
+    last_modified, count = catalog_version(db, Review, Review.shop_id == shop_id)
+    etag = weak_etag("shop_reviews", shop_id, skip, limit, selected, last_modified, count)
+    headers = validator_headers(etag, last_modified, CACHE_SHOP_REVIEWS)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(headers)
+
+    reviews = db.query(*columns_for(Review, ReviewOut, selected)).filter(
         Review.shop_id == shop_id
-    ).offset(skip).limit(limit).all()
-    return reviews
+    ).order_by(Review.created_at.desc()).offset(skip).limit(limit).all()
+    return list_response(ReviewOut, reviews, headers=headers, fields=selected)
 
 @router.put("/{shop_id}/reviews/{review_id}", response_model=ReviewOut)
 def update_review(shop_id: int, review_id: int, review_update: ReviewUpdate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
@@ -5,6 +5,7 @@ from typing import List, Optional, Literal
 from app.db.database import get_db
 from app.db.models import Bike, BikeInventory
 from app.schemas.bikes import BikeOut
+from app.utils.responses import FIELDS_DESCRIPTION, columns_for, list_response, parse_fields
 
 router = APIRouter(prefix="/search", tags=["search"])
 
@@ -19,6 +20,7 @@ def search_vehicles(
     shop_id: Optional[int] = Query(None, description="Filter by shop ID"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of records to return"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
     """
@@ -33,14 +35,17 @@ def search_vehicles(
     - shop_id: Filter by shop ID
     - skip: Number of records to skip (pagination)
     - limit: Maximum number of records to return (pagination, max 100)
+    - fields: Comma-separated BikeOut fields to return (default: all)
     
     Examples:
     - GET /api/v1/search/vehicles?vehicle_type=bike
     - GET /api/v1/search/vehicles?vehicle_type=scooty&engine_cc=150
     - GET /api/v1/search/vehicles?vehicle_type=car&cc_min=1000&cc_max=2000
     - GET /api/v1/search/vehicles?engine_cc=500&is_available=true&skip=0&limit=20
+    - GET /api/v1/search/vehicles?vehicle_type=bike&fields=id,name,price_per_day,is_available
     """
-    query = db.query(Bike)
+    selected = parse_fields(BikeOut, fields)
+    query = db.query(*columns_for(Bike, BikeOut, selected))
     
     # Filter by vehicle type
     if vehicle_type:
@@ -69,7 +74,7 @@ def search_vehicles(
         query = query.filter(Bike.shop_id == shop_id)
     
     vehicles = query.offset(skip).limit(limit).all()
-    return vehicles
+    return list_response(BikeOut, vehicles, fields=selected)
 
 
 @router.get("/vehicles/type/{vehicle_type}", response_model=List[BikeOut])
@@ -79,6 +84,7 @@ def search_vehicles_by_type(
     shop_id: Optional[int] = Query(None, description="Filter by shop ID"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of records to return"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
     """
@@ -92,13 +98,15 @@ def search_vehicles_by_type(
     - shop_id: Filter by shop ID (optional)
     - skip: Number of records to skip (pagination)
     - limit: Maximum number of records to return (pagination, max 100)
+    - fields: Comma-separated BikeOut fields to return (default: all)
     
     Examples:
     - GET /api/v1/search/vehicles/type/bike
     - GET /api/v1/search/vehicles/type/scooty?is_available=true
     - GET /api/v1/search/vehicles/type/car?shop_id=1&skip=0&limit=20
     """
-    query = db.query(Bike).filter(Bike.bike_type == vehicle_type)
+    selected = parse_fields(BikeOut, fields)
+    query = db.query(*columns_for(Bike, BikeOut, selected)).filter(Bike.bike_type == vehicle_type)
     
     if is_available is not None:
         query = query.join(BikeInventory, BikeInventory.bike_id == Bike.id)
@@ -111,4 +119,4 @@ def search_vehicles_by_type(
         query = query.filter(Bike.shop_id == shop_id)
     
     vehicles = query.offset(skip).limit(limit).all()
-    return vehicles
+    return list_response(BikeOut, vehicles, fields=selected)
@@ -1,9 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import ORJSONResponse, RedirectResponse
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+from app.config import settings
+from app.db.bulk_delete import count_bookings, create_job
 from app.db.database import get_db
-from app.db.models import Shop, User
-from app.schemas.shops import ShopCreate, ShopUpdate, ShopOut
+from app.db.models import Bike, Review, Shop, User
+from app.schemas.shops import ShopCreate, ShopUpdate, ShopOut, ShopDetailOut
+from app.schemas.batch import BatchOut
+from app.schemas.jobs import DeletionJobOut
 from app.api.v1.oauth2 import get_current_user
+from app.utils.responses import FIELDS_DESCRIPTION, columns_for, list_response, parse_fields
+from app.utils.batch import IDS_DESCRIPTION, id_in, keyed_batch, parse_ids
+from app.utils.conditional import (
+    CACHE_SHOP, catalog_version, is_not_modified, not_modified, validator_headers, weak_etag,
+)
 
 router = APIRouter(prefix="/shops", tags=["shops"])
 
@@ -27,9 +40,30 @@ def create_shop(shop: ShopCreate, current_user: User = Depends(get_current_user)
     return db_shop
 
 
+@router.get("", response_model=BatchOut[ShopOut])
+def get_shops_batch(
+    request: Request,
+    ids: Optional[str] = Query(None, description=IDS_DESCRIPTION),
+    db: Session = Depends(get_db)
+):
+    """Get many shops by ID in one query; unknown ids are listed under "missing" """
+    if ids is None:
+        # Without ids this path used to redirect to the paginated listing; keep doing so
+        return RedirectResponse(url=str(request.url.replace(path=request.url.path + "/")), status_code=307)
+
+    shop_ids = parse_ids(ids)
+    shops = db.query(Shop).filter(id_in(db, Shop.id, shop_ids)).all()
+    return keyed_batch(shops, shop_ids)
+
+
 @router.get("/{shop_id}", response_model=ShopOut)
-def get_shop(shop_id: int, db: Session = Depends(get_db)):
-    """Get a shop by ID"""
+def get_shop(shop_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    """Get a shop by ID (supports If-None-Match / If-Modified-Since)"""
+    last_modified, count = catalog_version(db, Shop, Shop.id == shop_id)
+    headers = validator_headers(weak_etag("shop", shop_id, last_modified, count), last_modified, CACHE_SHOP)
+    if count and is_not_modified(request, headers["ETag"], last_modified):
+        return not_modified(headers)
+
     shop = db.query(Shop).filter(Shop.id == shop_id).first()
     
     if not shop:
@@ -38,18 +72,66 @@ def get_shop(shop_id: int, db: Session = Depends(get_db)):
             detail=f"Shop with ID {shop_id} not found"
         )
     
+    response.headers.update(headers)
     return shop
 
 
+@router.get("/{shop_id}/detail", response_model=ShopDetailOut)
+def get_shop_detail(
+    shop_id: int,
+    reviews_limit: int = Query(10, ge=1, le=50, description="Number of latest reviews to include"),
+    db: Session = Depends(get_db)
+):
+    """Get a shop with its bikes (inventory embedded), rating summary and latest reviews.
+
+    Always four queries regardless of fleet size: shop, bikes joined with
+    inventory, rating distribution, and the first page of reviews.
+    """
+    shop = db.query(Shop).options(
+        selectinload(Shop.bikes).joinedload(Bike.inventory)
+    ).filter(Shop.id == shop_id).first()
+
+    if not shop:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Shop with ID {shop_id} not found"
+        )
+
+    distribution = dict(
+        db.query(Review.rating, func.count(Review.id))
+        .filter(Review.shop_id == shop_id)
+        .group_by(Review.rating)
+        .all()
+    )
+    review_count = sum(distribution.values())
+    average = (
+        round(sum(rating * n for rating, n in distribution.items()) / review_count, 2)
+        if review_count else None
+    )
+
+    reviews = db.query(Review).filter(
+        Review.shop_id == shop_id
+    ).order_by(Review.created_at.desc()).limit(reviews_limit).all()
+
+    return {
+        **{name: getattr(shop, name) for name in ShopOut.model_fields},
+        "bikes": shop.bikes,
+        "rating": {"average": average, "count": review_count, "distribution": distribution},
+        "reviews": reviews,
+    }
+
+
 @router.get("/", response_model=list[ShopOut])
 def get_all_shops(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of records to return"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
-    """Get all shops with pagination"""
-    shops = db.query(Shop).offset(skip).limit(limit).all()
-    return shops
+    """Get all shops with pagination, optionally restricted to a sparse fieldset"""
+    selected = parse_fields(ShopOut, fields)
+    shops = db.query(*columns_for(Shop, ShopOut, selected)).offset(skip).limit(limit).all()
+    return list_response(ShopOut, shops, fields=selected)
 
 
 @router.put("/{shop_id}", response_model=ShopOut)
@@ -77,9 +159,22 @@ def update_shop(shop_id: int, shop_update: ShopUpdate, current_user: User = Depe
     return shop
 
 
-@router.delete("/{shop_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_shop(shop_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    """Delete a shop (only owner can delete)"""
+@router.delete(
+    "/{shop_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={status.HTTP_202_ACCEPTED: {"model": DeletionJobOut, "description": "Deletion running in background"}},
+)
+def delete_shop(
+    shop_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delete a shop (only owner can delete).
+
+    Shops with many bookings are deactivated and deleted by a chunked job
+    on the scheduler thread; the response is then 202 with the job to poll
+    at /jobs/{id}.
+    """
     shop = db.query(Shop).filter(Shop.id == shop_id).first()
     
     if not shop:
@@ -94,5 +189,16 @@ def delete_shop(shop_id: int, current_user: User = Depends(get_current_user), db
             detail="You can only delete your own shop"
         )
     
+    total_bookings = count_bookings(db, shop_id=shop_id)
+    if total_bookings > settings.bulk_delete_booking_threshold:
+        shop.is_active = False
+        job = create_job(db, "shop", shop_id, current_user.id, total_bookings)
+        db.commit()
+        return ORJSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=DeletionJobOut.model_validate(job).model_dump(mode="json"),
+        )
+
+    # passive_deletes: bikes, inventory, bookings and reviews go via ON DELETE CASCADE
     db.delete(shop)
     db.commit()
@@ -0,0 +1,28 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, Query, status
+
+from app.api.v1.oauth2 import require_admin_token
+from app.db.slow_queries import slow_query_log
+from app.schemas.slow_queries import SlowQueryDumpOut, SlowQueryOut
+
+router = APIRouter(prefix="/admin/slow-queries", tags=["admin"], dependencies=[Depends(require_admin_token)])
+
+
+@router.get("", response_model=List[SlowQueryOut], include_in_schema=False)
+def get_slow_queries(limit: int = Query(50, ge=1, le=1000)):
+    """Slowest statement shapes of this worker by total time, with their EXPLAIN plans (operator-only)."""
+    return [entry.to_dict() for entry in slow_query_log.top(limit)]
+
+
+@router.post("/dump", response_model=SlowQueryDumpOut, include_in_schema=False)
+def dump_slow_queries():
+    """Write this worker's slow-query entries to a JSON file on the server."""
+    path = slow_query_log.dump()
+    return SlowQueryDumpOut(path=path, entries=len(slow_query_log.top(1000)))
+
+
+@router.delete("", status_code=status.HTTP_204_NO_CONTENT, include_in_schema=False)
+def reset_slow_queries():
+    """Forget this worker's slow-query entries."""
+    slow_query_log.reset()
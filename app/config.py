@@ -26,6 +26,74 @@ class Settings(BaseSettings):
     environment: str = "production"
     debug: bool = False
 
+    # Warn when a single request repeats the same SQL statement shape more than this
+    query_repeat_warn_threshold: int = 10
+
+    # Closed bookings older than this move to bookings_archive, in batches
+    booking_archive_after_days: int = 90
+    booking_archive_batch_size: int = 1000
+
+    # Shop/bike deletions touching more bookings than this run as a chunked job on the scheduler thread
+    bulk_delete_booking_threshold: int = 10000
+    bulk_delete_chunk_size: int = 5000
+    bulk_delete_poll_seconds: int = 30
+    # A running job whose heartbeat is older than this (its worker died) is resumed by another worker
+    bulk_delete_stale_seconds: int = 600
+
+    # In-process scheduler (nightly rollup reconcile, ...)
+    scheduler_enabled: bool = True
+    rollup_reconcile_hour_utc: int = 3
+    rollup_reconcile_lookback_days: int = 7
+    rollup_reconcile_lookahead_days: int = 180
+    # Nightly check of bike_inventory counters against active bookings (app/db/inventory_reconcile.py)
+    inventory_reconcile_hour_utc: int = 4
+    inventory_reconcile_repair: bool = True
+    inventory_reconcile_batch_size: int = 500
+
+    # Hourly price calendars compiled from pricing rules: span and in-process LRU size
+    pricing_calendar_lookback_days: int = 7
+    pricing_calendar_days: int = 400
+    pricing_calendar_cache_shops: int = 256
+
+    # Bike write concurrency: "advisory" (per-bike locks) or "optimistic" (version checks + retry)
+    bike_lock_mode: str = "advisory"
+    # Log bike lock acquisitions that waited longer than this
+    lock_wait_warn_ms: int = 200
+    # Attempts and base backoff for requests that lose an optimistic version check
+    conflict_retry_attempts: int = 5
+    conflict_retry_base_ms: int = 10
+
+    # Per-IP rate limits (slowapi); disable only for local load tests
+    rate_limit_enabled: bool = True
+
+    # Request metrics (GET /metrics); every uvicorn worker writes its counters to a file in metrics_dir
+    metrics_enabled: bool = True
+    metrics_dir: str = "/tmp/rentwheels-metrics"
+
+    # Request logging: share of 2xx/3xx requests logged (errors and slow requests always are)
+    request_log_enabled: bool = True
+    request_log_sample_rate: float = 0.01
+    request_log_slow_ms: int = 1000
+    request_log_queue_size: int = 10000
+
+    # Request profiling (signed X-Profile-Request header or admin sessions); no middleware when disabled
+    profiling_enabled: bool = False
+    profiling_dir: str = "/tmp/rentwheels-profiles"
+    profiling_sample_interval_ms: float = 1.0
+    profiling_max_files: int = 500
+    profiling_max_concurrent: int = 4
+
+    # Slow-query log: statements at or above slow_query_ms are recorded (per worker) and EXPLAINed
+    slow_query_ms: int = 200
+    slow_query_max_entries: int = 100
+    slow_query_explain_ttl_seconds: int = 3600
+    slow_query_dump_dir: str = "/tmp/rentwheels-slow-queries"
+
+    # Health checks: background DB probe cadence/timeout; readiness fails at this pool saturation
+    health_probe_interval_seconds: float = 2.0
+    health_probe_timeout_seconds: float = 2.0
+    health_max_pool_saturation: float = 1.0
+
     @field_validator("cors_origins", mode="before")
     @classmethod
     def parse_cors_origins(cls, v):
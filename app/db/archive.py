@@ -0,0 +1,110 @@
+"""
+Active/archive split for bookings.
+
+Only pending/confirmed bookings matter for overlap checks and inventory, so
+completed and cancelled bookings older than ``settings.booking_archive_after_days``
+are moved in batches from ``bookings`` to ``bookings_archive``. Each batch is its
+own short transaction, so the job never holds long locks on the live table.
+
+Write paths keep querying ``Booking`` directly. Read paths that need history
+(user listings, booking lookup, review eligibility) use the helpers below,
+which look at both tables.
+"""
+from datetime import timedelta
+
+from sqlalchemy import DateTime, delete, exists, insert, literal, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.models import Bike, Booking, BookingArchive
+from app.utils import tz
+from app.utils.logging_config import get_logger
+
+logger = get_logger()
+
+ARCHIVABLE_STATUSES = ("completed", "cancelled")
+
+# Columns shared by bookings and bookings_archive, in a fixed order
+BOOKING_COLUMNS = [c.name for c in Booking.__table__.columns]
+
+
+def archive_closed_bookings(
+    db: Session,
+    older_than_days: int | None = None,
+    batch_size: int | None = None,
+    max_batches: int | None = None,
+) -> int:
+    """Move closed bookings that ended before the cutoff into bookings_archive.
+
+    Returns the number of bookings moved. Closed statuses are terminal, so a
+    booking cannot change underneath a batch once selected.
+    """
+    older_than_days = older_than_days if older_than_days is not None else settings.booking_archive_after_days
+    batch_size = batch_size or settings.booking_archive_batch_size
+    cutoff = tz.now() - timedelta(days=older_than_days)
+
+    source_columns = [Booking.__table__.c[name] for name in BOOKING_COLUMNS]
+    moved = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        ids = db.execute(
+            select(Booking.id)
+            .where(Booking.status.in_(ARCHIVABLE_STATUSES), Booking.end_time < cutoff)
+            .order_by(Booking.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not ids:
+            break
+
+        db.execute(
+            insert(BookingArchive).from_select(
+                BOOKING_COLUMNS + ["archived_at"],
+                select(*source_columns, literal(tz.now(), DateTime)).where(Booking.id.in_(ids)),
+            )
+        )
+        db.execute(delete(Booking).where(Booking.id.in_(ids)))
+        db.commit()
+
+        moved += len(ids)
+        batches += 1
+        logger.info("bookings_archived", batch=batches, batch_size=len(ids), total=moved)
+
+    return moved
+
+
+def get_booking_with_history(db: Session, booking_id: int):
+    """Return a booking by id from the active table, falling back to the archive."""
+    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    if booking is None:
+        booking = db.query(BookingArchive).filter(BookingArchive.id == booking_id).first()
+    return booking
+
+
+def customer_bookings_with_history(db: Session, customer_id: int, skip: int, limit: int):
+    """Return a page of a customer's bookings across both tables, newest first."""
+    active = select(*[Booking.__table__.c[name] for name in BOOKING_COLUMNS]).where(
+        Booking.customer_id == customer_id
+    )
+    archived = select(*[BookingArchive.__table__.c[name] for name in BOOKING_COLUMNS]).where(
+        BookingArchive.customer_id == customer_id
+    )
+    history = union_all(active, archived).subquery()
+    return db.execute(
+        select(history).order_by(history.c.created_at.desc()).offset(skip).limit(limit)
+    ).all()
+
+
+def has_completed_booking_with_shop(db: Session, customer_id: int, shop_id: int) -> bool:
+    """True if the customer has a completed booking for any bike of the shop, active or archived."""
+    active = (
+        select(Booking.id)
+        .join(Bike, Booking.bike_id == Bike.id)
+        .where(Booking.customer_id == customer_id, Booking.status == "completed", Bike.shop_id == shop_id)
+    )
+    archived = (
+        select(BookingArchive.id)
+        .join(Bike, BookingArchive.bike_id == Bike.id)
+        .where(BookingArchive.customer_id == customer_id, BookingArchive.status == "completed", Bike.shop_id == shop_id)
+    )
+    return db.execute(select(or_(exists(active), exists(archived)))).scalar()
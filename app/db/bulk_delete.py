@@ -0,0 +1,150 @@
+"""
+Chunked deletion of shops and bikes with many bookings.
+
+``Shop.bikes``, ``Bike.bookings`` and ``Bike.inventory`` use
+``passive_deletes=True``, so deleting a shop or bike never loads its children;
+the database's ``ON DELETE CASCADE`` foreign keys remove them. For targets with
+more than ``settings.bulk_delete_booking_threshold`` bookings even that single
+cascading DELETE holds locks for too long. The endpoints instead deactivate the
+shop (or mark the bike unavailable, so no new bookings are taken) and record a
+``DeletionJob`` row in the same transaction.
+
+The scheduler picks jobs up every ``settings.bulk_delete_poll_seconds``
+(``run_pending_deletions``), outside any request, so the work never shows up
+in request latency or query stats. A job deletes bookings in chunks of
+``settings.bulk_delete_chunk_size``, one short transaction each, which also
+saves its progress and heartbeat (``updated_at``), and then removes the target
+itself. Workers claim a job with a conditional UPDATE, so only one runs it. A
+job left "running" by a worker that died is resumed once its heartbeat is
+older than ``settings.bulk_delete_stale_seconds``. Deleting is idempotent, so
+a resumed job simply carries on.
+
+Progress is reported through ``GET /jobs/{job_id}`` on any worker.
+"""
+from datetime import timedelta
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.database import SessionLocal
+from app.db.models import Bike, Booking, BookingArchive, DeletionJob, Shop
+from app.utils import tz
+from app.utils.logging_config import get_logger
+
+logger = get_logger()
+
+
+def get_job(db: Session, job_id: str) -> DeletionJob | None:
+    return db.query(DeletionJob).filter(DeletionJob.id == job_id).first()
+
+
+def create_job(db: Session, kind: str, target_id: int, owner_id: int, total_bookings: int) -> DeletionJob:
+    """Add a pending job to the session; the caller commits (with the deactivation)."""
+    job = DeletionJob(kind=kind, target_id=target_id, owner_id=owner_id, total_bookings=total_bookings)
+    db.add(job)
+    db.flush()  # assigns the id
+    return job
+
+
+def _bike_ids_of_shop(shop_id: int):
+    return select(Bike.id).where(Bike.shop_id == shop_id).scalar_subquery()
+
+
+def count_bookings(db: Session, shop_id: int | None = None, bike_id: int | None = None) -> int:
+    """Count active and archived bookings that would be removed with a shop or bike."""
+    if shop_id is not None:
+        active = Booking.bike_id.in_(_bike_ids_of_shop(shop_id))
+        archived = BookingArchive.bike_id.in_(_bike_ids_of_shop(shop_id))
+    else:
+        active = Booking.bike_id == bike_id
+        archived = BookingArchive.bike_id == bike_id
+    return db.execute(
+        select(
+            select(func.count(Booking.id)).where(active).scalar_subquery()
+            + select(func.count(BookingArchive.id)).where(archived).scalar_subquery()
+        )
+    ).scalar()
+
+
+def _claimable():
+    """Pending jobs, and running ones whose worker stopped sending heartbeats."""
+    stale = tz.now() - timedelta(seconds=settings.bulk_delete_stale_seconds)
+    return or_(
+        DeletionJob.status == "pending",
+        and_(DeletionJob.status == "running", DeletionJob.updated_at < stale),
+    )
+
+
+def claim_job(db: Session, job_id: str) -> bool:
+    """Mark the job running if it is claimable; False if another worker has it (or it is done)."""
+    result = db.execute(
+        update(DeletionJob)
+        .where(DeletionJob.id == job_id, _claimable())
+        .values(status="running", updated_at=tz.now())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def _delete_bookings_in_chunks(db: Session, job: DeletionJob, model, criterion, chunk_size: int) -> None:
+    while True:
+        ids = db.execute(select(model.id).where(criterion).limit(chunk_size)).scalars().all()
+        if not ids:
+            return
+        db.execute(delete(model).where(model.id.in_(ids)))
+        job.deleted_bookings += len(ids)  # progress and heartbeat commit with the chunk
+        db.commit()
+        logger.info(
+            "bulk_delete_progress",
+            job_id=job.id, kind=job.kind, target_id=job.target_id,
+            deleted=job.deleted_bookings, total=job.total_bookings,
+        )
+
+
+def run_deletion_job(job_id: str, chunk_size: int | None = None) -> None:
+    """Claim the job, delete its bookings in chunks, then the shop/bike itself (DB cascades the rest)."""
+    chunk_size = chunk_size or settings.bulk_delete_chunk_size
+
+    db = SessionLocal()
+    try:
+        if not claim_job(db, job_id):
+            return
+        job = get_job(db, job_id)
+        try:
+            if job.kind == "shop":
+                active = Booking.bike_id.in_(_bike_ids_of_shop(job.target_id))
+                archived = BookingArchive.bike_id.in_(_bike_ids_of_shop(job.target_id))
+                target = delete(Shop).where(Shop.id == job.target_id)
+            else:
+                active = Booking.bike_id == job.target_id
+                archived = BookingArchive.bike_id == job.target_id
+                target = delete(Bike).where(Bike.id == job.target_id)
+
+            _delete_bookings_in_chunks(db, job, Booking, active, chunk_size)
+            _delete_bookings_in_chunks(db, job, BookingArchive, archived, chunk_size)
+            db.execute(target)
+            job.status = "completed"
+        except Exception as exc:
+            db.rollback()
+            job.status = "failed"
+            job.error = str(exc)
+            logger.error("bulk_delete_failed", job_id=job.id, kind=job.kind, target_id=job.target_id, error=str(exc))
+        job.finished_at = tz.now()
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_pending_deletions() -> None:
+    """Scheduler entry point: run every claimable job, oldest first."""
+    db = SessionLocal()
+    try:
+        job_ids = db.execute(
+            select(DeletionJob.id).where(_claimable()).order_by(DeletionJob.created_at)
+        ).scalars().all()
+    finally:
+        db.close()
+    for job_id in job_ids:
+        run_deletion_job(job_id)
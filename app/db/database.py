@@ -2,6 +2,8 @@ import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 from app.config import settings
+from app.db.query_counter import install_query_counter
+from app.db.slow_queries import install_slow_query_recorder
 
 # Database URL - PostgreSQL
 # Set DATABASE_URL environment variable or it will use default
@@ -18,6 +20,9 @@ engine = create_engine(
     connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
 )
 
+install_query_counter(engine)
+install_slow_query_recorder(engine)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
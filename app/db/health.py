@@ -0,0 +1,161 @@
+"""
+Readiness state for ``/health/ready``, computed off the request path.
+
+``DatabaseProbe`` runs in a daemon thread: every
+``settings.health_probe_interval_seconds`` it runs ``SELECT 1`` and reads
+``alembic_version`` over its own single connection (not the app's pool, so
+a saturated pool cannot make the probe itself hang) and caches the result.
+Probe requests then only read that cache, the pool's counters and the
+scheduler's heartbeat - no connection checkout, no waiting, so a saturated
+or unreachable database fails readiness immediately instead of queueing
+behind requests for a connection.
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.db.database import engine
+from app.utils.logging_config import get_logger
+from app.utils.scheduler import scheduler
+
+logger = get_logger()
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic.ini")
+
+
+@dataclass
+class ProbeResult:
+    ok: bool
+    latency_ms: float | None
+    error: str | None
+    db_revision: str | None
+    checked_at: float  # time.monotonic()
+
+
+def migration_revisions() -> tuple[set[str], set[str]] | None:
+    """(head revisions, all revisions) of the migration scripts shipped with the code, or None if unknown."""
+    try:
+        from alembic.config import Config
+        from alembic.script import ScriptDirectory
+
+        script = ScriptDirectory.from_config(Config(ALEMBIC_INI))
+        return set(script.get_heads()), {rev.revision for rev in script.walk_revisions()}
+    except Exception as exc:
+        logger.warning("migration_revisions_unavailable", error=str(exc))
+        return None
+
+
+def pool_stats(engine: Engine) -> dict:
+    """Checked-out connections versus capacity of the engine's pool."""
+    pool = engine.pool
+    size = pool.size() if hasattr(pool, "size") else None
+    if size is None:
+        return {"size": None, "checked_out": None, "capacity": None, "saturation": 0.0}
+    capacity = size + max(getattr(pool, "_max_overflow", 0), 0)
+    checked_out = pool.checkedout()
+    return {
+        "size": size,
+        "checked_out": checked_out,
+        "capacity": capacity,
+        "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+    }
+
+
+class DatabaseProbe:
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.result: ProbeResult | None = None
+        self.heads: set[str] | None = None
+        self.known_revisions: set[str] = set()
+        self._probe_engine: Engine | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        revisions = migration_revisions()
+        self.heads, self.known_revisions = revisions if revisions is not None else (None, set())
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="db-probe", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+        if self._probe_engine is not None and self._probe_engine is not self.engine:
+            self._probe_engine.dispose()
+
+    def probe(self) -> ProbeResult:
+        if self._probe_engine is None:
+            if self.engine.dialect.name == "postgresql":
+                timeout = max(int(settings.health_probe_timeout_seconds), 1)
+                self._probe_engine = create_engine(
+                    self.engine.url, pool_size=1, max_overflow=0,
+                    connect_args={"connect_timeout": timeout, "options": f"-c statement_timeout={timeout * 1000}"},
+                )
+            else:
+                self._probe_engine = self.engine  # SQLite in tests: a second engine would see another database
+        start = time.perf_counter()
+        try:
+            with self._probe_engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                revision = None
+                if self.heads is not None:
+                    try:
+                        revision = conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+                    except Exception:
+                        pass  # not migrated with alembic; reported as a migration mismatch
+            result = ProbeResult(True, round((time.perf_counter() - start) * 1000, 2), None, revision, time.monotonic())
+        except Exception as exc:
+            if self._probe_engine is not self.engine:
+                self._probe_engine.dispose()  # reconnect next time
+            result = ProbeResult(False, None, f"{type(exc).__name__}: {exc}".splitlines()[0], None, time.monotonic())
+        if result.ok != getattr(self.result, "ok", True):
+            logger.warning("db_probe_changed", ok=result.ok, error=result.error)
+        self.result = result
+        return result
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.probe()
+            self._stop.wait(settings.health_probe_interval_seconds)
+
+    def readiness(self) -> tuple[bool, dict]:
+        """(ready, details) from cached state only; never touches the database."""
+        checks = {}
+        result = self.result
+        max_age = settings.health_probe_interval_seconds * 3 + settings.health_probe_timeout_seconds
+        fresh = result is not None and time.monotonic() - result.checked_at <= max_age
+        checks["database"] = {"ok": bool(fresh and result.ok)}
+        if result is None:
+            checks["database"]["error"] = "not probed yet"
+        else:
+            checks["database"].update(latency_ms=result.latency_ms, error=result.error, stale=not fresh)
+
+        pool = pool_stats(self.engine)
+        checks["pool"] = {"ok": pool["saturation"] < settings.health_max_pool_saturation, **pool}
+
+        revision = result.db_revision if result else None
+        # Not ready while the database is behind the code; a revision the code does not know
+        # yet (newer migrations applied ahead of a rolling deploy) is fine.
+        behind = revision is None or (revision in self.known_revisions and revision not in self.heads)
+        checks["migrations"] = {
+            "ok": self.heads is None or not behind,
+            "db_revision": revision,
+            "code_heads": sorted(self.heads) if self.heads is not None else None,
+        }
+
+        if settings.scheduler_enabled:
+            checks["scheduler"] = {"ok": scheduler.is_alive(), "running_job": scheduler.running_job}
+
+        return all(check["ok"] for check in checks.values()), checks
+
+
+db_probe = DatabaseProbe(engine)
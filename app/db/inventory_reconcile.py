@@ -0,0 +1,207 @@
+"""
+Reconcile ``bike_inventory`` counters with the bookings they summarize.
+
+``rented_quantity`` should equal the bike's pending + confirmed bookings and
+``available_quantity`` should be ``total_quantity`` minus that. Several write
+paths keep the counters up to date incrementally, and nothing else checks
+them. ``reconcile_inventory`` walks the inventory in pages of bike ids. For
+each page it runs one set-based query: the page's active bookings are grouped
+per bike and left-joined to its inventory rows, and only the rows that
+disagree are returned. Memory is bounded by the page size, and no cursor stays
+open between pages, so repairs can commit in between, even on SQLite.
+
+With ``repair`` the divergent bikes of a page are fixed in batches, one short
+transaction each. A batch takes the bike locks (``lock_bikes``), so it waits
+for in-flight bookings on those bikes and blocks new ones only briefly. It
+then rewrites the counters from a fresh count. The UPDATE re-checks the
+mismatch, so a bike that is already consistent by then is left alone. It also
+bumps ``version``, so optimistic writers that read the old counters retry. In
+optimistic lock mode a batch that loses a version check is retried with
+backoff; after ``settings.conflict_retry_attempts`` attempts it is skipped
+until the next run instead of failing the job.
+
+Closed bookings never count, so ``bookings_archive`` is not consulted.
+"""
+import time
+from dataclasses import asdict, dataclass, field
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.config import settings
+from app.db.database import SessionLocal
+from app.db.locks import lock_bikes
+from app.db.models import BikeInventory, Booking
+from app.db.retry import backoff_delay
+from app.utils.logging_config import get_logger
+
+logger = get_logger()
+
+ACTIVE_STATUSES = ("pending", "confirmed")
+LOGGED_DIVERGENCES = 20  # individual divergences logged per run; the rest are only counted
+PAGE_SIZE = 10000  # bikes checked per query
+
+
+@dataclass
+class Divergence:
+    bike_id: int
+    shop_id: int
+    total_quantity: int
+    available_quantity: int
+    rented_quantity: int
+    expected_available: int
+    expected_rented: int
+
+
+@dataclass
+class ReconcileResult:
+    checked: int = 0
+    divergent: int = 0
+    repaired: int = 0
+    skipped: int = 0  # divergent bikes left for the next run after repeated version conflicts
+    sample: list[dict] = field(default_factory=list)  # first LOGGED_DIVERGENCES divergences
+
+
+def divergence_query(first_bike_id: int, last_bike_id: int):
+    """Inventory rows of bikes ``first_bike_id..last_bike_id`` whose counters disagree with their active bookings."""
+    active = (
+        select(Booking.bike_id, func.count().label("active"))
+        .where(Booking.bike_id.between(first_bike_id, last_bike_id), Booking.status.in_(ACTIVE_STATUSES))
+        .group_by(Booking.bike_id)
+        .subquery()
+    )
+    expected_rented = func.coalesce(active.c.active, 0)
+    return (
+        select(
+            BikeInventory.bike_id,
+            BikeInventory.shop_id,
+            BikeInventory.total_quantity,
+            BikeInventory.available_quantity,
+            BikeInventory.rented_quantity,
+            (BikeInventory.total_quantity - expected_rented).label("expected_available"),
+            expected_rented.label("expected_rented"),
+        )
+        .outerjoin(active, active.c.bike_id == BikeInventory.bike_id)
+        .where(
+            BikeInventory.bike_id.between(first_bike_id, last_bike_id),
+            or_(
+                BikeInventory.rented_quantity != expected_rented,
+                BikeInventory.available_quantity != BikeInventory.total_quantity - expected_rented,
+            ),
+        )
+        .order_by(BikeInventory.bike_id)
+    )
+
+
+def iter_pages(db: Session, page_size: int = PAGE_SIZE):
+    """Yield (bikes in page, divergences) for consecutive pages of ``page_size`` inventory rows."""
+    after = 0
+    while True:
+        page = db.execute(
+            select(BikeInventory.bike_id)
+            .where(BikeInventory.bike_id > after)
+            .order_by(BikeInventory.bike_id)
+            .limit(page_size)
+        ).scalars().all()
+        if not page:
+            return
+        divergences = [Divergence(**row._asdict()) for row in db.execute(divergence_query(page[0], page[-1]))]
+        db.rollback()  # end the read transaction before any repair
+        yield len(page), divergences
+        after = page[-1]
+
+
+def repair_bikes(db: Session, bike_ids: list[int]) -> int:
+    """Rewrite the counters of ``bike_ids`` from their bookings in one short transaction.
+
+    Returns the number of inventory rows changed. Raises ``StaleDataError``
+    if, in optimistic lock mode, a concurrent writer got there first.
+    """
+    lock_bikes(db, bike_ids)
+    db.flush()  # optimistic mode: the version-checked touch must land before the UPDATE below
+    active = (
+        select(func.count())
+        .where(Booking.bike_id == BikeInventory.bike_id, Booking.status.in_(ACTIVE_STATUSES))
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(BikeInventory)
+        .where(
+            BikeInventory.bike_id.in_(bike_ids),
+            or_(
+                BikeInventory.rented_quantity != active,
+                BikeInventory.available_quantity != BikeInventory.total_quantity - active,
+            ),
+        )
+        .values(
+            rented_quantity=active,
+            available_quantity=BikeInventory.total_quantity - active,
+            version=BikeInventory.version + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def _repair_with_retry(db: Session, bike_ids: list[int]) -> int | None:
+    """``repair_bikes`` retried on version conflicts; None if every attempt lost."""
+    attempts = max(settings.conflict_retry_attempts, 1)
+    for attempt in range(attempts):
+        try:
+            return repair_bikes(db, bike_ids)
+        except StaleDataError:
+            db.rollback()
+            if attempt + 1 < attempts:
+                time.sleep(backoff_delay(attempt))
+    logger.warning("inventory_repair_skipped", bikes=len(bike_ids), first_bike_id=bike_ids[0])
+    return None
+
+
+def reconcile_inventory(
+    db: Session,
+    repair: bool = False,
+    batch_size: int | None = None,
+    page_size: int = PAGE_SIZE,
+    on_divergence=None,
+) -> ReconcileResult:
+    """Find (and with ``repair``, fix) inventory counters that drifted from the bookings.
+
+    ``on_divergence`` is called with every ``Divergence`` found.
+    """
+    batch_size = batch_size or settings.inventory_reconcile_batch_size
+    result = ReconcileResult()
+    for checked, divergences in iter_pages(db, page_size):
+        result.checked += checked
+        result.divergent += len(divergences)
+        for divergence in divergences:
+            if len(result.sample) < LOGGED_DIVERGENCES:
+                result.sample.append(asdict(divergence))
+                logger.warning("inventory_divergence", **asdict(divergence))
+            if on_divergence is not None:
+                on_divergence(divergence)
+        if not repair:
+            continue
+        for offset in range(0, len(divergences), batch_size):
+            bike_ids = [d.bike_id for d in divergences[offset:offset + batch_size]]
+            repaired = _repair_with_retry(db, bike_ids)
+            if repaired is None:
+                result.skipped += len(bike_ids)
+            else:
+                result.repaired += repaired
+
+    logger.info(
+        "inventory_reconciled", checked=result.checked, divergent=result.divergent,
+        repaired=result.repaired, skipped=result.skipped, repair=repair,
+    )
+    return result
+
+
+def run_inventory_reconcile() -> None:
+    """Scheduler entry point: report drift and, if configured, repair it."""
+    db = SessionLocal()
+    try:
+        reconcile_inventory(db, repair=settings.inventory_reconcile_repair)
+    finally:
+        db.close()
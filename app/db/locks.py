@@ -0,0 +1,128 @@
+"""
+Per-bike, transaction-scoped write locks.
+
+Every path that changes a bike's inventory counters or bookings calls
+``lock_bikes``/``lock_bike`` first. What that does depends on
+``settings.bike_lock_mode``:
+
+- ``advisory`` (default): on Postgres, ``pg_advisory_xact_lock(BIKE_LOCK_NAMESPACE,
+  bike_id)``, released by the database at COMMIT or ROLLBACK. Unlike
+  ``SELECT ... FOR UPDATE`` on ``bike_inventory`` no row is locked, so
+  availability reads and unrelated updates of the row never wait. Other
+  databases (SQLite in tests) get an in-process lock per bike id, released
+  when the session's transaction ends - enough for a single test process.
+- ``optimistic``: nothing waits. The bikes' inventory rows are loaded and
+  touched, so the commit is a version-checked UPDATE (see
+  ``BikeInventory.version``) that fails with ``StaleDataError`` if another
+  request wrote the same bike meanwhile; handlers are wrapped in
+  ``app.db.retry.retry_on_conflict`` to run again.
+
+Callers should do their read-only work (lookups, validation, pricing) before
+taking the lock to keep it short. Bikes are always locked in ascending id
+order, so requests locking several bikes cannot deadlock. Time spent waiting
+is recorded globally (``get_lock_stats``) and on the current request's
+``QueryStats``; waits over ``settings.lock_wait_warn_ms`` are logged.
+"""
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.models import BikeInventory
+from app.db.query_counter import current_query_stats
+from app.utils import tz
+from app.utils.logging_config import get_logger
+
+logger = get_logger()
+
+BIKE_LOCK_NAMESPACE = 4201  # first key of the two-int advisory lock, reserved for bikes
+_HELD_KEY = "held_bike_locks"
+
+
+@dataclass
+class LockStats:
+    acquisitions: int = 0
+    contended: int = 0  # acquisitions that waited longer than 1 ms
+    total_wait: float = 0.0  # seconds
+    max_wait: float = 0.0
+
+
+_stats = LockStats()
+_stats_lock = threading.Lock()
+
+_local_locks: dict[int, threading.Lock] = {}
+_local_locks_guard = threading.Lock()
+
+
+def get_lock_stats() -> dict:
+    """Snapshot of lock-wait totals since startup (or the last reset)."""
+    with _stats_lock:
+        return asdict(_stats)
+
+
+def reset_lock_stats() -> None:
+    global _stats
+    with _stats_lock:
+        _stats = LockStats()
+
+
+def _record_wait(bike_ids: list[int], waited: float) -> None:
+    with _stats_lock:
+        _stats.acquisitions += 1
+        _stats.contended += waited > 0.001
+        _stats.total_wait += waited
+        _stats.max_wait = max(_stats.max_wait, waited)
+
+    stats = current_query_stats()
+    if stats is not None:
+        stats.lock_wait += waited
+    if waited * 1000 > settings.lock_wait_warn_ms:
+        logger.warning("slow_bike_lock", bike_ids=bike_ids, wait_ms=round(waited * 1000, 1))
+
+
+def _local_lock(bike_id: int) -> threading.Lock:
+    with _local_locks_guard:
+        return _local_locks.setdefault(bike_id, threading.Lock())
+
+
+def lock_bikes(db: Session, bike_ids) -> None:
+    """Lock the given bikes until the session's current transaction ends."""
+    ids = sorted(set(bike_ids))
+    if not ids:
+        return
+    connection = db.connection()  # begins the transaction the locks are scoped to
+
+    if settings.bike_lock_mode == "optimistic":
+        for inventory in db.query(BikeInventory).filter(BikeInventory.bike_id.in_(ids)):
+            inventory.updated_at = tz.now()  # forces a version-checked UPDATE at commit
+        return
+
+    start = time.perf_counter()
+    if connection.dialect.name == "postgresql":
+        for bike_id in ids:
+            db.execute(
+                text("SELECT pg_advisory_xact_lock(:namespace, :bike_id)"),
+                {"namespace": BIKE_LOCK_NAMESPACE, "bike_id": bike_id},
+            )
+    else:
+        held = db.info.setdefault(_HELD_KEY, set())
+        for bike_id in ids:
+            if bike_id not in held:
+                _local_lock(bike_id).acquire()
+                held.add(bike_id)
+    _record_wait(ids, time.perf_counter() - start)
+
+
+def lock_bike(db: Session, bike_id: int) -> None:
+    lock_bikes(db, [bike_id])
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _release_local_locks(session, transaction):
+    if transaction.parent is not None:
+        return  # savepoint / nested transaction
+    for bike_id in session.info.pop(_HELD_KEY, ()):
+        _local_locks[bike_id].release()
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Time
+import uuid
+
+from sqlalchemy import Column, Integer, String, DateTime, Date, Boolean, ForeignKey, Time, Index
 from sqlalchemy.orm import relationship
 from app.utils import tz
 from .database import Base
@@ -45,7 +47,8 @@ class Shop(Base):
 
     # Relationship: Many shops belong to one user
     owner = relationship("User", back_populates="shops", foreign_keys=[owner_id])
-    bikes = relationship("Bike", back_populates="shop", cascade="all, delete-orphan")
+    # passive_deletes: rely on ON DELETE CASCADE instead of loading every child row
+    bikes = relationship("Bike", back_populates="shop", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Bike(Base):
@@ -68,8 +71,15 @@ class Bike(Base):
 
     # Relationship: Many bikes belong to one shop
     shop = relationship("Shop", back_populates="bikes", foreign_keys=[shop_id])
-    bookings = relationship("Booking", back_populates="bike", cascade="all, delete-orphan")
-    inventory = relationship("BikeInventory", back_populates="bike", uselist=False, cascade="all, delete-orphan")
+    bookings = relationship("Booking", back_populates="bike", cascade="all, delete-orphan", passive_deletes=True)
+    inventory = relationship(
+        "BikeInventory", back_populates="bike", uselist=False, cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    __table_args__ = (
+        Index("ix_bikes_type_engine_cc", "bike_type", "engine_cc"),  # search by type + CC
+        Index("ix_bikes_shop_type", "shop_id", "bike_type"),  # search within a shop
+    )
 
 
 class BikeInventory(Base):
@@ -82,12 +92,15 @@ class BikeInventory(Base):
     total_quantity = Column(Integer, nullable=False, default=1)  # Total bikes of this type
     available_quantity = Column(Integer, nullable=False, default=1)  # Available for booking
     rented_quantity = Column(Integer, nullable=False, default=0)  # Currently rented
+    version = Column(Integer, nullable=False)  # Bumped on every ORM update; stale writes raise StaleDataError
     created_at = Column(DateTime, default=tz.now)
     updated_at = Column(DateTime, default=tz.now, onupdate=tz.now)
 
     # Relationship: Each inventory record belongs to one bike
     bike = relationship("Bike", back_populates="inventory", foreign_keys=[bike_id])
 
+    __mapper_args__ = {"version_id_col": version}
+
 
 class Booking(Base):
     """Booking model - represents bike rental bookings by customers"""
@@ -109,6 +122,115 @@ class Booking(Base):
     customer = relationship("User", back_populates="bookings", foreign_keys=[customer_id])
     bike = relationship("Bike", back_populates="bookings", foreign_keys=[bike_id])
 
+    __table_args__ = (
+        Index("ix_bookings_bike_status_window", "bike_id", "status", "start_time", "end_time"),  # overlap checks
+        Index("ix_bookings_customer_created", "customer_id", "created_at"),  # user booking history
+    )
+
+
+class BookingArchive(Base):
+    """BookingArchive model - completed/cancelled bookings moved out of the hot bookings table.
+
+    Rows keep their original booking id, so ids stay unique across both tables.
+    See app/db/archive.py for the batched mover.
+    """
+    __tablename__ = "bookings_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    customer_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    bike_id = Column(Integer, ForeignKey("bikes.id", ondelete="CASCADE"), nullable=False, index=True)
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+    status = Column(String, nullable=False)  # "completed" or "cancelled"
+    total_price = Column(Integer, nullable=True)  # Price in cents
+    created_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=True)
+    confirmed_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, default=tz.now)
+
+    __table_args__ = (
+        Index("ix_bookings_archive_customer_created", "customer_id", "created_at"),  # user booking history
+    )
+
+class BookingDailyRollup(Base):
+    """BookingDailyRollup model - per-bike, per-day booking totals for shop analytics.
+
+    Maintained incrementally on confirm/complete/cancel and rebuilt by the
+    nightly reconcile (see app/db/rollups.py). Counts and revenue are
+    attributed to the booking's start day; booked_seconds is split across
+    the days the booking covers.
+    """
+    __tablename__ = "booking_daily_rollup"
+
+    bike_id = Column(Integer, ForeignKey("bikes.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)  # UTC day
+    shop_id = Column(Integer, ForeignKey("shops.id", ondelete="CASCADE"), nullable=False)
+    bookings = Column(Integer, nullable=False, default=0)  # Confirmed (or completed) bookings starting this day
+    completed = Column(Integer, nullable=False, default=0)
+    cancelled = Column(Integer, nullable=False, default=0)  # Confirmed bookings that were later cancelled
+    revenue = Column(Integer, nullable=False, default=0)  # Price in cents
+    booked_seconds = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=tz.now, onupdate=tz.now)
+
+    __table_args__ = (
+        Index("ix_booking_daily_rollup_shop_day", "shop_id", "day"),  # shop analytics by date range
+    )
+
+
+class DeletionJob(Base):
+    """DeletionJob model - a chunked shop/bike deletion, run by the scheduler (see app/db/bulk_delete.py).
+
+    Stored so any worker can report progress and an interrupted job resumes
+    after a restart. No foreign keys: the job outlives the shop or bike it deletes.
+    """
+    __tablename__ = "deletion_jobs"
+
+    id = Column(String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    kind = Column(String, nullable=False)  # "shop" or "bike"
+    target_id = Column(Integer, nullable=False)
+    owner_id = Column(Integer, nullable=False, index=True)
+    status = Column(String, nullable=False, default="pending", index=True)  # "pending", "running", "completed", "failed"
+    total_bookings = Column(Integer, nullable=False)
+    deleted_bookings = Column(Integer, nullable=False, default=0)
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=tz.now)
+    updated_at = Column(DateTime, default=tz.now, onupdate=tz.now)  # Heartbeat while running
+    finished_at = Column(DateTime, nullable=True)
+
+    @property
+    def progress(self) -> float:
+        if self.status == "completed":
+            return 1.0
+        if self.total_bookings == 0:
+            return 0.0
+        return min(self.deleted_bookings / self.total_bookings, 1.0)
+
+
+class PricingRule(Base):
+    """PricingRule model - scales a shop's (or one bike's) rates for matching hours.
+
+    Conditions are ANDed; unset conditions match everything. Rules are
+    compiled into hourly price calendars (see app/db/pricing.py), all in UTC.
+    """
+    __tablename__ = "pricing_rules"
+
+    id = Column(Integer, primary_key=True, index=True)
+    shop_id = Column(Integer, ForeignKey("shops.id", ondelete="CASCADE"), nullable=False, index=True)
+    bike_id = Column(Integer, ForeignKey("bikes.id", ondelete="CASCADE"), nullable=True, index=True)  # None = every bike in the shop
+    name = Column(String, nullable=False)
+    multiplier_percent = Column(Integer, nullable=False)  # 150 = +50%, 80 = -20%
+    days_of_week = Column(String, nullable=True)  # e.g. "5,6" (Monday = 0)
+    start_hour = Column(Integer, nullable=True)  # 0-23; a start after end wraps past midnight
+    end_hour = Column(Integer, nullable=True)  # 1-24, exclusive
+    start_date = Column(Date, nullable=True)  # Seasonal rules, inclusive
+    end_date = Column(Date, nullable=True)
+    priority = Column(Integer, nullable=False, default=0)  # Highest matching priority wins
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime, default=tz.now)
+    updated_at = Column(DateTime, default=tz.now, onupdate=tz.now)
+
+
 class Review(Base):
     """Review model - represents customer reviews for shops"""
     __tablename__ = "reviews"
@@ -124,7 +246,11 @@ class Review(Base):
     # Relationships
     shop = relationship("Shop", foreign_keys=[shop_id])
     customer = relationship("User", foreign_keys=[customer_id])
-    
+
+    __table_args__ = (
+        Index("ix_reviews_shop_created", "shop_id", "created_at"),  # shop review listing
+    )
+
 class AdminUser(Base):
     """AdminUser model - represents admin users of the system"""
     __tablename__ = "admin_users"
@@ -0,0 +1,150 @@
+"""
+Cached hourly price calendars compiled from pricing rules.
+
+A shop's active rules are compiled into one ``PriceCalendar`` for the
+shop-wide rules plus one for each bike that has rules of its own, spanning
+``pricing_calendar_lookback_days`` before today to ``pricing_calendar_days``
+after it. Compiled shops are kept in an in-process LRU.
+
+Each use re-validates the cached entry against ``(max(updated_at), count)``
+of the shop's rules - one indexed aggregate for all shops involved - so a
+rule change made through any worker is picked up on the next price. Rule
+endpoints also call ``invalidate_shop`` to drop the entry immediately.
+Windows outside the cached span get a calendar compiled for just that span.
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.models import PricingRule
+from app.utils import tz
+from app.utils.batch import id_in
+from app.utils.intervals import day_number
+from app.utils.pricing import HOUR_SECONDS, PriceCalendar, billable_windows, compile_calendar, price_matrix
+
+RULE_COLUMNS = (
+    PricingRule.id, PricingRule.shop_id, PricingRule.bike_id, PricingRule.multiplier_percent,
+    PricingRule.days_of_week, PricingRule.start_hour, PricingRule.end_hour,
+    PricingRule.start_date, PricingRule.end_date, PricingRule.priority,
+)
+
+
+@dataclass
+class ShopPricing:
+    version: tuple
+    rules: list  # active rule rows
+    shop: PriceCalendar | None
+    bikes: dict[int, PriceCalendar | None]  # bikes with rules of their own
+
+    def rules_for(self, bike_id: int) -> list:
+        return [rule for rule in self.rules if rule.bike_id is None or rule.bike_id == bike_id]
+
+    def calendar_for(self, bike_id: int, start: int, end: int) -> PriceCalendar | None:
+        """Calendar for a bike covering ``[start, end)`` epoch seconds."""
+        calendar = self.bikes.get(bike_id, self.shop)
+        if calendar is None or calendar.covers(start, end):
+            return calendar
+        first_hour = start // HOUR_SECONDS
+        return compile_calendar(self.rules_for(bike_id), first_hour, -(-end // HOUR_SECONDS) - first_hour)
+
+
+_cache: "OrderedDict[int, ShopPricing]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def invalidate_shop(shop_id: int) -> None:
+    with _lock:
+        _cache.pop(shop_id, None)
+
+
+def _calendar_span() -> tuple[int, int]:
+    first_day = day_number(tz.now().date()) - settings.pricing_calendar_lookback_days
+    return first_day * 24, (settings.pricing_calendar_lookback_days + settings.pricing_calendar_days) * 24
+
+
+def _compile(version: tuple, rules: list) -> ShopPricing:
+    first_hour, n_hours = _calendar_span()
+    shop_rules = [rule for rule in rules if rule.bike_id is None]
+    bikes = {}
+    for bike_id in {rule.bike_id for rule in rules if rule.bike_id is not None}:
+        bike_rules = shop_rules + [rule for rule in rules if rule.bike_id == bike_id]
+        bikes[bike_id] = compile_calendar(bike_rules, first_hour, n_hours)
+    return ShopPricing(
+        version=version,
+        rules=rules,
+        shop=compile_calendar(shop_rules, first_hour, n_hours),
+        bikes=bikes,
+    )
+
+
+def get_shop_pricing(db: Session, shop_ids) -> dict[int, ShopPricing]:
+    """Compiled pricing per shop: one version query, plus one rules query for stale shops."""
+    shop_ids = list(dict.fromkeys(shop_ids))
+    versions = {
+        row.shop_id: (row.last_modified, row.count)
+        for row in db.query(
+            PricingRule.shop_id,
+            func.max(PricingRule.updated_at).label("last_modified"),
+            func.count(PricingRule.id).label("count"),
+        ).filter(id_in(db, PricingRule.shop_id, shop_ids)).group_by(PricingRule.shop_id)
+    }
+
+    pricing, stale = {}, []
+    first_hour, _ = _calendar_span()
+    with _lock:
+        for shop_id in shop_ids:
+            entry = _cache.get(shop_id)
+            if entry is not None and entry.version == versions.get(shop_id, (None, 0)):
+                _cache.move_to_end(shop_id)
+                pricing[shop_id] = entry
+            else:
+                stale.append(shop_id)
+
+    rules_by_shop: dict[int, list] = {}
+    with_rules = [shop_id for shop_id in stale if shop_id in versions]
+    if with_rules:
+        for rule in db.query(*RULE_COLUMNS).filter(
+            id_in(db, PricingRule.shop_id, with_rules), PricingRule.is_active.is_(True)
+        ):
+            rules_by_shop.setdefault(rule.shop_id, []).append(rule)
+
+    for shop_id in stale:
+        pricing[shop_id] = _compile(versions.get(shop_id, (None, 0)), rules_by_shop.get(shop_id, []))
+
+    with _lock:
+        for shop_id in stale:
+            _cache[shop_id] = pricing[shop_id]
+        for shop_id, entry in pricing.items():
+            # Roll the span forward once a day (rules are kept, no query needed)
+            calendars = [entry.shop, *entry.bikes.values()]
+            if any(c is not None and c.first_hour != first_hour for c in calendars):
+                pricing[shop_id] = _cache[shop_id] = _compile(entry.version, entry.rules)
+        while len(_cache) > settings.pricing_calendar_cache_shops:
+            _cache.popitem(last=False)
+    return pricing
+
+
+def price_bikes(db: Session, bikes, starts, ends) -> np.ndarray:
+    """Totals in cents for every bike x window, as an ``(n_bikes, n_windows)`` matrix.
+
+    ``bikes`` need ``id``, ``shop_id``, ``price_per_hour`` and ``price_per_day``.
+    """
+    pricing = get_shop_pricing(db, [bike.shop_id for bike in bikes])
+    window_starts, _, window_ends = billable_windows(starts, ends)
+    span = (int(window_starts.min()), int(window_ends.max())) if len(window_starts) else (0, 0)
+
+    calendars, compiled = [], {}
+    for bike in bikes:
+        key = bike.id if bike.id in pricing[bike.shop_id].bikes else ("shop", bike.shop_id)
+        if key not in compiled:
+            compiled[key] = pricing[bike.shop_id].calendar_for(bike.id, *span)
+        calendars.append(compiled[key])
+
+    return price_matrix(
+        [bike.price_per_hour for bike in bikes], [bike.price_per_day for bike in bikes], calendars, starts, ends
+    )
@@ -0,0 +1,206 @@
+"""
+Per-request query counting and N+1 detection.
+
+SQLAlchemy cursor events attribute every statement (count and DB time) to the
+request currently being served. Requests that repeat the same statement shape
+more than ``settings.query_repeat_warn_threshold`` times are logged as likely
+N+1 patterns.
+
+Use ``assert_max_queries`` in tests to lock in a query budget for an endpoint:
+
+    with assert_max_queries(3):
+        client.get("/api/v1/shops/1")
+"""
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from starlette.routing import Match
+
+from app.config import settings
+from app.utils.logging_config import get_logger
+
+logger = get_logger()
+
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:%\([^)]+\)s|\?|:\w+)\s*,?)+\)", re.IGNORECASE)
+_NUMBER = re.compile(r"\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a SQL statement to its shape (collapse IN lists, numbers and whitespace)."""
+    shape = _IN_LIST.sub("IN (...)", statement)
+    shape = _NUMBER.sub("N", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+@dataclass
+class QueryStats:
+    """Queries issued while serving a single request."""
+    route: str | None = None
+    count: int = 0
+    db_time: float = 0.0  # seconds
+    lock_wait: float = 0.0  # seconds spent waiting for bike locks (app/db/locks.py)
+    shapes: Counter = field(default_factory=Counter)
+    scope: dict | None = field(default=None, repr=False)
+
+    def current_route(self) -> str | None:
+        """Templated route, also while the request is still being served (once routed)."""
+        if self.route is None and self.scope is not None:
+            return getattr(self.scope.get("route"), "path", None)
+        return self.route
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.db_time += elapsed
+        self.shapes[normalize_statement(statement)] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes issued more than ``threshold`` times."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+# Recorders opened by assert_max_queries(); they see every statement on the
+# engine regardless of which thread or event loop issued it.
+_recorders: list[QueryStats] = []
+_recorders_lock = threading.Lock()
+
+# Aggregated totals per templated route: {route: {"requests", "queries", "db_time", "lock_wait"}}
+_route_totals: dict[str, dict[str, float]] = {}
+_route_totals_lock = threading.Lock()
+
+_statement_listeners: list[Callable] = []  # see add_statement_listener()
+
+
+def current_query_stats() -> QueryStats | None:
+    """Return the query stats of the request being served, if any."""
+    return _current_stats.get()
+
+
+def get_route_query_totals() -> dict[str, dict[str, float]]:
+    """Return a snapshot of per-route query count, DB time and lock wait totals."""
+    with _route_totals_lock:
+        return {route: dict(totals) for route, totals in _route_totals.items()}
+
+
+def add_statement_listener(listener: Callable[[Connection, str, object, bool, float], None]) -> None:
+    """Call ``listener(conn, statement, parameters, executemany, elapsed)`` after every timed statement.
+
+    Lets other recorders (e.g. the slow-query log) reuse this timing instead of
+    adding their own cursor events. Idempotent.
+    """
+    if listener not in _statement_listeners:
+        _statement_listeners.append(listener)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # On the execution context, not the connection: a statement that raises
+    # never reaches the after-event, and its context is simply dropped
+    context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start_time
+
+    for listener in _statement_listeners:
+        listener(conn, statement, parameters, executemany, elapsed)
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    if _recorders:
+        with _recorders_lock:
+            for recorder in _recorders:
+                recorder.record(statement, elapsed)
+
+
+def install_query_counter(engine: Engine) -> None:
+    """Attach the query counting listeners to an engine (idempotent)."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+UNMATCHED_ROUTE = "<unmatched>"  # 404s and scanners: one bucket, not one per probed URL
+
+
+def route_template(scope) -> str:
+    """Return the templated path (e.g. ``/api/v1/shops/{shop_id}``) for a served request."""
+    route = scope.get("route")  # FastAPI stores the matched route in the scope
+    if route is not None:
+        return route.path
+    app = scope.get("app")
+    for route in getattr(app, "routes", []):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", UNMATCHED_ROUTE)
+    return UNMATCHED_ROUTE
+
+
+class QueryCounterMiddleware:
+    """Pure ASGI middleware that scopes a QueryStats to each HTTP request."""
+
+    def __init__(self, app, repeat_threshold: int | None = None):
+        self.app = app
+        self.repeat_threshold = (
+            repeat_threshold if repeat_threshold is not None else settings.query_repeat_warn_threshold
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope=scope)
+        token = _current_stats.set(stats)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_stats.reset(token)
+            stats.route = route_template(scope)
+            self._report(scope, stats)
+
+    def _report(self, scope, stats: QueryStats) -> None:
+        with _route_totals_lock:
+            totals = _route_totals.setdefault(stats.route, {"requests": 0, "queries": 0, "db_time": 0.0, "lock_wait": 0.0})
+            totals["requests"] += 1
+            totals["queries"] += stats.count
+            totals["db_time"] += stats.db_time
+            totals["lock_wait"] += stats.lock_wait
+
+        for shape, n in stats.repeated(self.repeat_threshold):
+            logger.warning(
+                "repeated_query",
+                method=scope["method"],
+                route=stats.route,
+                repeats=n,
+                statement=shape,
+            )
+
+
+@contextmanager
+def assert_max_queries(n: int):
+    """Fail with AssertionError if more than ``n`` statements run inside the block."""
+    recorder = QueryStats()
+    with _recorders_lock:
+        _recorders.append(recorder)
+    try:
+        yield recorder
+    finally:
+        with _recorders_lock:
+            _recorders.remove(recorder)
+
+    if recorder.count > n:
+        statements = "\n".join(f"  {count}x {shape}" for shape, count in recorder.shapes.most_common())
+        raise AssertionError(f"Expected at most {n} queries, got {recorder.count}:\n{statements}")
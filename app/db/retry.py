@@ -0,0 +1,76 @@
+"""
+Bounded retry with jitter for optimistic-concurrency conflicts.
+
+``BikeInventory`` carries a ``version`` column (SQLAlchemy ``version_id_col``):
+every ORM UPDATE of an inventory row is issued as ``... WHERE version = :seen``
+and raises ``StaleDataError`` when another transaction changed the row first.
+``retry_on_conflict`` wraps a route handler so such a request rolls back,
+sleeps a random ("full jitter") backoff and runs again from the top, up to
+``settings.conflict_retry_attempts`` times, then answers 409.
+"""
+import functools
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.config import settings
+from app.utils.logging_config import get_logger
+
+logger = get_logger()
+
+
+@dataclass
+class RetryStats:
+    conflicts: int = 0  # StaleDataError caught
+    exhausted: int = 0  # requests answered 409 after the last attempt
+
+
+_stats = RetryStats()
+_stats_lock = threading.Lock()
+
+
+def get_retry_stats() -> dict:
+    with _stats_lock:
+        return asdict(_stats)
+
+
+def reset_retry_stats() -> None:
+    global _stats
+    with _stats_lock:
+        _stats = RetryStats()
+
+
+def backoff_delay(attempt: int, base: float | None = None, cap: float = 1.0) -> float:
+    """Seconds to sleep before retry ``attempt`` (0-based): uniform in [0, base * 2**attempt], capped."""
+    base = base if base is not None else settings.conflict_retry_base_ms / 1000
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def retry_on_conflict(func):
+    """Re-run a route handler (which must take ``db``) when its commit loses a version check."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        db = kwargs["db"]
+        attempts = max(settings.conflict_retry_attempts, 1)
+        for attempt in range(attempts):
+            try:
+                return func(*args, **kwargs)
+            except StaleDataError:
+                db.rollback()
+                with _stats_lock:
+                    _stats.conflicts += 1
+                if attempt + 1 < attempts:
+                    time.sleep(backoff_delay(attempt))
+
+        with _stats_lock:
+            _stats.exhausted += 1
+        logger.warning("conflict_retries_exhausted", handler=func.__name__, attempts=attempts)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="The bike was updated concurrently, please try again"
+        )
+    return wrapper
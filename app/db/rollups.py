@@ -0,0 +1,212 @@
+"""
+Incremental daily booking rollups for shop analytics.
+
+``booking_daily_rollup`` holds one row per bike per UTC day. Booking status
+changes apply their delta in the same transaction as the change itself
+(``apply_booking_transition``):
+
+- pending -> confirmed: +1 booking, +revenue, +booked seconds
+- confirmed -> completed: +1 completed
+- confirmed -> cancelled: -1 booking, -revenue, -booked seconds, +1 cancelled
+
+Pending bookings and rejections never touch the rollups. The nightly
+``reconcile_rollups`` recomputes a window of days from ``bookings`` and
+``bookings_archive`` with vectorized interval math and replaces those rows,
+repairing drift from deltas that were lost or applied twice.
+
+On Postgres the reconcile first locks ``booking_daily_rollup`` in SHARE ROW
+EXCLUSIVE mode, which conflicts with the ROW EXCLUSIVE lock every delta upsert
+takes. A transition that already applied its delta commits before the
+reconcile reads, so the read includes it. A later transition waits until the
+replaced rows are committed and then applies its delta on top of them. No
+delta is lost, and no upsert can create a (bike, day) row between the DELETE
+and the INSERT. Booking confirmations, cancellations and completions stall
+for the length of the reconcile, which is why it runs at night.
+"""
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import and_, delete, insert, or_, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.database import SessionLocal
+from app.db.models import Bike, Booking, BookingArchive, BookingDailyRollup
+from app.utils import tz
+from app.utils.intervals import (
+    DAY_SECONDS, day_from_number, day_number, group_sum, split_by_day, to_epoch_seconds,
+)
+from app.utils.logging_config import get_logger
+
+logger = get_logger()
+
+COUNTERS = ("bookings", "completed", "cancelled", "revenue", "booked_seconds")
+INSERT_CHUNK = 5000
+
+
+def _booking_deltas(booking, shop_id: int, sign: int, completed: int = 0, cancelled: int = 0) -> list[dict]:
+    """Rollup rows (one per day covered) for adding ``sign`` x this booking."""
+    starts = to_epoch_seconds([booking.start_time])
+    ends = to_epoch_seconds([booking.end_time])
+    start_day = int(starts[0] // DAY_SECONDS)
+
+    rows: dict[int, dict] = {}
+
+    def row(day: int) -> dict:
+        return rows.setdefault(day, {
+            "bike_id": booking.bike_id, "day": day_from_number(day), "shop_id": shop_id,
+            **{name: 0 for name in COUNTERS},
+        })
+
+    if sign:
+        _, days, seconds = split_by_day(starts, ends)
+        for day, secs in zip(days.tolist(), seconds.tolist()):
+            row(day)["booked_seconds"] += sign * secs
+        row(start_day)["bookings"] += sign
+        row(start_day)["revenue"] += sign * (booking.total_price or 0)
+    row(start_day)["completed"] += completed
+    row(start_day)["cancelled"] += cancelled
+    return list(rows.values())
+
+
+def _upsert_deltas(db: Session, rows: list[dict]) -> None:
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    stmt = (pg_insert if dialect == "postgresql" else sqlite_insert)(BookingDailyRollup).values(rows)
+    table = BookingDailyRollup.__table__
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["bike_id", "day"],
+        set_={
+            **{name: table.c[name] + stmt.excluded[name] for name in COUNTERS},
+            "updated_at": tz.now(),
+        },
+    )
+    db.execute(stmt)
+
+
+def apply_booking_transition(db: Session, booking, shop_id: int, old_status: str, new_status: str) -> None:
+    """Apply the rollup delta for a status change; the caller commits."""
+    if old_status == "pending" and new_status == "confirmed":
+        rows = _booking_deltas(booking, shop_id, sign=1)
+    elif old_status == "confirmed" and new_status == "completed":
+        rows = _booking_deltas(booking, shop_id, sign=0, completed=1)
+    elif old_status == "confirmed" and new_status == "cancelled":
+        rows = _booking_deltas(booking, shop_id, sign=-1, cancelled=1)
+    else:
+        return
+    _upsert_deltas(db, rows)
+
+
+def _to_datetime(epoch_seconds: int) -> datetime:
+    return datetime.fromtimestamp(epoch_seconds, tz=timezone.utc)
+
+
+def _chunk_contributions(rows, window_start: int, window_end: int):
+    """Vectorized per-(bike, shop, day) contributions of a chunk of booking rows."""
+    bike = np.fromiter((r.bike_id for r in rows), np.int64, len(rows))
+    shop = np.fromiter((r.shop_id for r in rows), np.int64, len(rows))
+    price = np.fromiter((r.total_price or 0 for r in rows), np.int64, len(rows))
+    status = np.array([r.status for r in rows])
+    starts = to_epoch_seconds(r.start_time for r in rows)
+    ends = to_epoch_seconds(r.end_time for r in rows)
+
+    committed = (status == "confirmed") | (status == "completed")
+    starts_in_window = (starts >= window_start) & (starts < window_end)
+
+    # Counts and revenue land on the start day
+    at_start = np.nonzero(starts_in_window)[0]
+    start_keys = [bike[at_start], shop[at_start], starts[at_start] // DAY_SECONDS]
+    start_values = {
+        "bookings": committed[at_start].astype(np.int64),
+        "completed": (status[at_start] == "completed").astype(np.int64),
+        "cancelled": (status[at_start] == "cancelled").astype(np.int64),
+        "revenue": np.where(committed[at_start], price[at_start], 0),
+        "booked_seconds": np.zeros(len(at_start), dtype=np.int64),
+    }
+
+    # Booked time is split across every day in the window the booking covers
+    kept = np.nonzero(committed)[0]
+    index, days, seconds = split_by_day(starts[kept], ends[kept], window_start, window_end)
+    index = kept[index]
+    segment_keys = [bike[index], shop[index], days]
+    segment_values = {name: np.zeros(len(index), dtype=np.int64) for name in COUNTERS}
+    segment_values["booked_seconds"] = seconds
+
+    keys = [np.concatenate([a, b]) for a, b in zip(start_keys, segment_keys)]
+    values = {name: np.concatenate([start_values[name], segment_values[name]]) for name in COUNTERS}
+    return keys, values
+
+
+def reconcile_rollups(db: Session, start_day: date, end_day: date, chunk_size: int = 50000) -> int:
+    """Recompute rollup rows for ``start_day..end_day`` (inclusive) and replace them.
+
+    Runs as one transaction that blocks incremental rollup updates until it
+    commits (on Postgres). Bookings are streamed in chunks; memory is bounded by the number of
+    (bike, day) pairs in the window, not the number of bookings. Returns the
+    number of rollup rows written.
+    """
+    window_start = day_number(start_day) * DAY_SECONDS
+    window_end = (day_number(end_day) + 1) * DAY_SECONDS
+
+    if db.get_bind().dialect.name == "postgresql":
+        # Hold off apply_booking_transition until the rows are replaced (see module docstring)
+        db.execute(text("LOCK TABLE booking_daily_rollup IN SHARE ROW EXCLUSIVE MODE"))
+
+    keys = [np.empty(0, dtype=np.int64) for _ in range(3)]
+    values = {name: np.empty(0, dtype=np.int64) for name in COUNTERS}
+
+    for model in (Booking, BookingArchive):
+        query = (
+            select(model.bike_id, Bike.shop_id, model.start_time, model.end_time, model.status, model.total_price)
+            .join(Bike, Bike.id == model.bike_id)
+            .where(
+                model.start_time < _to_datetime(window_end),
+                model.end_time > _to_datetime(window_start),
+                or_(
+                    model.status.in_(("confirmed", "completed")),
+                    and_(model.status == "cancelled", model.confirmed_at.isnot(None)),
+                ),
+            )
+            .execution_options(yield_per=chunk_size)
+        )
+        for rows in db.execute(query).partitions():
+            chunk_keys, chunk_values = _chunk_contributions(rows, window_start, window_end)
+            merged_keys, merged_values = group_sum(
+                [np.concatenate([a, b]) for a, b in zip(keys, chunk_keys)],
+                {name: np.concatenate([values[name], chunk_values[name]]) for name in COUNTERS},
+            )
+            keys, values = list(merged_keys.T), merged_values
+
+    rollup_rows = [
+        {
+            "bike_id": int(bike_id), "shop_id": int(shop_id), "day": day_from_number(day),
+            **{name: int(values[name][i]) for name in COUNTERS},
+            "updated_at": tz.now(),
+        }
+        for i, (bike_id, shop_id, day) in enumerate(zip(*keys))
+    ]
+
+    db.execute(delete(BookingDailyRollup).where(BookingDailyRollup.day.between(start_day, end_day)))
+    for offset in range(0, len(rollup_rows), INSERT_CHUNK):
+        db.execute(insert(BookingDailyRollup), rollup_rows[offset:offset + INSERT_CHUNK])
+    db.commit()
+
+    logger.info("rollups_reconciled", start_day=str(start_day), end_day=str(end_day), rows=len(rollup_rows))
+    return len(rollup_rows)
+
+
+def run_nightly_reconcile() -> None:
+    """Scheduler entry point: reconcile the recent past and the booked-ahead future."""
+    today = tz.now().date()
+    db = SessionLocal()
+    try:
+        reconcile_rollups(
+            db,
+            today - timedelta(days=settings.rollup_reconcile_lookback_days),
+            today + timedelta(days=settings.rollup_reconcile_lookahead_days),
+        )
+    finally:
+        db.close()
@@ -0,0 +1,202 @@
+"""
+Slow-query recorder with background EXPLAIN capture.
+
+The query counter's cursor events time every statement (see
+``add_statement_listener``); one that takes at least
+``settings.slow_query_ms`` is folded into an entry keyed by its normalized
+SQL (``normalize_statement``) holding count, total/max time, the routes it
+came from and the shapes (types, not values) of its bound parameters.
+
+The store keeps the ``settings.slow_query_max_entries`` worst offenders by
+total time: when full, a new shape evicts the entry with the least total
+time, so a flood of one-off statements cannot push out a query that is
+slow thousands of times a day.
+
+The first time a shape is recorded (and again after
+``settings.slow_query_explain_ttl_seconds``) its statement and parameters
+are queued for a background thread, which runs ``EXPLAIN (ANALYZE off,
+FORMAT JSON)`` on its own connection - outside the request's transaction
+and the app's pool, and without executing the statement. Only PostgreSQL
+is explained. Parameter values never leave that queue.
+
+Entries are per worker; see ``GET /api/v1/admin/slow-queries`` and
+``POST /api/v1/admin/slow-queries/dump``.
+"""
+import json
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.db.query_counter import (
+    add_statement_listener, current_query_stats, install_query_counter, normalize_statement,
+)
+from app.utils.logging_config import get_logger
+
+logger = get_logger()
+
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+@dataclass
+class SlowQuery:
+    statement: str  # normalized
+    count: int = 0
+    total_time: float = 0.0  # seconds
+    max_time: float = 0.0
+    first_seen: datetime | None = None
+    last_seen: datetime | None = None
+    routes: Counter = field(default_factory=Counter)
+    parameter_shapes: list = field(default_factory=list)  # distinct shapes seen, newest last
+    plan: list | dict | None = None  # EXPLAIN (FORMAT JSON) output
+    plan_error: str | None = None
+    explained_at: float | None = None  # time.time()
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["routes"] = dict(self.routes.most_common())
+        data["explained_at"] = (
+            datetime.fromtimestamp(self.explained_at, timezone.utc) if self.explained_at else None
+        )
+        return data
+
+
+def parameter_shape(parameters, executemany: bool = False):
+    """Types of the bound parameters (``{"name": "int"}`` or ``["int", "str"]``), never their values."""
+    if executemany:
+        rows = list(parameters or ())
+        return {"rows": len(rows), "row": parameter_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+class SlowQueryLog:
+    """Bounded top-offender store, plus the queue feeding the EXPLAIN thread."""
+
+    MAX_SHAPES = 5  # distinct parameter shapes kept per statement
+
+    def __init__(self):
+        self._entries: dict[str, SlowQuery] = {}
+        self._lock = threading.Lock()
+        self._explain_queue: queue.Queue = queue.Queue(maxsize=100)
+        self._explain_thread: threading.Thread | None = None
+        self._explain_engines: dict[str, Engine] = {}
+        self._pid: int | None = None
+
+    def record(self, engine: Engine, statement: str, parameters, executemany: bool, elapsed: float) -> None:
+        shape = normalize_statement(statement)
+        stats = current_query_stats()
+        route = (stats.current_route() or "<unrouted>") if stats is not None else "<background>"
+        params_shape = parameter_shape(parameters, executemany)
+        now = datetime.now(timezone.utc)
+
+        with self._lock:
+            entry = self._entries.get(shape)
+            if entry is None:
+                if len(self._entries) >= settings.slow_query_max_entries:
+                    weakest = min(self._entries.values(), key=lambda e: e.total_time)
+                    if weakest.total_time > elapsed:
+                        return  # not slow enough to displace anything
+                    del self._entries[weakest.statement]
+                entry = self._entries[shape] = SlowQuery(statement=shape, first_seen=now)
+            entry.count += 1
+            entry.total_time += elapsed
+            entry.max_time = max(entry.max_time, elapsed)
+            entry.last_seen = now
+            entry.routes[route] += 1
+            if params_shape not in entry.parameter_shapes:
+                entry.parameter_shapes = (entry.parameter_shapes + [params_shape])[-self.MAX_SHAPES:]
+            explain = (
+                entry.explained_at is None
+                or time.time() - entry.explained_at > settings.slow_query_explain_ttl_seconds
+            )
+            if explain:
+                entry.explained_at = time.time()  # claimed; replaced when the plan arrives
+
+        logger.warning("slow_query", route=route, ms=round(elapsed * 1000, 1), statement=shape)
+        if explain:
+            self._queue_explain(engine, shape, statement, parameters[0] if executemany else parameters)
+
+    def _queue_explain(self, engine: Engine, shape: str, statement: str, parameters) -> None:
+        if engine.dialect.name != "postgresql" or not statement.lstrip().upper().startswith(EXPLAINABLE):
+            return
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._explain_queue = queue.Queue(maxsize=100)
+            self._explain_engines.clear()
+            self._explain_thread = threading.Thread(target=self._explain_loop, name="slow-query-explain", daemon=True)
+            self._explain_thread.start()
+        try:
+            self._explain_queue.put_nowait((engine, shape, statement, parameters))
+        except queue.Full:
+            pass
+
+    def _explain_loop(self) -> None:
+        while True:
+            engine, shape, statement, parameters = self._explain_queue.get()
+            plan, error = None, None
+            try:
+                plan = self._explain(engine, statement, parameters)
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+            with self._lock:
+                entry = self._entries.get(shape)
+                if entry is not None:
+                    entry.plan, entry.plan_error, entry.explained_at = plan, error, time.time()
+
+    def _explain(self, engine: Engine, statement: str, parameters):
+        key = str(engine.url)
+        explain_engine = self._explain_engines.get(key)
+        if explain_engine is None:
+            # Own unpooled engine: never competes with requests for a pool slot and
+            # has no listeners, so EXPLAINs are not counted or recorded themselves.
+            explain_engine = self._explain_engines[key] = create_engine(engine.url, poolclass=NullPool)
+        with explain_engine.connect() as conn:
+            result = conn.exec_driver_sql(f"EXPLAIN (ANALYZE off, FORMAT JSON) {statement}", parameters or ())
+            plan = result.scalar()
+            conn.rollback()
+        return json.loads(plan) if isinstance(plan, str) else plan
+
+    def top(self, limit: int = 50) -> list[SlowQuery]:
+        with self._lock:
+            entries = sorted(self._entries.values(), key=lambda e: e.total_time, reverse=True)[:limit]
+            return [SlowQuery(**{**asdict(e), "routes": Counter(e.routes)}) for e in entries]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def dump(self, directory: str | None = None) -> str:
+        """Write the current entries as JSON; returns the file path."""
+        directory = directory or settings.slow_query_dump_dir
+        os.makedirs(directory, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        path = os.path.join(directory, f"slow-queries-{stamp}-{os.getpid()}.json")
+        with open(path, "w") as f:
+            json.dump([entry.to_dict() for entry in self.top(settings.slow_query_max_entries)], f, default=str, indent=2)
+        return path
+
+
+slow_query_log = SlowQueryLog()
+
+
+def _record_if_slow(conn, statement, parameters, executemany, elapsed):
+    if elapsed * 1000 >= settings.slow_query_ms:
+        slow_query_log.record(conn.engine, statement, parameters, executemany, elapsed)
+
+
+def install_slow_query_recorder(engine: Engine) -> None:
+    """Record slow statements on an engine, timed by the query counter's cursor events (idempotent)."""
+    install_query_counter(engine)
+    add_statement_listener(_record_if_slow)
@@ -1,16 +1,29 @@
+from datetime import time, timedelta
+
 from fastapi import Depends, FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
-from sqlalchemy import text
-from sqlalchemy.orm import Session
 
 from app.utils.limiter import limiter
 from app.api.v1 import auth, reviews, users, shops, booking, listing, searchvehicle, passwordreset
-from app.api.v1 import inventory
+from app.api.v1 import analytics, inventory, jobs, pricing, profiling, quotes, slow_queries
+from app.api.v1.oauth2 import require_admin_token
 from app.config import settings
-from app.db.database import get_db
+from app.db.bulk_delete import run_pending_deletions
+from app.db.health import db_probe
+from app.db.inventory_reconcile import run_inventory_reconcile
+from app.db.query_counter import QueryCounterMiddleware
+from app.db.rollups import run_nightly_reconcile
+from app.utils.logging_config import configure_logging
+from app.utils.metrics import MetricsMiddleware, render_metrics
+from app.utils.profiling import ProfilingMiddleware
+from app.utils.request_logging import RequestLoggingMiddleware, writer as request_log_writer
+from app.utils.scheduler import scheduler
+
 
+configure_logging()
 
 app = FastAPI(
     title="RentWheels API",
@@ -18,13 +31,23 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.environment != "production" else None,
     redoc_url="/redoc" if settings.environment != "production" else None,
-
+    default_response_class=ORJSONResponse,
 )
 
 # Set limiter on app state and register exception handler
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# On-demand request profiling; not installed at all unless enabled
+if settings.profiling_enabled:
+    app.add_middleware(ProfilingMiddleware)
+
+# Sampled request log; inside QueryCounterMiddleware so it sees the request's query stats
+app.add_middleware(RequestLoggingMiddleware)
+
+# Attribute query count and DB time to each route, warn on N+1 patterns
+app.add_middleware(QueryCounterMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -35,6 +58,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so latency covers every other middleware
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(users.router, prefix="/api/v1")
@@ -45,6 +71,49 @@ app.include_router(inventory.router, prefix="/api/v1")
 app.include_router(searchvehicle.router, prefix="/api/v1")
 app.include_router(reviews.router, prefix="/api/v1")
 app.include_router(passwordreset.router, prefix="/api/v1")
+app.include_router(jobs.router, prefix="/api/v1")
+app.include_router(analytics.router, prefix="/api/v1")
+app.include_router(quotes.router, prefix="/api/v1")
+app.include_router(pricing.router, prefix="/api/v1")
+app.include_router(profiling.router, prefix="/api/v1")
+app.include_router(slow_queries.router, prefix="/api/v1")
+
+
+@app.on_event("startup")
+def start_scheduler():
+    if not settings.scheduler_enabled:
+        return
+    scheduler.add_daily_job(
+        "rollup_reconcile", run_nightly_reconcile, at=time(hour=settings.rollup_reconcile_hour_utc)
+    )
+    scheduler.add_daily_job(
+        "inventory_reconcile", run_inventory_reconcile, at=time(hour=settings.inventory_reconcile_hour_utc)
+    )
+    # run_now: resume deletions interrupted by the last shutdown
+    scheduler.add_interval_job(
+        "bulk_deletions", run_pending_deletions, every=timedelta(seconds=settings.bulk_delete_poll_seconds), run_now=True
+    )
+    scheduler.start()
+
+
+@app.on_event("startup")
+def start_db_probe():
+    db_probe.start()
+
+
+@app.on_event("shutdown")
+def stop_db_probe():
+    db_probe.stop()
+
+
+@app.on_event("shutdown")
+def stop_scheduler():
+    scheduler.stop()
+
+
+@app.on_event("shutdown")
+def flush_request_log():
+    request_log_writer.stop()
 
 
 @app.get("/")
@@ -68,9 +137,31 @@ def api_info():
 
 
 @app.get("/health")
-def health_check(db: Session = Depends(get_db)):
-    try:
-        db.execute(text("SELECT 1"))
-        return {"status": "healthy", "database": "connected"}
-    except Exception:
+def health_check():
+    """Cached database status (kept for existing probes; prefer /health/live and /health/ready)."""
+    _, checks = db_probe.readiness()
+    if not checks["database"]["ok"]:
         raise HTTPException(status_code=503, detail="Database unavailable")
+    return {"status": "healthy", "database": "connected"}
+
+
+@app.get("/health/live")
+async def liveness():
+    """Liveness: the worker's event loop is serving requests. Touches nothing else."""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness():
+    """Readiness from cached probe results, pool saturation, migration head and scheduler heartbeat."""
+    ready, checks = db_probe.readiness()
+    return ORJSONResponse(
+        {"status": "ready" if ready else "not_ready", "checks": checks},
+        status_code=200 if ready else 503,
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(_admin: bool = Depends(require_admin_token)):
+    """Prometheus metrics, summed over all workers."""
+    return PlainTextResponse(render_metrics(app), media_type="text/plain; version=0.0.4")
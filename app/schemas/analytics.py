@@ -0,0 +1,40 @@
+from pydantic import BaseModel
+from datetime import date
+
+
+class DailyRevenue(BaseModel):
+    day: date
+    revenue: int  # Price in cents
+    bookings: int
+    booked_hours: float
+
+
+class UtilizationStats(BaseModel):
+    revenue: int  # Price in cents
+    bookings: int
+    completed: int
+    cancelled: int
+    booked_hours: float
+    available_hours: float
+    utilization: float  # booked_hours / available_hours, 0.0 - 1.0+
+
+
+class BikeAnalytics(UtilizationStats):
+    bike_id: int
+    name: str
+    bike_type: str
+
+
+class BikeTypeAnalytics(UtilizationStats):
+    bike_type: str
+
+
+class ShopAnalyticsOut(BaseModel):
+    """Revenue and utilization for a shop over a date range (UTC days, inclusive)"""
+    shop_id: int
+    start: date
+    end: date
+    totals: UtilizationStats
+    by_day: list[DailyRevenue]
+    by_bike: list[BikeAnalytics]
+    by_bike_type: list[BikeTypeAnalytics]
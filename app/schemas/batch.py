@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class BatchOut(BaseModel, Generic[T]):
+    """Batch fetch response: found rows keyed by id, plus the ids that were not found"""
+    items: dict[int, T]
+    missing: list[int]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from typing import Optional, Literal
 
@@ -10,6 +10,11 @@ class BookingCreate(BaseModel):
     # Note: customer_id is automatically set from the authenticated user
 
 
+class BookingBatchCreate(BaseModel):
+    """A cart of bookings created all-or-nothing"""
+    items: list[BookingCreate] = Field(..., min_length=1, max_length=20)
+
+
 class Booking(BookingCreate):
     id: int
     customer_id: int
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Optional, Literal
+
+
+class DeletionJobOut(BaseModel):
+    """Progress of a chunked shop/bike deletion"""
+    id: str
+    kind: Literal["shop", "bike"]
+    target_id: int
+    status: Literal["pending", "running", "completed", "failed"]
+    total_bookings: int
+    deleted_bookings: int
+    progress: float  # 0.0 - 1.0
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,51 @@
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from datetime import date, datetime
+from typing import Annotated, Optional
+
+Weekday = Annotated[int, Field(ge=0, le=6)]  # Monday = 0
+
+
+class PricingRuleBase(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    bike_id: Optional[int] = None  # None applies the rule to every bike in the shop
+    multiplier_percent: int = Field(..., ge=1, le=1000)  # 150 = +50%, 80 = -20%
+    days_of_week: Optional[list[Weekday]] = None  # e.g. [5, 6] for weekends
+    start_hour: Optional[int] = Field(None, ge=0, le=23)  # UTC
+    end_hour: Optional[int] = Field(None, ge=1, le=24)  # UTC, exclusive; before start_hour wraps past midnight
+    start_date: Optional[date] = None  # Seasonal rules, inclusive
+    end_date: Optional[date] = None
+    priority: int = 0  # Highest matching priority wins
+    is_active: bool = True
+
+
+class PricingRuleCreate(PricingRuleBase):
+    pass
+
+
+class PricingRuleUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=100)
+    bike_id: Optional[int] = None
+    multiplier_percent: Optional[int] = Field(None, ge=1, le=1000)
+    days_of_week: Optional[list[Weekday]] = None
+    start_hour: Optional[int] = Field(None, ge=0, le=23)
+    end_hour: Optional[int] = Field(None, ge=1, le=24)
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    priority: Optional[int] = None
+    is_active: Optional[bool] = None
+
+
+class PricingRuleOut(PricingRuleBase):
+    id: int
+    shop_id: int
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_validator("days_of_week", mode="before")
+    @classmethod
+    def split_days_of_week(cls, v):
+        if isinstance(v, str):
+            return [int(day) for day in v.split(",") if day.strip()]
+        return v
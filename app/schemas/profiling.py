@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class ProfileSignatureOut(BaseModel):
+    header: str
+    value: str
+    expires_at: datetime
+
+
+class ProfileSessionCreate(BaseModel):
+    method: str = "GET"
+    route: str  # Templated path, e.g. "/api/v1/bikes/{bike_id}"
+    every_n: int = Field(10, ge=1, le=10000)  # Profile one in every N matching requests per worker
+    duration_seconds: int = Field(300, ge=1, le=3600)
+
+
+class ProfileSessionOut(BaseModel):
+    id: str
+    method: str
+    route: str
+    every_n: int
+    created_at: datetime
+    expires_at: datetime
+
+
+class ProfileOut(BaseModel):
+    name: str
+    created_at: datetime
+    method: str
+    route: Optional[str] = None
+    path: str
+    request_id: Optional[str] = None
+    session_id: Optional[str] = None
+    status: Optional[int] = None
+    duration_ms: Optional[float] = None
+    samples: int
+    ticks: int
+    interval_ms: float
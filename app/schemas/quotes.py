@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+
+class QuoteWindow(BaseModel):
+    start_time: datetime
+    end_time: datetime
+
+
+class QuoteRequest(BaseModel):
+    bike_ids: list[int] = Field(..., min_length=1)
+    windows: list[QuoteWindow] = Field(..., min_length=1)
+
+
+class QuoteOut(BaseModel):
+    """Quote matrix: for each found bike, the total price (cents) of every requested window, in request order"""
+    windows: list[QuoteWindow]
+    items: dict[int, list[int]]
+    missing: list[int]
@@ -2,6 +2,10 @@ from pydantic import BaseModel, EmailStr, ConfigDict, Field
 from datetime import datetime, time
 from typing import Optional
 
+from app.schemas.bikes import BikeOut
+from app.schemas.inventory import BikeInventoryOut
+from app.schemas.reviews import ReviewOut
+
 
 class ShopCreate(BaseModel):
     name: str
@@ -39,4 +43,21 @@ class ShopUpdate(BaseModel):
 
 
 class ShopOut(Shop):
-    pass
\ No newline at end of file
+    pass
+
+
+class BikeWithInventory(BikeOut):
+    inventory: Optional[BikeInventoryOut] = None
+
+
+class RatingSummary(BaseModel):
+    average: Optional[float] = None  # None when the shop has no reviews
+    count: int
+    distribution: dict[int, int]  # rating (1-5) -> number of reviews
+
+
+class ShopDetailOut(ShopOut):
+    """Shop page payload: shop, fleet with inventory, rating summary and latest reviews"""
+    bikes: list[BikeWithInventory]
+    rating: RatingSummary
+    reviews: list[ReviewOut]
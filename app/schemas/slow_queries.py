@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+
+class SlowQueryOut(BaseModel):
+    statement: str  # Normalized SQL
+    count: int
+    total_time: float  # seconds
+    max_time: float
+    first_seen: datetime
+    last_seen: datetime
+    routes: dict[str, int]
+    parameter_shapes: list[Any]
+    plan: Optional[Any] = None  # EXPLAIN (FORMAT JSON); None while pending or on non-PostgreSQL databases
+    plan_error: Optional[str] = None
+    explained_at: Optional[datetime] = None
+
+
+class SlowQueryDumpOut(BaseModel):
+    path: str
+    entries: int
@@ -0,0 +1,55 @@
+"""
+Helpers for batch fetch endpoints (``GET /bikes?ids=1,2,3`` and friends).
+
+Ids arrive as one comma-separated query value, are de-duplicated and capped,
+and are loaded with a single ``WHERE id = ANY(:ids)`` query (``IN (...)`` on
+databases without arrays). Ids that do not exist are reported back instead of
+failing the whole request.
+"""
+from fastapi import HTTPException, status
+from sqlalchemy import Integer, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+MAX_BATCH_IDS = 100
+IDS_DESCRIPTION = f"Comma-separated ids (at most {MAX_BATCH_IDS})"
+
+
+def parse_ids(ids: str, cap: int = MAX_BATCH_IDS) -> list[int]:
+    """Parse ``1,2,3`` into unique ints (in request order), enforcing the cap."""
+    try:
+        parsed = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers"
+        )
+
+    unique = list(dict.fromkeys(parsed))
+    if not unique:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one id is required"
+        )
+    if len(unique) > cap:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {cap} ids can be requested at once"
+        )
+    return unique
+
+
+def id_in(db: Session, column, ids: list[int]):
+    """``column = ANY(:ids)`` on Postgres (one array bind), ``column IN (...)`` elsewhere."""
+    if db.get_bind().dialect.name == "postgresql":
+        return column == any_(bindparam("batch_ids", ids, type_=ARRAY(Integer)))
+    return column.in_(ids)
+
+
+def keyed_batch(rows, ids: list[int], key: str = "id") -> dict:
+    """Build the ``{"items": {id: row}, "missing": [...]}`` batch payload."""
+    items = {getattr(row, key): row for row in rows}
+    return {
+        "items": items,
+        "missing": [i for i in ids if i not in items],
+    }
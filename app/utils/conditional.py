@@ -0,0 +1,75 @@
+"""
+Conditional GET support (ETag / Last-Modified) for catalog resources.
+
+Validators come from a cheap aggregate - ``max(updated_at)`` and ``count(id)``
+over the rows a response would contain - so a poll that hits ``If-None-Match``
+or ``If-Modified-Since`` is answered with 304 before any row is loaded or
+serialized. The count makes deletions change the ETag even when the newest
+``updated_at`` does not.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+# Cache-Control policies per catalog endpoint. Shops change rarely; bike
+# prices and availability flags change more often; reviews trickle in.
+CACHE_SHOP = "public, max-age=60, stale-while-revalidate=300"
+CACHE_BIKE = "public, max-age=30, stale-while-revalidate=60"
+CACHE_SHOP_BIKES = "public, max-age=30, stale-while-revalidate=60"
+CACHE_SHOP_REVIEWS = "public, max-age=120, stale-while-revalidate=600"
+
+
+def catalog_version(db: Session, model, *criteria) -> tuple[datetime | None, int]:
+    """Return (max(updated_at), row count) for the rows of ``model`` matching ``criteria``."""
+    last_modified, count = db.query(func.max(model.updated_at), func.count(model.id)).filter(*criteria).one()
+    if last_modified is not None and last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)  # stored as naive UTC
+    return last_modified, count
+
+
+def weak_etag(*parts) -> str:
+    """Build a weak ETag from the given validator parts."""
+    digest = hashlib.blake2b("|".join(str(p) for p in parts).encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _opaque_tag(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since against the current validators."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [t.strip() for t in if_none_match.split(",")]
+        return "*" in tags or any(_opaque_tag(t) == _opaque_tag(etag) for t in tags)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def validator_headers(etag: str, last_modified: datetime | None, cache_control: str) -> dict[str, str]:
+    """ETag, Last-Modified and Cache-Control headers for a catalog response."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    return headers
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    """Empty 304 response carrying the current validators."""
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,83 @@
+"""
+Vectorized interval math for booking analytics.
+
+Bookings are half-open ``[start, end)`` intervals in epoch seconds (UTC).
+Everything here works on whole NumPy arrays at once, so rollups over many
+bookings never fall back to per-booking Python loops.
+"""
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+DAY_SECONDS = 86400
+EPOCH = date(1970, 1, 1)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value  # stored as naive UTC
+
+
+def to_epoch_seconds(values) -> np.ndarray:
+    """Convert datetimes (naive UTC or aware) to an int64 array of epoch seconds."""
+    return np.array([_naive_utc(v) for v in values], dtype="datetime64[s]").astype(np.int64)
+
+
+def day_number(value: date) -> int:
+    """Days since 1970-01-01 for a date."""
+    return (value - EPOCH).days
+
+
+def day_from_number(number: int) -> date:
+    return date.fromordinal(EPOCH.toordinal() + int(number))
+
+
+def split_by_day(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    window_start: int | None = None,
+    window_end: int | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Split intervals at UTC midnight, optionally clipped to ``[window_start, window_end)``.
+
+    Returns ``(interval_index, day_number, seconds)`` with one entry per
+    (interval, day) segment; empty or out-of-window intervals produce none.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    if window_start is not None:
+        starts = np.maximum(starts, window_start)
+    if window_end is not None:
+        ends = np.minimum(ends, window_end)
+
+    index = np.nonzero(ends > starts)[0]
+    s, e = starts[index], ends[index]
+    first = s // DAY_SECONDS
+    counts = (e - 1) // DAY_SECONDS - first + 1
+
+    # Position of each segment within its interval: 0, 1, ... counts-1
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    days = np.repeat(first, counts) + offsets
+    seg_start = np.maximum(np.repeat(s, counts), days * DAY_SECONDS)
+    seg_end = np.minimum(np.repeat(e, counts), (days + 1) * DAY_SECONDS)
+    return np.repeat(index, counts), days, seg_end - seg_start
+
+
+def group_sum(keys: list[np.ndarray], values: dict[str, np.ndarray]) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """Sum ``values`` by the composite key formed from ``keys``.
+
+    Returns the unique keys as an ``(n, len(keys))`` int64 array and the
+    per-key sums of each value column.
+    """
+    if len(keys[0]) == 0:
+        return np.empty((0, len(keys)), dtype=np.int64), {name: np.empty(0, dtype=np.int64) for name in values}
+    stacked = np.column_stack([np.asarray(k, dtype=np.int64) for k in keys])
+    unique, inverse = np.unique(stacked, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    sums = {}
+    for name, column in values.items():
+        totals = np.zeros(len(unique), dtype=np.int64)
+        np.add.at(totals, inverse, np.asarray(column, dtype=np.int64))
+        sums[name] = totals
+    return unique, sums
@@ -5,9 +5,11 @@ Import this module to access the limiter, avoiding circular imports.
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+from app.config import settings
+
 # Initialize rate limiter
 
 def get_limiter():
-    return Limiter(key_func=get_remote_address)
+    return Limiter(key_func=get_remote_address, enabled=settings.rate_limit_enabled)
 
 limiter = get_limiter() 
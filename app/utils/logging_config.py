@@ -1,13 +1,13 @@
 import structlog
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
 #from app.main import app
 
 
 def configure_logging():
     structlog.configure(
         processors=[
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso", utc=True),
+            structlog.processors.format_exc_info,
             structlog.processors.JSONRenderer()
         ]
     )
@@ -15,4 +15,4 @@ def configure_logging():
 def get_logger():
     return structlog.get_logger()
 
-#middleware
+# Request logging middleware: app/utils/request_logging.py
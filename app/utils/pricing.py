@@ -0,0 +1,128 @@
+"""
+Vectorized booking price engine.
+
+Bookings are charged whole days at ``price_per_day`` plus the remaining
+(fractional) hours at ``price_per_hour``, with a one hour minimum, truncated
+to whole cents. Pricing rules scale those rates hour by hour with a
+multiplier in percent (100 = base rate).
+
+Rules are compiled ahead of time into a ``PriceCalendar``: the multiplier of
+every hour in a span plus its prefix sums, so the multiplier-weighted length
+of any window is two array lookups rather than a walk over its hours. A bike
+without rules has no calendar and is priced at its base rates.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.utils.intervals import DAY_SECONDS, day_number, to_epoch_seconds
+
+HOUR_SECONDS = 3600
+BASE_MULTIPLIER = 100
+
+
+@dataclass
+class PriceCalendar:
+    first_hour: int  # epoch hour (UTC) of multipliers[0]
+    multipliers: np.ndarray  # int64 percent per hour
+    cumulative: np.ndarray  # prefix sums of multipliers, len(multipliers) + 1
+
+    @property
+    def end_hour(self) -> int:
+        return self.first_hour + len(self.multipliers)
+
+    def covers(self, start: int, end: int) -> bool:
+        """True if ``[start, end)`` (epoch seconds) lies inside the calendar."""
+        return start >= self.first_hour * HOUR_SECONDS and end <= self.end_hour * HOUR_SECONDS
+
+    def _integral(self, t: np.ndarray) -> np.ndarray:
+        offset = np.asarray(t, dtype=np.int64) - self.first_hour * HOUR_SECONDS
+        hour = np.clip(offset // HOUR_SECONDS, 0, len(self.multipliers) - 1)
+        return self.cumulative[hour] * HOUR_SECONDS + (offset - hour * HOUR_SECONDS) * self.multipliers[hour]
+
+    def weighted_seconds(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Multiplier x seconds summed over each ``[start, end)``; the windows must be covered."""
+        return self._integral(ends) - self._integral(starts)
+
+
+def _weekdays(days_of_week: str) -> list[int]:
+    return [int(day) for day in days_of_week.split(",") if day.strip()]
+
+
+def compile_calendar(rules, first_hour: int, n_hours: int) -> PriceCalendar | None:
+    """Compile pricing rules into hourly multipliers for ``n_hours`` from ``first_hour``.
+
+    Where several rules match an hour the one with the highest ``priority``
+    wins; ties go to bike rules over shop rules, then to the newer rule.
+    Returns None when there are no rules (base rates everywhere).
+    """
+    if not rules:
+        return None
+    hours = first_hour + np.arange(n_hours, dtype=np.int64)
+    days = hours // 24
+    hour_of_day = hours % 24
+    weekday = (days + 3) % 7  # 1970-01-01 was a Thursday; Monday = 0
+
+    multipliers = np.full(n_hours, BASE_MULTIPLIER, dtype=np.int64)
+    for rule in sorted(rules, key=lambda r: (r.priority, r.bike_id is not None, r.id)):
+        mask = np.ones(n_hours, dtype=bool)
+        if rule.days_of_week:
+            mask &= np.isin(weekday, _weekdays(rule.days_of_week))
+        if rule.start_hour is not None or rule.end_hour is not None:
+            start_hour = rule.start_hour or 0
+            end_hour = rule.end_hour if rule.end_hour is not None else 24
+            if start_hour < end_hour:
+                mask &= (hour_of_day >= start_hour) & (hour_of_day < end_hour)
+            else:  # wraps past midnight, e.g. 22-6
+                mask &= (hour_of_day >= start_hour) | (hour_of_day < end_hour)
+        if rule.start_date is not None:
+            mask &= days >= day_number(rule.start_date)
+        if rule.end_date is not None:
+            mask &= days <= day_number(rule.end_date)
+        multipliers[mask] = rule.multiplier_percent
+
+    cumulative = np.concatenate([[0], np.cumsum(multipliers)])
+    return PriceCalendar(first_hour=first_hour, multipliers=multipliers, cumulative=cumulative)
+
+
+def billable_windows(starts, ends) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Epoch-second arrays ``(start, end of the whole days, billable end)`` per window.
+
+    Windows shorter than an hour are billed as one hour.
+    """
+    starts = to_epoch_seconds(starts)
+    ends = np.maximum(to_epoch_seconds(ends), starts + HOUR_SECONDS)
+    day_ends = starts + (ends - starts) // DAY_SECONDS * DAY_SECONDS
+    return starts, day_ends, ends
+
+
+def weighted_seconds(calendar: PriceCalendar | None, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    if calendar is None:
+        return (ends - starts) * BASE_MULTIPLIER
+    return calendar.weighted_seconds(starts, ends)
+
+
+def price_matrix(price_per_hour, price_per_day, calendars, starts, ends) -> np.ndarray:
+    """Totals in cents as an ``(n_bikes, n_windows)`` int64 matrix.
+
+    ``price_per_hour``, ``price_per_day`` and ``calendars`` hold one entry per
+    bike (calendar None = base rates); ``starts``/``ends`` one per window.
+    Bikes sharing a calendar share its weighted window lengths.
+    """
+    window_starts, day_ends, window_ends = billable_windows(starts, ends)
+    n_bikes, n_windows = len(calendars), len(window_starts)
+    day_weight = np.empty((n_bikes, n_windows), dtype=np.int64)
+    hour_weight = np.empty((n_bikes, n_windows), dtype=np.int64)
+
+    groups: dict[int, list[int]] = {}
+    for row, calendar in enumerate(calendars):
+        groups.setdefault(id(calendar), []).append(row)
+    for rows in groups.values():
+        calendar = calendars[rows[0]]
+        day_weight[rows] = weighted_seconds(calendar, window_starts, day_ends)
+        hour_weight[rows] = weighted_seconds(calendar, day_ends, window_ends)
+
+    per_hour = np.asarray(price_per_hour, dtype=np.int64)[:, np.newaxis]
+    per_day = np.asarray(price_per_day, dtype=np.int64)[:, np.newaxis]
+    # day_weight / (24h x 100%) days at price_per_day + hour_weight / (1h x 100%) hours at price_per_hour
+    return (per_day * day_weight + per_hour * hour_weight * 24) // (DAY_SECONDS * BASE_MULTIPLIER)
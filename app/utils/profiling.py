@@ -0,0 +1,317 @@
+"""
+On-demand sampling profiles of live requests.
+
+Two ways to profile, both only when ``settings.profiling_enabled`` (otherwise
+``ProfilingMiddleware`` is not installed at all):
+
+- Single request: send ``X-Profile-Request: <sign_admin_value(expires)>``
+  from an admin host (``POST /api/v1/admin/profiles/signature`` mints one).
+  The response carries ``X-Profile: <name>`` naming the written profile.
+- Background sessions: ``POST /api/v1/admin/profiles/sessions`` profiles
+  every N-th request to one route in each worker until the session expires.
+  Sessions live in ``<profiling_dir>/sessions.json`` so every worker sees them.
+
+While a profiled request runs, a sampler thread snapshots all thread stacks
+(``sys._current_frames``) every ``profiling_sample_interval_ms`` and keeps
+those running the route's endpoint function - in the threadpool for sync
+handlers, on the event loop for async ones - rooted at that function.
+Concurrent requests to the same endpoint are sampled too. When the request
+ends, the stacks are written in collapsed ("folded") format, one
+``frame;frame;frame count`` line per stack, ready for flamegraph.pl or
+speedscope, next to a JSON sidecar with the request's details. Only the
+newest ``profiling_max_files`` profiles are kept.
+"""
+import inspect
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+
+from starlette.routing import compile_path
+
+from app.api.v1.oauth2 import verify_admin_signature
+from app.config import settings
+from app.utils.logging_config import get_logger
+
+logger = get_logger()
+
+PROFILE_REQUEST_HEADER = b"x-profile-request"
+PROFILE_NAME_HEADER = b"x-profile"
+SESSIONS_FILE = "sessions.json"
+PROFILE_NAME = re.compile(r"^[\w.-]+\.folded$")
+
+_SLUG = re.compile(r"[^A-Za-z0-9]+")
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + os.sep
+_slots = threading.BoundedSemaphore(max(settings.profiling_max_concurrent, 1))
+_frame_labels: dict = {}  # code object -> "func (file:line)"
+
+
+def _frame_label(code) -> str:
+    label = _frame_labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        marker = filename.rfind("site-packages/")
+        if marker >= 0:
+            short = filename[marker + len("site-packages/"):]
+        else:
+            short = filename.removeprefix(_PROJECT_ROOT)
+        label = _frame_labels[code] = f"{code.co_name} ({short}:{code.co_firstlineno})"
+    return label
+
+
+def _endpoint_code(scope):
+    """Code object of the matched route's endpoint, once routing has happened."""
+    route = scope.get("route")
+    if route is None:
+        return None
+    return getattr(inspect.unwrap(route.endpoint), "__code__", None)
+
+
+class StackSampler(threading.Thread):
+    """Samples the stacks running one request's endpoint until ``finish`` is called."""
+
+    def __init__(self, scope, session_id: str | None = None):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.scope = scope
+        self.session_id = session_id
+        self.interval = settings.profiling_sample_interval_ms / 1000
+        self.stacks: Counter = Counter()
+        self.ticks = 0
+        self.started_at = datetime.now(timezone.utc)
+        request_id = scope.get("state", {}).get("request_id") or uuid.uuid4().hex
+        self.name_stem = "-".join((
+            self.started_at.strftime("%Y%m%dT%H%M%S"),
+            str(os.getpid()),
+            scope["method"],
+            _SLUG.sub("_", scope["path"]).strip("_")[:60] or "root",
+            session_id or request_id[:12],
+        ))
+        self.file_name = f"{self.name_stem}-{uuid.uuid4().hex[:6]}.folded"
+        self._done = threading.Event()
+        self._result: dict = {}
+
+    def run(self) -> None:
+        try:
+            while not self._done.wait(self.interval):
+                self._sample()
+            self._write()
+        except Exception:
+            logger.exception("profile_failed", profile=self.file_name)
+        finally:
+            _slots.release()
+
+    def _sample(self) -> None:
+        target = _endpoint_code(self.scope)
+        self.ticks += 1
+        if target is None:
+            return
+        for ident, frame in sys._current_frames().items():
+            if ident == self.ident:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                if frame.f_code is target:
+                    self.stacks[";".join(_frame_label(code) for code in reversed(stack))] += 1
+                    break
+                frame = frame.f_back
+
+    def finish(self, status_code: int, duration: float) -> None:
+        self._result = {"status": status_code, "duration_ms": round(duration * 1000, 2)}
+        self._done.set()
+
+    def _write(self) -> None:
+        directory = settings.profiling_dir
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, self.file_name)
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        route = self.scope.get("route")
+        meta = {
+            "name": self.file_name,
+            "created_at": self.started_at.isoformat(),
+            "method": self.scope["method"],
+            "route": getattr(route, "path", None),
+            "path": self.scope["path"],
+            "request_id": self.scope.get("state", {}).get("request_id"),
+            "session_id": self.session_id,
+            "samples": sum(self.stacks.values()),
+            "ticks": self.ticks,
+            "interval_ms": settings.profiling_sample_interval_ms,
+            **self._result,
+        }
+        with open(path[:-len(".folded")] + ".json", "w") as f:
+            json.dump(meta, f)
+        _prune(directory)
+
+
+def _prune(directory: str) -> None:
+    """Delete the oldest profiles beyond ``settings.profiling_max_files``."""
+    names = sorted(n for n in os.listdir(directory) if PROFILE_NAME.match(n))
+    for name in names[:max(len(names) - settings.profiling_max_files, 0)]:
+        for path in (os.path.join(directory, name), os.path.join(directory, name[:-len(".folded")] + ".json")):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def list_profiles(limit: int = 100) -> list[dict]:
+    """Metadata of the newest profiles, newest first."""
+    directory = settings.profiling_dir
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for name in sorted((n for n in os.listdir(directory) if PROFILE_NAME.match(n)), reverse=True)[:limit]:
+        try:
+            with open(os.path.join(directory, name[:-len(".folded")] + ".json")) as f:
+                profiles.append(json.load(f))
+        except (OSError, ValueError):
+            continue  # still being written
+    return profiles
+
+
+def read_profile(name: str) -> str | None:
+    if not PROFILE_NAME.match(name):
+        return None
+    try:
+        with open(os.path.join(settings.profiling_dir, name)) as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+class SessionStore:
+    """Background profiling sessions shared by all workers through a JSON file."""
+
+    RELOAD_SECONDS = 1.0
+
+    def __init__(self):
+        self._sessions: list[dict] = []
+        self._patterns: list[tuple[dict, re.Pattern]] = []
+        self._seen: Counter = Counter()  # session id -> matching requests in this worker
+        self._checked = 0.0
+        self._mtime = None
+
+    @property
+    def path(self) -> str:
+        return os.path.join(settings.profiling_dir, SESSIONS_FILE)
+
+    def _read(self) -> list[dict]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _write(self, sessions: list[dict]) -> None:
+        os.makedirs(settings.profiling_dir, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(sessions, f)
+        os.replace(tmp, self.path)
+        self._checked = 0.0  # reload on the next request
+
+    def active(self) -> list[dict]:
+        now = time.time()
+        return [s for s in self._read() if s["expires_at"] > now]
+
+    def add(self, method: str, route: str, every_n: int, duration_seconds: int) -> dict:
+        now = time.time()
+        session = {
+            "id": uuid.uuid4().hex[:8],
+            "method": method.upper(),
+            "route": route,
+            "every_n": every_n,
+            "created_at": now,
+            "expires_at": now + duration_seconds,
+        }
+        self._write(self.active() + [session])
+        return session
+
+    def remove(self, session_id: str) -> bool:
+        sessions = self.active()
+        remaining = [s for s in sessions if s["id"] != session_id]
+        self._write(remaining)
+        return len(remaining) < len(sessions)
+
+    def pick(self, scope) -> str | None:
+        """Id of the session that wants this request profiled, if any."""
+        now = time.monotonic()
+        if now - self._checked >= self.RELOAD_SECONDS:
+            self._checked = now
+            self._reload()
+        if not self._patterns:
+            return None
+        wall = time.time()
+        for session, pattern in self._patterns:
+            if session["expires_at"] > wall and session["method"] == scope["method"] and pattern.match(scope["path"]):
+                self._seen[session["id"]] += 1
+                if self._seen[session["id"]] % session["every_n"] == 0:
+                    return session["id"]
+        return None
+
+    def _reload(self) -> None:
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            mtime = None
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+        self._sessions = self._read() if mtime is not None else []
+        self._patterns = [(s, compile_path(s["route"])[0]) for s in self._sessions]
+
+
+sessions = SessionStore()
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware starting a StackSampler for signed or session-selected requests."""
+
+    def __init__(self, app, store: SessionStore = sessions):
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        signed = next((value for name, value in scope["headers"] if name == PROFILE_REQUEST_HEADER), None)
+        session_id = None
+        if signed is not None:
+            client = scope.get("client")
+            if not verify_admin_signature(signed.decode("latin-1"), client[0] if client else None):
+                logger.warning("profile_signature_rejected", path=scope["path"])
+                signed = None
+        if signed is None:
+            session_id = self.store.pick(scope)
+        if (signed is None and session_id is None) or not _slots.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = StackSampler(scope, session_id)
+        name_header = (PROFILE_NAME_HEADER, sampler.file_name.encode())
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if signed is not None:
+                    message = {**message, "headers": [*message.get("headers", ()), name_header]}
+            await send(message)
+
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.finish(status_code, time.perf_counter() - start)
@@ -0,0 +1,216 @@
+"""
+Structured, sampled request logging off the request path.
+
+``RequestLoggingMiddleware`` (pure ASGI) assigns every HTTP request an id
+(the caller's ``X-Request-ID`` if it sent a sane one), echoes it in the
+response and exposes it as ``request.state.request_id``. When the response
+is done it decides whether to log the request:
+
+- 5xx/4xx responses and requests slower than ``settings.request_log_slow_ms``
+  are always logged;
+- everything else is logged with probability ``settings.request_log_sample_rate``
+  (the rate is included in the record, so counts can be re-weighted).
+
+A logged request costs the handler one ``put_nowait`` of a small tuple on a
+bounded queue. A background thread drains it, resolves the user id from the
+bearer token (signature-checked, no database access) and writes one JSON
+line through structlog. When the writer falls behind, records are dropped
+and counted instead of blocking requests (``get_request_log_stats``).
+
+The middleware must sit inside ``QueryCounterMiddleware`` so it can read the
+request's query count, DB time and lock wait from ``current_query_stats()``.
+"""
+import os
+import queue
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+
+import jwt
+
+from app.config import settings
+from app.db.query_counter import current_query_stats, route_template
+from app.utils.logging_config import get_logger
+
+logger = get_logger()
+
+REQUEST_ID_HEADER = b"x-request-id"
+_VALID_REQUEST_ID = re.compile(rb"^[A-Za-z0-9._-]{8,64}$")
+_STOP = object()
+
+
+@dataclass
+class RequestLogStats:
+    queued: int = 0
+    written: int = 0
+    dropped: int = 0  # queue full
+
+
+_stats = RequestLogStats()
+_stats_lock = threading.Lock()
+
+
+def get_request_log_stats() -> dict:
+    with _stats_lock:
+        return asdict(_stats)
+
+
+def _user_id(authorization: bytes | None) -> int | None:
+    """User id of a bearer token, if its signature is valid (expiry is not checked)."""
+    if not authorization or not authorization.startswith(b"Bearer "):
+        return None
+    try:
+        payload = jwt.decode(
+            authorization[7:].decode(), settings.secret_key, algorithms=[settings.algorithm],
+            options={"verify_exp": False},
+        )
+    except (jwt.InvalidTokenError, UnicodeDecodeError):
+        return None
+    return payload.get("user_id")
+
+
+class RequestLogWriter:
+    """Bounded queue of request records drained by one daemon thread."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._queue: queue.Queue | None = None
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, record: tuple) -> None:
+        if self._pid != os.getpid():  # first request in this (forked) worker
+            self.start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with _stats_lock:
+                _stats.dropped += 1
+            return
+        with _stats_lock:
+            _stats.queued += 1
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=self.maxsize)
+            self._thread = threading.Thread(target=self._run, name="request-log-writer", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write what is queued, then stop the thread."""
+        if self._thread is None or self._pid != os.getpid():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+        self._pid = None
+
+    def _run(self) -> None:
+        while True:
+            record = self._queue.get()
+            if record is _STOP:
+                return
+            try:
+                self._write(record)
+            except Exception:
+                logger.exception("request_log_write_failed")
+
+    def _write(self, record: tuple) -> None:
+        (request_id, method, route, path, status_code, duration, stats,
+         authorization, client, sample_rate, reason) = record
+        fields = {
+            "request_id": request_id,
+            "method": method,
+            "route": route,
+            "path": path,
+            "status": status_code,
+            "duration_ms": round(duration * 1000, 2),
+            "user_id": _user_id(authorization),
+            "client": client,
+            "reason": reason,
+            "sample_rate": sample_rate,
+        }
+        if stats is not None:
+            fields.update(
+                queries=stats.count,
+                db_ms=round(stats.db_time * 1000, 2),
+                lock_wait_ms=round(stats.lock_wait * 1000, 2),
+            )
+        if status_code >= 500:
+            logger.error("request", **fields)
+        elif reason == "sampled":
+            logger.info("request", **fields)
+        else:
+            logger.warning("request", **fields)
+        with _stats_lock:
+            _stats.written += 1
+
+
+writer = RequestLogWriter(settings.request_log_queue_size)
+
+
+def _request_id(headers) -> str:
+    for name, value in headers:
+        if name == REQUEST_ID_HEADER and _VALID_REQUEST_ID.match(value):
+            return value.decode()
+    return uuid.uuid4().hex
+
+
+class RequestLoggingMiddleware:
+    """Pure ASGI middleware tagging requests with an id and queueing sampled log records."""
+
+    def __init__(self, app, writer: RequestLogWriter = writer):
+        self.app = app
+        self.writer = writer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.request_log_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _request_id(scope["headers"])
+        scope.setdefault("state", {})["request_id"] = request_id
+        id_header = (REQUEST_ID_HEADER, request_id.encode())
+        status_code = 500  # if the app raises before responding
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message = {**message, "headers": [*message.get("headers", ()), id_header]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            if status_code >= 400:
+                reason = "error"
+            elif duration * 1000 >= settings.request_log_slow_ms:
+                reason = "slow"
+            elif random.random() < settings.request_log_sample_rate:
+                reason = "sampled"
+            else:
+                reason = None
+            if reason is not None:
+                self._submit(scope, request_id, status_code, duration, reason)
+
+    def _submit(self, scope, request_id: str, status_code: int, duration: float, reason: str) -> None:
+        authorization = next((value for name, value in scope["headers"] if name == b"authorization"), None)
+        client = scope.get("client")
+        self.writer.submit((
+            request_id, scope["method"], route_template(scope), scope["path"], status_code, duration,
+            current_query_stats(), authorization, client[0] if client else None,
+            settings.request_log_sample_rate, reason,
+        ))
@@ -0,0 +1,89 @@
+"""
+Fast response helpers for list endpoints.
+
+FastAPI's default path validates each ORM row through the response model,
+runs ``jsonable_encoder`` over the result and encodes it with the stdlib
+``json``. For list pages that dominates CPU, so list endpoints instead:
+
+- select only the schema's columns as rows (``columns_for``), skipping the ORM
+  identity map,
+- validate the whole page in one ``TypeAdapter`` call, and
+- encode straight to JSON bytes with pydantic-core (``list_response``).
+
+List endpoints also accept a ``fields=`` sparse fieldset (``parse_fields``),
+which prunes both the SQL projection and the serialized payload.
+
+Returning a Response directly makes FastAPI skip its own response_model pass;
+routes keep ``response_model`` for the OpenAPI schema.
+"""
+from functools import lru_cache
+
+from fastapi import HTTPException, status
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter, create_model
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return (e.g. id,name,price_per_day); defaults to all"
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[schema])
+
+
+@lru_cache(maxsize=256)
+def _sparse_list_adapter(schema: type[BaseModel], fields: tuple[str, ...]) -> TypeAdapter:
+    """Adapter for a generated model holding only ``fields`` of ``schema``."""
+    definitions = {
+        name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields
+    }
+    sparse = create_model(f"{schema.__name__}Sparse", **definitions)
+    return TypeAdapter(list[sparse])
+
+
+def parse_fields(schema: type[BaseModel], fields: str | None) -> tuple[str, ...] | None:
+    """Validate a ``fields=`` query value against the schema's fields.
+
+    Returns the requested names in schema order, or None for the full schema.
+    """
+    if fields is None or not fields.strip():
+        return None
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - schema.model_fields.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. "
+                   f"Allowed: {', '.join(schema.model_fields)}"
+        )
+    return tuple(name for name in schema.model_fields if name in requested)
+
+
+def columns_for(model, schema: type[BaseModel], fields: tuple[str, ...] | None = None) -> list:
+    """ORM columns of ``model`` needed to build ``schema`` (or just ``fields``), in field order."""
+    return [getattr(model, name) for name in (fields or schema.model_fields)]
+
+
+def serialize_list(schema: type[BaseModel], rows, fields: tuple[str, ...] | None = None) -> bytes:
+    """Validate ``rows`` (ORM objects or Row tuples) as ``list[schema]`` and encode to JSON.
+
+    With ``fields`` only those attributes are read and emitted.
+    """
+    adapter = _sparse_list_adapter(schema, fields) if fields else _list_adapter(schema)
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+def list_response(
+    schema: type[BaseModel],
+    rows,
+    status_code: int = 200,
+    headers: dict | None = None,
+    fields: tuple[str, ...] | None = None,
+) -> Response:
+    """Build a JSON response for a list endpoint in one batched validate + encode pass."""
+    return Response(
+        content=serialize_list(schema, rows, fields),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
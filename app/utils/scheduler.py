@@ -0,0 +1,110 @@
+"""
+Minimal in-process job scheduler.
+
+A single daemon thread wakes every ``tick_seconds`` and runs jobs that are
+due, either on a fixed interval or once a day at a UTC time. Jobs must be
+idempotent: every uvicorn worker runs its own scheduler, so a job may run
+once per worker.
+
+The thread records ``last_tick`` on every wake-up so health checks can tell
+whether the scheduler is alive.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, time as dtime, timedelta, timezone
+from typing import Callable
+
+from app.utils import tz
+from app.utils.logging_config import get_logger
+
+logger = get_logger()
+
+
+@dataclass
+class ScheduledJob:
+    name: str
+    func: Callable[[], None]
+    next_run: datetime
+    every: timedelta | None = None  # interval jobs
+    daily_at: dtime | None = None  # daily jobs (UTC)
+    last_run: datetime | None = None
+    last_error: str | None = None
+
+    def schedule_next(self, now: datetime) -> None:
+        if self.every is not None:
+            self.next_run = now + self.every
+        else:
+            self.next_run = _next_daily(now, self.daily_at)
+
+
+def _next_daily(now: datetime, at: dtime) -> datetime:
+    candidate = datetime.combine(now.date(), at, tzinfo=timezone.utc)
+    return candidate if candidate > now else candidate + timedelta(days=1)
+
+
+class Scheduler:
+    def __init__(self, tick_seconds: float = 30.0):
+        self.tick_seconds = tick_seconds
+        self.jobs: dict[str, ScheduledJob] = {}
+        self.last_tick: float | None = None  # time.monotonic() of the last loop iteration
+        self.running_job: str | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add_interval_job(self, name: str, func: Callable[[], None], every: timedelta, run_now: bool = False) -> None:
+        now = tz.now()
+        self.jobs[name] = ScheduledJob(name=name, func=func, every=every, next_run=now if run_now else now + every)
+
+    def add_daily_job(self, name: str, func: Callable[[], None], at: dtime) -> None:
+        self.jobs[name] = ScheduledJob(name=name, func=func, daily_at=at, next_run=_next_daily(tz.now(), at))
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def is_alive(self, max_silence: float | None = None) -> bool:
+        """True if the thread is running and ticked within ``max_silence`` seconds (default: 3 ticks).
+
+        A thread busy running a (long) job counts as alive.
+        """
+        if not self._thread or not self._thread.is_alive() or self.last_tick is None:
+            return False
+        if self.running_job is not None:
+            return True
+        max_silence = max_silence if max_silence is not None else self.tick_seconds * 3
+        return time.monotonic() - self.last_tick <= max_silence
+
+    def run_pending(self) -> None:
+        now = tz.now()
+        for job in list(self.jobs.values()):
+            if job.next_run > now:
+                continue
+            self.running_job = job.name
+            try:
+                job.func()
+                job.last_error = None
+            except Exception as exc:
+                job.last_error = str(exc)
+                logger.error("scheduled_job_failed", job=job.name, error=str(exc))
+            finally:
+                self.running_job = None
+            job.last_run = now
+            job.schedule_next(tz.now())
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.last_tick = time.monotonic()
+            self.run_pending()
+            self._stop.wait(self.tick_seconds)
+
+
+scheduler = Scheduler()
@@ -0,0 +1,33 @@
+"""Move closed bookings from the live bookings table into bookings_archive.
+
+Completed/cancelled bookings that ended more than --older-than-days ago are
+moved in batches of --batch-size, committing after each batch.
+
+Run with:
+    /path/to/venv/bin/python scripts/archive_bookings.py --older-than-days 90
+"""
+import argparse
+
+from app.config import settings
+from app.db.archive import archive_closed_bookings
+from app.db.database import SessionLocal
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--older-than-days", type=int, default=settings.booking_archive_after_days)
+    parser.add_argument("--batch-size", type=int, default=settings.booking_archive_batch_size)
+    parser.add_argument("--max-batches", type=int, default=None,
+                        help="Stop after this many batches (default: until nothing is left)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        moved = archive_closed_bookings(db, args.older_than_days, args.batch_size, args.max_batches)
+        print(f"Archived {moved} bookings")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Stress benchmark for bike write concurrency on the booking write paths.
+
+Seeds a throwaway owner, shop and --bikes bikes (inventory --quantity each),
+then runs --writers concurrent threads against a small shared pool of bikes.
+Each thread performs --ops operations through the API (FastAPI TestClient,
+in-process):
+
+- customer: create a booking, then cancel it, or have the owner confirm and
+  complete it
+- owner: occasionally rewrite the bike's total quantity (PUT /inventory)
+
+Each run uses one settings.bike_lock_mode (--mode both runs them in turn on
+fresh data):
+
+- advisory: pessimistic per-bike locks, writers queue (app.db.locks)
+- optimistic: no waiting, version-checked inventory writes that retry with
+  jitter on conflict and answer 409 when retries run out (app.db.retry)
+
+Afterwards it reports throughput, status codes, lock-wait and retry
+statistics, and checks that every bike's inventory counters still match its
+active bookings: available = total - active and rented = active.
+
+Run against Postgres to exercise the advisory locks:
+    /path/to/venv/bin/python scripts/bench_bike_locks.py --writers 200 --ops 10 --mode both
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.db.locks import get_lock_stats, reset_lock_stats
+from app.db.retry import get_retry_stats, reset_retry_stats
+from app.main import app
+from app.utils import tz
+
+from stress_fixtures import auth_headers, cleanup, counter_drift, seed_shop
+
+
+def run_writer(index: int, customer_id: int, owner_id: int, bike_ids: list[int], quantity: int,
+               ops: int, statuses: Counter, lock: threading.Lock):
+    rng = random.Random(index)
+    client = TestClient(app)
+    customer, owner = auth_headers(customer_id), auth_headers(owner_id)
+    base = tz.now() + timedelta(days=30)
+    seen = []
+    for op in range(ops):
+        bike_id = rng.choice(bike_ids)
+        if rng.random() < 0.1:
+            response = client.put(f"/api/v1/inventory/{bike_id}", headers=owner, json={"total_quantity": quantity})
+            seen.append(response.status_code)
+            continue
+        # Unique window per writer/op, so every booking attempt contends only on the lock
+        start = base + timedelta(hours=(index * ops + op) * 2)
+        response = client.post("/api/v1/bookings/", headers=customer, json={
+            "bike_id": bike_id, "start_time": start.isoformat(), "end_time": (start + timedelta(hours=1)).isoformat(),
+        })
+        seen.append(response.status_code)
+        if response.status_code != 201:
+            continue
+        booking_id = response.json()["id"]
+        roll = rng.random()
+        if roll < 0.4:
+            seen.append(client.delete(f"/api/v1/bookings/{booking_id}", headers=customer).status_code)
+        elif roll < 0.7:
+            seen.append(client.post(f"/api/v1/bookings/{booking_id}/confirm", headers=owner).status_code)
+            seen.append(client.post(f"/api/v1/bookings/{booking_id}/complete", headers=owner).status_code)
+    with lock:
+        statuses.update(seen)
+
+
+def run(mode: str, args) -> bool:
+    settings.bike_lock_mode = mode
+    owner_id, customer_ids, bike_ids = seed_shop("Lock Bench", args.bikes, args.writers, args.quantity)
+    statuses: Counter = Counter()
+    statuses_lock = threading.Lock()
+    reset_lock_stats()
+    reset_retry_stats()
+    try:
+        threads = [
+            threading.Thread(target=run_writer, args=(
+                i, customer_id, owner_id, bike_ids, args.quantity, args.ops, statuses, statuses_lock
+            ))
+            for i, customer_id in enumerate(customer_ids)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        problems = counter_drift(bike_ids)
+    finally:
+        cleanup([owner_id, *customer_ids])
+
+    requests = sum(statuses.values())
+    locks, retries = get_lock_stats(), get_retry_stats()
+    print(f"[{mode}] {args.writers} writers x {args.ops} ops on {args.bikes} bikes")
+    print(f"requests  {requests} in {elapsed:.2f}s = {requests / elapsed:.1f} req/s  statuses {dict(sorted(statuses.items()))}")
+    if mode == "advisory":
+        print(
+            f"locks     {locks['acquisitions']} acquired, {locks['contended']} waited, "
+            f"mean wait {locks['total_wait'] / max(locks['acquisitions'], 1) * 1000:.2f} ms, "
+            f"max wait {locks['max_wait'] * 1000:.1f} ms"
+        )
+    print(f"retries   {retries['conflicts']} conflicts retried, {retries['exhausted']} gave up (409)")
+    for problem in problems:
+        print(f"FAIL {problem}")
+    if not problems:
+        print("ok   inventory counters match active bookings")
+    return not problems and not any(code >= 500 for code in statuses)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=200)
+    parser.add_argument("--ops", type=int, default=10)
+    parser.add_argument("--bikes", type=int, default=4)
+    parser.add_argument("--quantity", type=int, default=100000)
+    parser.add_argument("--mode", choices=["advisory", "optimistic", "both"], default="both")
+    args = parser.parse_args()
+
+    app.state.limiter.enabled = False
+    modes = ["advisory", "optimistic"] if args.mode == "both" else [args.mode]
+    results = [run(mode, args) for mode in modes]
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""Micro-benchmark hot per-request functions against a stored baseline.
+
+Times each function with the same method: calibrate a loop count that takes
+about ``--round-ms``, run ``--rounds`` rounds, and keep the best and the
+median per-call time. Memory is measured separately with tracemalloc on one
+extra batch, which is slower, so it is not part of the timings. The memory
+figures are peak bytes above the starting point for a single call, and the
+net number of allocated blocks each call leaves behind after a garbage
+collection. A count that stays non-zero over larger batches means something
+grows on every call: a leak or an unbounded cache. A bounded cache that is
+still filling shows up too, but its count shrinks as the batch grows.
+
+The functions measured:
+
+- password hashing and verification (bcrypt; the slowest per call)
+- JWT access token creation and verification
+- review comment sanitization (bleach)
+- booking pricing: ``calculate_booking_price`` on an in-memory SQLite
+  database with shop pricing rules. This includes the one version query
+  per price, so it follows the real request cost.
+- ``Settings.get_cors_origins`` for both the JSON and the comma form
+- pydantic validation of ``BookingCreate`` (request) and ``BikeOut``
+  (response, ``from_attributes``)
+
+``--save-baseline`` writes the results as the baseline. Otherwise they are
+compared with it, and any function whose best time or peak memory grew by
+more than ``--tolerance`` is flagged as a regression. The script exits with
+status 1 when there are regressions, so CI can use it. Baselines only mean
+something on the same machine and Python; a mismatch is reported.
+
+Run with:
+    /path/to/venv/bin/python scripts/bench_hot_functions.py --save-baseline
+    /path/to/venv/bin/python scripts/bench_hot_functions.py --tolerance 0.2
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.api.v1.booking import calculate_booking_price
+from app.api.v1.oauth2 import create_access_token, verify_access_token
+from app.config import settings
+from app.db.models import Base, PricingRule
+from app.schemas.bikes import BikeOut
+from app.schemas.booking import BookingCreate
+from app.utils.sanitization import sanitize_comment
+from app.utils.utils import hash_password, verify_password
+
+DEFAULT_BASELINE = os.path.join("bench-results", "hot_functions-baseline.json")
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+START = datetime(2026, 11, 2, 9, 30, tzinfo=timezone.utc)
+COMMENT = "Great bikes and friendly staff, picked up at 9 and back by 5. Would rent again! " * 3
+HTML_COMMENT = (
+    '<p>Great <b>bikes</b>, see <a href="https://example.com" onclick="x()">photos</a></p>'
+    '<script>alert(1)</script><img src=x onerror=alert(2)> <i>friendly</i> staff ' * 3
+)
+
+
+def pricing_session() -> tuple[Session, SimpleNamespace]:
+    """In-memory database with a weekend and an evening rule for shop 1."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = Session(engine)
+    db.add_all([
+        PricingRule(shop_id=1, name="weekend", multiplier_percent=150, days_of_week="5,6"),
+        PricingRule(shop_id=1, name="evening", multiplier_percent=120, start_hour=18, end_hour=23, priority=1),
+    ])
+    db.commit()
+    return db, SimpleNamespace(id=1, shop_id=1, price_per_hour=450, price_per_day=3200)
+
+
+def build_cases() -> dict:
+    """Name -> zero-argument callable. Fixtures are built once, outside the timings."""
+    token = create_access_token({"user_id": 42})
+    credentials_exception = HTTPException(status_code=401, detail="Could not validate credentials")
+    short_hash = hash_password("correct horse battery")
+    db, bike = pricing_session()
+    json_settings = settings.model_copy(update={"cors_origins": '["https://a.example", "https://b.example"]'})
+    comma_settings = settings.model_copy(update={"cors_origins": "https://a.example, https://b.example"})
+    booking_payload = {"bike_id": 17, "start_time": "2026-11-02T09:00:00Z", "end_time": "2026-11-02T17:30:00Z"}
+    bike_row = SimpleNamespace(
+        id=17, shop_id=1, name="Bike 17", model="R250", bike_type="bike", engine_cc=250,
+        description="Comfortable city bike with a long description " * 2,
+        price_per_hour=500, price_per_day=2500, condition="good", is_available=True,
+        created_at=NOW, updated_at=NOW,
+    )
+    return {
+        "hash_password": lambda: hash_password("correct horse battery"),
+        "hash_password (>72 bytes)": lambda: hash_password("x" * 100),
+        "verify_password": lambda: verify_password("correct horse battery", short_hash),
+        "create_access_token": lambda: create_access_token({"user_id": 42}),
+        "verify_access_token": lambda: verify_access_token(token, credentials_exception),
+        "sanitize_comment (text)": lambda: sanitize_comment(COMMENT),
+        "sanitize_comment (html)": lambda: sanitize_comment(HTML_COMMENT),
+        "calculate_booking_price (3h)": lambda: calculate_booking_price(db, bike, START, START + timedelta(hours=3)),
+        "calculate_booking_price (7d)": lambda: calculate_booking_price(db, bike, START, START + timedelta(days=7)),
+        "get_cors_origins (json)": json_settings.get_cors_origins,
+        "get_cors_origins (comma)": comma_settings.get_cors_origins,
+        "BookingCreate validate": lambda: BookingCreate.model_validate(booking_payload),
+        "BikeOut validate (orm)": lambda: BikeOut.model_validate(bike_row, from_attributes=True),
+    }
+
+
+def calibrate(fn, round_seconds: float) -> int:
+    """Loops per round so that a round takes about ``round_seconds``."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= round_seconds / 5 or loops >= 1 << 22:
+            return max(int(loops * round_seconds / max(elapsed, 1e-9)), 1)
+        loops *= 4
+
+
+def measure(fn, rounds: int, round_seconds: float) -> dict:
+    fn()  # warm caches (compiled calendars, validators)
+    loops = calibrate(fn, round_seconds)
+    per_call = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        per_call.append((time.perf_counter() - start) / loops)
+
+    batch = min(loops, 1000)
+    tracemalloc.start()
+    try:
+        fn()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        gc.collect()  # count only what survives a collection, not cycles awaiting one
+        before = tracemalloc.take_snapshot()
+        for _ in range(batch):
+            fn()
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    # The first snapshot is itself traced memory; leave tracemalloc's own allocations out.
+    own = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    blocks = sum(stat.count_diff for stat in after.filter_traces(own).compare_to(before.filter_traces(own), "filename"))
+
+    return {
+        "loops": loops,
+        "best_us": round(min(per_call) * 1e6, 3),
+        "median_us": round(statistics.median(per_call) * 1e6, 3),
+        "peak_bytes": peak - base,
+        "retained_blocks_per_call": round(blocks / batch, 3),
+    }
+
+
+def environment() -> dict:
+    return {"python": platform.python_version(), "machine": platform.machine(), "node": platform.node()}
+
+
+def compare(results: dict, baseline: dict, tolerance: float, report_missing: bool = True) -> list[str]:
+    """Names of the functions that regressed beyond ``tolerance``."""
+    regressions = []
+    old_results = baseline["results"]
+    print(f"\n{'function':32} {'best us':>12} {'baseline':>12} {'change':>8} {'peak B':>9} {'baseline':>9}")
+    for name, new in results.items():
+        old = old_results.get(name)
+        if old is None:
+            print(f"{name:32} {new['best_us']:>12.2f} {'(new)':>12}")
+            continue
+        time_change = new["best_us"] / old["best_us"] - 1 if old["best_us"] else 0.0
+        # Small peaks jitter by a few hundred bytes; only flag growth beyond 1 KiB as well.
+        memory_regressed = new["peak_bytes"] > old["peak_bytes"] * (1 + tolerance) + 1024
+        flag = ""
+        if time_change > tolerance or memory_regressed:
+            regressions.append(name)
+            flag = "  REGRESSION" + (" (time)" if time_change > tolerance else "") + (" (memory)" if memory_regressed else "")
+        print(f"{name:32} {new['best_us']:>12.2f} {old['best_us']:>12.2f} {time_change * 100:>+7.1f}% "
+              f"{new['peak_bytes']:>9} {old['peak_bytes']:>9}{flag}")
+    for name in sorted(old_results.keys() - results.keys()) if report_missing else ():
+        print(f"{name:32} {'(missing)':>12} {old_results[name]['best_us']:>12.2f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=7, help="Timed rounds per function")
+    parser.add_argument("--round-ms", type=float, default=200, help="Target duration of one round")
+    parser.add_argument("--only", help="Run only functions whose name contains this text")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON path")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed growth before flagging, 0.2 = +20%%")
+    args = parser.parse_args()
+
+    cases = build_cases()
+    if args.only:
+        cases = {name: fn for name, fn in cases.items() if args.only in name}
+
+    results = {}
+    print(f"{'function':32} {'best us':>12} {'median us':>12} {'loops':>9} {'peak B':>9} {'blocks/call':>12}")
+    for name, fn in cases.items():
+        r = results[name] = measure(fn, args.rounds, args.round_ms / 1000)
+        print(f"{name:32} {r['best_us']:>12.2f} {r['median_us']:>12.2f} {r['loops']:>9} "
+              f"{r['peak_bytes']:>9} {r['retained_blocks_per_call']:>12}", flush=True)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "environment": environment(),
+                "results": results,
+            }, f, indent=2)
+        print(f"\nsaved baseline {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\nno baseline at {args.baseline}; run with --save-baseline first")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("environment") != environment():
+        print(f"\nwarning: baseline was recorded on {baseline.get('environment')}, this is {environment()}")
+    regressions = compare(results, baseline, args.tolerance, report_missing=not args.only)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"\nno regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Benchmark rule-based pricing with precomputed hourly price calendars.
+
+Measures, without a database:
+
+- compile: building a shop's PriceCalendar from its rules (done once per rule
+  change, then cached by app.db.pricing)
+- booking: pricing one booking window by evaluating every rule for every
+  hour of the window, against a calendar lookup (prefix sums - the cost no
+  longer grows with the window length)
+- quotes: a bikes x windows matrix priced from calendars, as POST /quotes does
+
+The per-hour evaluation doubles as an oracle: both paths must agree.
+
+Run with:
+    /path/to/venv/bin/python scripts/bench_pricing.py --rules 8 --repeat 200
+"""
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.utils.intervals import day_number
+from app.utils.pricing import BASE_MULTIPLIER, compile_calendar, price_matrix
+
+START = datetime(2026, 11, 2, 9, 30, tzinfo=timezone.utc)
+BIKE = SimpleNamespace(price_per_hour=450, price_per_day=3200)
+
+
+def make_rules(n_rules: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    rules = [SimpleNamespace(
+        id=1, bike_id=None, priority=0, multiplier_percent=150, days_of_week="5,6",
+        start_hour=None, end_hour=None, start_date=None, end_date=None,
+    )]
+    for i in range(2, n_rules + 1):
+        start_hour = rng.randint(0, 23)
+        season = date(2026, rng.randint(1, 12), 1)
+        rules.append(SimpleNamespace(
+            id=i, bike_id=None, priority=rng.randint(0, 3), multiplier_percent=rng.randint(70, 250),
+            days_of_week=",".join(map(str, sorted(rng.sample(range(7), rng.randint(1, 7))))),
+            start_hour=start_hour, end_hour=rng.randint(start_hour + 1, 24) if start_hour < 23 else 24,
+            start_date=season if i % 2 else None, end_date=season + timedelta(days=60) if i % 2 else None,
+        ))
+    return rules
+
+
+def _matches(rule, t: datetime) -> bool:
+    if rule.days_of_week and t.weekday() not in {int(d) for d in rule.days_of_week.split(",")}:
+        return False
+    if rule.start_hour is not None or rule.end_hour is not None:
+        start, end = rule.start_hour or 0, rule.end_hour if rule.end_hour is not None else 24
+        inside = start <= t.hour < end if start < end else (t.hour >= start or t.hour < end)
+        if not inside:
+            return False
+    if rule.start_date is not None and t.date() < rule.start_date:
+        return False
+    if rule.end_date is not None and t.date() > rule.end_date:
+        return False
+    return True
+
+
+def _weighted(rules, start: datetime, end: datetime) -> int:
+    total, t = 0, start
+    ordered = sorted(rules, key=lambda r: (r.priority, r.bike_id is not None, r.id), reverse=True)
+    while t < end:
+        next_hour = min(end, t.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1))
+        rule = next((r for r in ordered if _matches(r, t)), None)
+        multiplier = rule.multiplier_percent if rule else BASE_MULTIPLIER
+        total += multiplier * int((next_hour - t).total_seconds())
+        t = next_hour
+    return total
+
+
+def per_hour_price(rules, bike, start: datetime, end: datetime) -> int:
+    """Evaluate every rule for every hour of the window."""
+    end = max(end, start + timedelta(hours=1))
+    day_end = start + timedelta(days=int((end - start).total_seconds() // 86400))
+    numerator = bike.price_per_day * _weighted(rules, start, day_end) + bike.price_per_hour * _weighted(rules, day_end, end) * 24
+    return numerator // (86400 * BASE_MULTIPLIER)
+
+
+def calendar_price(calendar, bike, start: datetime, end: datetime) -> int:
+    return int(price_matrix([bike.price_per_hour], [bike.price_per_day], [calendar], [start], [end])[0, 0])
+
+
+def timed(fn, repeat: int, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(*args)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=8)
+    parser.add_argument("--days", type=int, default=407, help="Calendar span in days")
+    parser.add_argument("--bikes", type=int, default=100)
+    parser.add_argument("--windows", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rules = make_rules(args.rules)
+    first_hour = (day_number(START.date()) - 7) * 24
+    compile_time = timed(compile_calendar, 20, rules, first_hour, args.days * 24)
+    calendar = compile_calendar(rules, first_hour, args.days * 24)
+    print(f"compile   {args.rules} rules x {args.days} days: {compile_time * 1000:7.2f} ms")
+
+    for hours in (3, 24, 24 * 7, 24 * 30):
+        end = START + timedelta(hours=hours, minutes=17)
+        expected = per_hour_price(rules, BIKE, START, end)
+        assert calendar_price(calendar, BIKE, START, end) == expected, "calendar price differs"
+        slow = timed(per_hour_price, max(args.repeat // 10, 1), rules, BIKE, START, end)
+        fast = timed(calendar_price, args.repeat, calendar, BIKE, START, end)
+        print(f"booking   {hours:4d}h  per-hour rules {slow * 1e6:9.1f} us   calendar {fast * 1e6:7.1f} us")
+
+    rng = random.Random(3)
+    bikes = [SimpleNamespace(price_per_hour=rng.randint(200, 2000), price_per_day=rng.randint(1500, 15000))
+             for _ in range(args.bikes)]
+    calendars = [calendar] * args.bikes
+    starts = [START + timedelta(hours=rng.randint(0, 24 * 60)) for _ in range(args.windows)]
+    ends = [s + timedelta(minutes=rng.randint(30, 60 * 24 * 7)) for s in starts]
+    quote = timed(price_matrix, args.repeat, [b.price_per_hour for b in bikes], [b.price_per_day for b in bikes],
+                  calendars, starts, ends)
+    print(f"quotes    {args.bikes} bikes x {args.windows} windows: {quote * 1000:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark quote pricing for a bikes x windows matrix.
+
+Compares the scalar base-rate formula (one call per (bike, window) pair)
+against app.utils.pricing.price_matrix pricing the whole matrix in one
+vectorized pass (what POST /quotes does after loading bikes and price
+calendars). Both produce identical totals; no database is needed. See
+scripts/bench_pricing.py for pricing with rules.
+
+Run with:
+    /path/to/venv/bin/python scripts/bench_quotes.py --bikes 100 --windows 20 --repeat 200
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.utils.pricing import price_matrix
+
+START = datetime(2026, 1, 1, 9, 0, 0)
+
+
+def make_inputs(n_bikes: int, n_windows: int, seed: int = 42):
+    rng = random.Random(seed)
+    bikes = [
+        SimpleNamespace(price_per_hour=rng.randint(200, 2000), price_per_day=rng.randint(1500, 15000))
+        for _ in range(n_bikes)
+    ]
+    windows = []
+    for _ in range(n_windows):
+        start = START + timedelta(hours=rng.randint(0, 24 * 60))
+        windows.append((start, start + timedelta(minutes=rng.randint(30, 60 * 24 * 7))))
+    return bikes, windows
+
+
+def base_price(bike, start_time, end_time) -> int:
+    """Whole days at price_per_day plus remaining hours at price_per_hour (one hour minimum)."""
+    seconds = max(int((end_time - start_time).total_seconds()), 3600)
+    full_days, remaining = divmod(seconds, 86400)
+    return full_days * bike.price_per_day + remaining * bike.price_per_hour // 3600
+
+
+def per_pair(bikes, windows) -> list[list[int]]:
+    return [[base_price(bike, start, end) for start, end in windows] for bike in bikes]
+
+
+def vectorized(bikes, windows) -> list[list[int]]:
+    return price_matrix(
+        [b.price_per_hour for b in bikes], [b.price_per_day for b in bikes], [None] * len(bikes),
+        [w[0] for w in windows], [w[1] for w in windows],
+    ).tolist()
+
+
+def timed(fn, repeat: int, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(*args)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bikes", type=int, default=100)
+    parser.add_argument("--windows", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    bikes, windows = make_inputs(args.bikes, args.windows)
+    assert per_pair(bikes, windows) == vectorized(bikes, windows), "vectorized totals differ"
+
+    loop = timed(per_pair, args.repeat, bikes, windows)
+    batch = timed(vectorized, args.repeat, bikes, windows)
+    cells = args.bikes * args.windows
+    print(f"{args.bikes} bikes x {args.windows} windows ({cells:,} quotes)")
+    print(f"per-pair    {loop * 1000:8.3f} ms/quote matrix  {loop / cells * 1e6:7.2f} us/quote")
+    print(f"vectorized  {batch * 1000:8.3f} ms/quote matrix  {batch / cells * 1e6:7.2f} us/quote  ({loop / batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
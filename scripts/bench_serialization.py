@@ -0,0 +1,86 @@
+"""Benchmark list-endpoint serialization throughput.
+
+Compares FastAPI's default path (per-row response_model validation, JSON-mode
+dump, stdlib json encoding) against app.utils.responses.serialize_list
+(one batched TypeAdapter validation + pydantic-core JSON encoding) for the
+schemas returned by list endpoints. No database is needed.
+
+Run with:
+    /path/to/venv/bin/python scripts/bench_serialization.py --rows 100 --repeat 200
+"""
+import argparse
+import json
+import time
+from datetime import datetime, time as dtime
+from types import SimpleNamespace
+
+from app.schemas.bikes import BikeOut
+from app.schemas.booking import BookingOut
+from app.schemas.inventory import BikeInventoryOut
+from app.schemas.reviews import ReviewOut
+from app.schemas.shops import ShopOut
+from app.utils.responses import serialize_list
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+ROW_FACTORIES = {
+    "BikeOut (GET /bikes/shop/{id}, /search/vehicles)": (BikeOut, lambda i: SimpleNamespace(
+        id=i, shop_id=1, name=f"Bike {i}", model="R250", bike_type="bike", engine_cc=250,
+        description="Comfortable city bike with a long description " * 2,
+        price_per_hour=500, price_per_day=2500, condition="good", is_available=True,
+        created_at=NOW, updated_at=NOW,
+    )),
+    "BookingOut (GET /bookings/user/)": (BookingOut, lambda i: SimpleNamespace(
+        id=i, bike_id=i, customer_id=7, start_time=NOW, end_time=NOW, status="confirmed",
+        total_price=2500, created_at=NOW, updated_at=NOW,
+    )),
+    "ShopOut (GET /shops/)": (ShopOut, lambda i: SimpleNamespace(
+        id=i, name=f"Shop {i}", description="Downtown rentals", phone_number="1234567890",
+        address="123 Main St", city="Metropolis", state="State", zip_code="12345",
+        opening_time=dtime(9), closing_time=dtime(18), is_active=True, created_at=NOW, updated_at=NOW,
+    )),
+    "ReviewOut (GET /shops/{id}/reviews)": (ReviewOut, lambda i: SimpleNamespace(
+        id=i, customer_id=7, shop_id=1, rating=4, comment="Great bikes, friendly staff",
+        created_at=NOW, updated_at=NOW,
+    )),
+    "BikeInventoryOut (GET /inventory/shop/{id})": (BikeInventoryOut, lambda i: SimpleNamespace(
+        id=i, bike_id=i, shop_id=1, total_quantity=5, available_quantity=3, rented_quantity=2,
+        created_at=NOW, updated_at=NOW,
+    )),
+}
+
+
+def default_path(schema, rows) -> bytes:
+    """Roughly what FastAPI does for response_model=list[schema] + JSONResponse."""
+    content = [schema.model_validate(row, from_attributes=True).model_dump(mode="json") for row in rows]
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100, help="Rows per page")
+    parser.add_argument("--repeat", type=int, default=200, help="Pages serialized per measurement")
+    args = parser.parse_args()
+
+    print(f"{args.rows} rows/page, {args.repeat} pages\n")
+    print(f"{'endpoint schema':52} {'default rows/s':>15} {'fast rows/s':>13} {'speedup':>8}")
+    for label, (schema, factory) in ROW_FACTORIES.items():
+        rows = [factory(i) for i in range(args.rows)]
+        # Both paths must produce the same payload
+        assert json.loads(default_path(schema, rows)) == json.loads(serialize_list(schema, rows))
+
+        total = args.rows * args.repeat
+        slow = timed(lambda: default_path(schema, rows), args.repeat)
+        fast = timed(lambda: serialize_list(schema, rows), args.repeat)
+        print(f"{label:52} {total / slow:15,.0f} {total / fast:13,.0f} {slow / fast:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Benchmark deleting a shop with a large booking history.
+
+Seeds a throwaway owner + shop with --bikes bikes and --bookings bookings
+(bulk executemany inserts), then deletes it with one of:
+
+- chunked: app.db.bulk_delete.run_deletion_job (chunked booking deletes,
+  then a single cascading DELETE of the shop)
+- orm: the old behaviour - load every bike, booking and inventory row into
+  the session and let the ORM issue per-row DELETEs
+
+and reports wall time and peak Python memory.
+
+Run with:
+    /path/to/venv/bin/python scripts/bench_shop_deletion.py --bookings 100000 --mode both
+"""
+import argparse
+import time
+import tracemalloc
+import uuid
+from datetime import timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.orm import selectinload
+
+from app.db.bulk_delete import count_bookings, create_job, get_job, run_deletion_job
+from app.db.database import SessionLocal
+from app.db.models import Bike, BikeInventory, Booking, Shop, User
+from app.utils import tz
+
+INSERT_CHUNK = 10000
+
+
+def seed_shop(n_bikes: int, n_bookings: int) -> tuple[int, int]:
+    """Create an owner, shop, bikes, inventory and bookings; return (owner_id, shop_id)."""
+    db = SessionLocal()
+    try:
+        owner = User(
+            email=f"bench-{uuid.uuid4().hex[:8]}@example.com", password="x",
+            firstname="Bench", lastname="Owner", phone_number="0000000000", user_type="shop_owner",
+        )
+        db.add(owner)
+        db.flush()
+        shop = Shop(name="Bench Shop", owner_id=owner.id, phone_number="0000000000", address="1 Bench St", city="Bench")
+        db.add(shop)
+        db.flush()
+
+        bikes = [
+            Bike(shop_id=shop.id, name=f"Bench {i}", model="B", bike_type="bike",
+                 price_per_hour=100, price_per_day=1000)
+            for i in range(n_bikes)
+        ]
+        db.add_all(bikes)
+        db.flush()
+        db.execute(insert(BikeInventory), [
+            {"bike_id": b.id, "shop_id": shop.id, "total_quantity": 1, "available_quantity": 1, "rented_quantity": 0}
+            for b in bikes
+        ])
+
+        start = tz.now() - timedelta(days=3650)
+        for offset in range(0, n_bookings, INSERT_CHUNK):
+            db.execute(insert(Booking), [
+                {
+                    "customer_id": owner.id,
+                    "bike_id": bikes[i % n_bikes].id,
+                    "start_time": start + timedelta(hours=i),
+                    "end_time": start + timedelta(hours=i + 1),
+                    "status": "completed",
+                    "total_price": 100,
+                }
+                for i in range(offset, min(offset + INSERT_CHUNK, n_bookings))
+            ])
+        db.commit()
+        return owner.id, shop.id
+    finally:
+        db.close()
+
+
+def delete_chunked(owner_id: int, shop_id: int) -> None:
+    db = SessionLocal()
+    try:
+        job_id = create_job(db, "shop", shop_id, owner_id, count_bookings(db, shop_id=shop_id)).id
+        db.commit()
+    finally:
+        db.close()
+    run_deletion_job(job_id)
+    db = SessionLocal()
+    try:
+        job = get_job(db, job_id)
+        assert job.status == "completed", job.error
+    finally:
+        db.close()
+
+
+def delete_orm(owner_id: int, shop_id: int) -> None:
+    db = SessionLocal()
+    try:
+        shop = db.query(Shop).options(
+            selectinload(Shop.bikes).selectinload(Bike.bookings),
+            selectinload(Shop.bikes).selectinload(Bike.inventory),
+        ).filter(Shop.id == shop_id).one()
+        db.delete(shop)
+        db.commit()
+    finally:
+        db.close()
+
+
+def cleanup_owner(owner_id: int) -> None:
+    db = SessionLocal()
+    try:
+        db.query(User).filter(User.id == owner_id).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+def run(mode: str, n_bikes: int, n_bookings: int) -> None:
+    seed_start = time.perf_counter()
+    owner_id, shop_id = seed_shop(n_bikes, n_bookings)
+    seed_seconds = time.perf_counter() - seed_start
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    (delete_chunked if mode == "chunked" else delete_orm)(owner_id, shop_id)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    cleanup_owner(owner_id)
+    print(f"{mode:8} seed {seed_seconds:7.1f}s  delete {elapsed:7.2f}s  peak memory {peak / 1e6:8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bikes", type=int, default=50)
+    parser.add_argument("--bookings", type=int, default=100000)
+    parser.add_argument("--mode", choices=["chunked", "orm", "both"], default="both")
+    args = parser.parse_args()
+
+    print(f"Shop with {args.bikes} bikes and {args.bookings:,} bookings")
+    for mode in (["chunked", "orm"] if args.mode == "both" else [args.mode]):
+        run(mode, args.bikes, args.bookings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark bytes-on-wire and latency of list endpoints with and without ``fields=``.
+
+Drives the real app in-process (FastAPI TestClient) against the configured,
+seeded database and compares full payloads with the four-field listing-card
+projection.
+
+Run with:
+    /path/to/venv/bin/python scripts/bench_sparse_fields.py --repeat 50
+"""
+import argparse
+import statistics
+import time
+
+from fastapi.testclient import TestClient
+
+from app.db.database import SessionLocal
+from app.db.models import Shop
+from app.main import app
+
+CARD_FIELDS = {
+    "bikes": "id,name,price_per_day,is_available",
+    "shops": "id,name,city,is_active",
+}
+
+
+def endpoints(shop_id: int) -> list[tuple[str, str, str]]:
+    """(label, path, card fields) for each list endpoint supporting fields=."""
+    return [
+        ("search_vehicles", "/api/v1/search/vehicles?limit=100", CARD_FIELDS["bikes"]),
+        ("search_vehicles_by_type", "/api/v1/search/vehicles/type/bike?limit=100", CARD_FIELDS["bikes"]),
+        ("get_shop_bikes", f"/api/v1/bikes/shop/{shop_id}?limit=100", CARD_FIELDS["bikes"]),
+        ("get_all_shops", "/api/v1/shops/?limit=100", CARD_FIELDS["shops"]),
+    ]
+
+
+def measure(client: TestClient, url: str, repeat: int) -> tuple[int, float]:
+    """Return (response bytes, median latency in ms)."""
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url)
+        timings.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        size = len(response.content)
+    return size, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50, help="Requests per measurement")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        shop = db.query(Shop.id).first()
+    finally:
+        db.close()
+    if shop is None:
+        raise SystemExit("Database has no shops - seed it first (scripts/seed.py)")
+
+    client = TestClient(app)
+    print(f"{'endpoint':26} {'full bytes':>11} {'card bytes':>11} {'full ms':>8} {'card ms':>8}")
+    for label, url, fields in endpoints(shop.id):
+        full_bytes, full_ms = measure(client, url, args.repeat)
+        card_bytes, card_ms = measure(client, f"{url}&fields={fields}", args.repeat)
+        print(f"{label:26} {full_bytes:11,} {card_bytes:11,} {full_ms:8.2f} {card_ms:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
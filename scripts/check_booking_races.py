@@ -0,0 +1,196 @@
+"""Stress booking state changes concurrently and check inventory counters against bookings.
+
+Seeds a throwaway owner, shop, --bikes bikes with --quantity units each and
+one customer per worker. Then --workers threads each fire --ops randomly
+interleaved requests at the real app:
+
+- create:    POST /bookings/ for a random bike and one of --slots windows
+- cancel:    DELETE /bookings/{id} on one of the worker's own bookings
+- confirm:   POST /bookings/{id}/confirm    (as the owner)
+- reject:    POST /bookings/{id}/reject     (as the owner)
+- complete:  POST /bookings/{id}/complete   (as the owner)
+- inventory: PUT /inventory/{bike_id} with a new total_quantity (as the owner)
+
+The state-changing calls pick any booking created so far, so they race with
+each other and with creates on the same bike. Windows are few and stock is
+low, so overlap and stock checks are hit constantly. Afterwards the oracle
+recomputes every bike's counters from ``bookings``:
+
+    rented_quantity   == pending + confirmed bookings
+    available_quantity == total_quantity - rented_quantity
+
+It reports every bike that drifted, along with overlapping active bookings
+and any 5xx. It also prints throughput and latency per operation, the
+status mix, and the bike-lock and conflict-retry statistics.
+
+Runs in-process (FastAPI TestClient) against the configured database, with
+``--lock-mode`` overriding ``settings.bike_lock_mode``. On Postgres this
+exercises the advisory locks (or version-checked updates); elsewhere it uses
+the in-process fallback (app/db/locks.py). Exits non-zero on any violation.
+
+Run with:
+    /path/to/venv/bin/python scripts/check_booking_races.py --workers 16 --ops 250
+    /path/to/venv/bin/python scripts/check_booking_races.py --lock-mode optimistic --bikes 2
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.db.database import SessionLocal
+from app.db.locks import get_lock_stats, reset_lock_stats
+from app.db.retry import get_retry_stats, reset_retry_stats
+from app.main import app
+from app.utils import tz
+
+from stress_fixtures import auth_headers, cleanup, counter_drift, overlapping_pairs, seed_shop
+
+OPERATION_WEIGHTS = {"create": 40, "cancel": 12, "confirm": 18, "reject": 8, "complete": 14, "inventory": 8}
+
+
+class Run:
+    """State shared by the workers: known bookings and per-operation results."""
+
+    def __init__(self, bike_ids: list[int], slots: int, quantity: int):
+        self.bike_ids = bike_ids
+        base = (tz.now() + timedelta(days=30)).replace(minute=0, second=0, microsecond=0)
+        self.windows = [
+            {"start_time": (base + timedelta(hours=4 * k)).isoformat(),
+             "end_time": (base + timedelta(hours=4 * k + 3)).isoformat()}
+            for k in range(slots)
+        ]
+        self.quantity = quantity
+        self.booking_ids: list[int] = []
+        self.own_bookings: dict[int, list[int]] = defaultdict(list)  # customer id -> booking ids
+        self.lock = threading.Lock()
+        self.statuses: dict[str, Counter] = defaultdict(Counter)
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+
+    def record(self, operation: str, status_code: int, elapsed: float) -> None:
+        with self.lock:
+            self.statuses[operation][status_code] += 1
+            self.latencies[operation].append(elapsed)
+
+
+def run_worker(run: Run, customer_id: int, owner_id: int, ops: int, seed_value: int) -> None:
+    rng = random.Random(seed_value)
+    client = TestClient(app)
+    customer, owner = auth_headers(customer_id), auth_headers(owner_id)
+    names, weights = list(OPERATION_WEIGHTS), list(OPERATION_WEIGHTS.values())
+
+    for _ in range(ops):
+        operation = rng.choices(names, weights)[0]
+        with run.lock:
+            own = list(run.own_bookings[customer_id])
+            booking_id = rng.choice(run.booking_ids) if run.booking_ids else None
+        if operation != "create" and operation != "inventory" and booking_id is None:
+            operation = "create"
+        if operation == "cancel" and own:
+            booking_id = rng.choice(own)
+
+        start = time.perf_counter()
+        if operation == "create":
+            response = client.post("/api/v1/bookings/", headers=customer,
+                                   json={"bike_id": rng.choice(run.bike_ids), **rng.choice(run.windows)})
+        elif operation == "cancel":
+            response = client.delete(f"/api/v1/bookings/{booking_id}", headers=customer)
+        elif operation == "inventory":
+            response = client.put(f"/api/v1/inventory/{rng.choice(run.bike_ids)}", headers=owner,
+                                  json={"total_quantity": rng.randint(1, run.quantity + 2)})
+        else:
+            response = client.post(f"/api/v1/bookings/{booking_id}/{operation}", headers=owner)
+        run.record(operation, response.status_code, time.perf_counter() - start)
+
+        if operation == "create" and response.status_code == 201:
+            with run.lock:
+                run.booking_ids.append(response.json()["id"])
+                run.own_bookings[customer_id].append(response.json()["id"])
+
+
+def verify(run: Run) -> list[str]:
+    """The oracle: recompute every bike's counters from its bookings."""
+    problems = []
+    for operation, statuses in run.statuses.items():
+        errors = sum(count for code, count in statuses.items() if code >= 500)
+        if errors:
+            problems.append(f"{operation}: {errors} server errors {dict(statuses)}")
+
+    db = SessionLocal()
+    try:
+        overlaps = overlapping_pairs(db, run.bike_ids)
+        if overlaps:
+            problems.append(f"{overlaps} overlapping active booking pairs")
+    finally:
+        db.close()
+    return problems + counter_drift(run.bike_ids)
+
+
+def report(run: Run, seconds: float) -> None:
+    total = sum(len(v) for v in run.latencies.values())
+    print(f"{total} requests in {seconds:.1f}s: {total / seconds:.0f} req/s\n")
+    print(f"{'operation':10} {'reqs':>6} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  statuses")
+    for operation in OPERATION_WEIGHTS:
+        latencies = run.latencies.get(operation)
+        if not latencies:
+            continue
+        ms = np.array(latencies) * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        print(f"{operation:10} {len(ms):>6} {len(ms) / seconds:>7.1f} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f}  "
+              f"{dict(sorted(run.statuses[operation].items()))}")
+    locks = get_lock_stats()
+    print(f"\nbike locks: {locks['acquisitions']} acquired, {locks['contended']} contended, "
+          f"wait total {locks['total_wait'] * 1000:.0f} ms, max {locks['max_wait'] * 1000:.1f} ms")
+    print(f"conflict retries: {get_retry_stats()}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bikes", type=int, default=4)
+    parser.add_argument("--quantity", type=int, default=3, help="Initial units per bike")
+    parser.add_argument("--slots", type=int, default=6, help="Distinct booking windows")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--ops", type=int, default=250, help="Requests per worker")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--lock-mode", choices=["advisory", "optimistic"], default=settings.bike_lock_mode)
+    args = parser.parse_args()
+
+    app.state.limiter.enabled = False
+    settings.bike_lock_mode = args.lock_mode
+    reset_lock_stats()
+    reset_retry_stats()
+    owner_id, customer_ids, bike_ids = seed_shop("Race Check", args.bikes, args.workers, args.quantity)
+    run = Run(bike_ids, args.slots, args.quantity)
+    try:
+        threads = [
+            threading.Thread(target=run_worker, args=(run, customer_id, owner_id, args.ops, args.seed * 1000 + i))
+            for i, customer_id in enumerate(customer_ids)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        seconds = time.perf_counter() - start
+
+        problems = verify(run)
+    finally:
+        cleanup([owner_id, *customer_ids])
+
+    print(f"lock mode {args.lock_mode}, {args.workers} workers, {args.bikes} bikes x {args.quantity} units")
+    report(run, seconds)
+    for problem in problems:
+        print(f"FAIL {problem}")
+    if not problems:
+        print("ok   counters match bookings, no overlaps, no server errors")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Concurrency check for POST /bookings/batch with competing carts.
+
+Seeds a throwaway owner, shop and --bikes bikes, then runs --workers threads
+that each post --rounds carts of --cart-size bikes drawn from the shared
+pool (in random order) for the same time window per round, so carts race
+for the same bikes. Afterwards it verifies that:
+
+- no request failed with a server error (a lock-ordering deadlock surfaces
+  as a 500)
+- every cart was all-or-nothing
+- no bike has two overlapping active bookings
+- inventory counters match the bookings that were created
+
+Runs in-process (FastAPI TestClient) against the configured database. On
+Postgres this exercises the advisory bike locks; elsewhere the in-process
+fallback (app/db/locks.py). Exits non-zero on any violation.
+
+Run with:
+    /path/to/venv/bin/python scripts/check_cart_concurrency.py --workers 16 --rounds 20
+"""
+import argparse
+import random
+import sys
+import threading
+from collections import Counter
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+
+from app.db.database import SessionLocal
+from app.main import app
+from app.utils import tz
+
+from stress_fixtures import active_bookings, auth_headers, cleanup, counter_drift, overlapping_pairs, seed_shop
+
+QUANTITY = 1000  # high enough that only overlaps, not stock, limit carts
+
+
+def run_worker(customer_id: int, bike_ids: list[int], rounds: int, cart_size: int, seed_value: int, results: list):
+    rng = random.Random(seed_value)
+    client = TestClient(app)
+    headers = auth_headers(customer_id)
+    base = tz.now() + timedelta(days=30)
+    for round_no in range(rounds):
+        start = base + timedelta(days=round_no)
+        cart = rng.sample(bike_ids, cart_size)
+        response = client.post("/api/v1/bookings/batch", headers=headers, json={"items": [
+            {"bike_id": bike_id, "start_time": start.isoformat(), "end_time": (start + timedelta(hours=4)).isoformat()}
+            for bike_id in cart
+        ]})
+        results.append((response.status_code, len(response.json()) if response.status_code == 201 else 0))
+
+
+def verify(bike_ids: list[int], customer_ids: list[int], results: list, cart_size: int) -> list[str]:
+    problems = []
+    statuses = Counter(code for code, _ in results)
+    if any(code >= 500 for code in statuses):
+        problems.append(f"server errors: {dict(statuses)}")
+    if any(code == 201 and created != cart_size for code, created in results):
+        problems.append("a successful cart did not create every booking")
+
+    db = SessionLocal()
+    try:
+        booked = active_bookings(db, bike_ids)
+        expected_total = cart_size * statuses.get(201, 0)
+        if sum(booked.values()) != expected_total:
+            problems.append(f"{sum(booked.values())} bookings stored, {expected_total} expected from successful carts")
+
+        overlaps = overlapping_pairs(db, bike_ids)
+        if overlaps:
+            problems.append(f"{overlaps} overlapping booking pairs")
+    finally:
+        db.close()
+    return problems + counter_drift(bike_ids)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bikes", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--cart-size", type=int, default=3)
+    args = parser.parse_args()
+
+    app.state.limiter.enabled = False
+    owner_id, customer_ids, bike_ids = seed_shop("Cart Check", args.bikes, args.workers, QUANTITY)
+    results: list = []
+    try:
+        threads = [
+            threading.Thread(target=run_worker, args=(customer_id, bike_ids, args.rounds, args.cart_size, i, results))
+            for i, customer_id in enumerate(customer_ids)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        problems = verify(bike_ids, customer_ids, results, args.cart_size)
+    finally:
+        cleanup([owner_id, *customer_ids])
+
+    statuses = Counter(code for code, _ in results)
+    print(f"{len(results)} carts: {dict(sorted(statuses.items()))}")
+    for problem in problems:
+        print(f"FAIL {problem}")
+    if not problems:
+        print("ok   all-or-nothing, no overlaps, inventory consistent")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""Check per-endpoint SQL query budgets.
+
+Calls public read endpoints in-process (FastAPI TestClient) against the
+configured, seeded database inside ``assert_max_queries`` and exits non-zero
+if any endpoint issues more statements than its budget. Budgets must not
+depend on data size - an endpoint whose count grows with the fleet has an
+N+1 problem.
+
+Run with:
+    /path/to/venv/bin/python scripts/check_query_budgets.py
+"""
+import sys
+
+from fastapi.testclient import TestClient
+
+from app.db.database import SessionLocal
+from app.db.models import Bike
+from app.db.query_counter import assert_max_queries
+from app.main import app
+
+
+def budgets(shop_id: int, bike_id: int) -> list[tuple[str, int]]:
+    """(path, max queries) for each endpoint under a budget."""
+    return [
+        (f"/api/v1/shops/{shop_id}", 2),
+        (f"/api/v1/shops/{shop_id}/detail", 4),
+        (f"/api/v1/shops/{shop_id}/reviews", 2),
+        ("/api/v1/shops/", 1),
+        (f"/api/v1/shops?ids={shop_id}", 1),
+        (f"/api/v1/bikes/{bike_id}", 2),
+        (f"/api/v1/bikes/shop/{shop_id}", 2),
+        (f"/api/v1/bikes?ids={bike_id}", 1),
+        ("/api/v1/search/vehicles?vehicle_type=bike&is_available=true", 1),
+        (f"/api/v1/inventory/shop/{shop_id}", 2),
+        (f"/api/v1/inventory/bikes?ids={bike_id}", 1),
+    ]
+
+
+def main() -> int:
+    db = SessionLocal()
+    try:
+        bike = db.query(Bike.id, Bike.shop_id).first()
+    finally:
+        db.close()
+    if bike is None:
+        raise SystemExit("Database has no bikes - seed it first (scripts/seed.py)")
+
+    client = TestClient(app)
+    failures = 0
+    for path, budget in budgets(bike.shop_id, bike.id):
+        try:
+            with assert_max_queries(budget) as recorder:
+                response = client.get(path)
+            # An error that returns before the queries would pass any budget
+            assert response.status_code == 200, f"expected 200, got {response.status_code}: {response.text[:200]}"
+            print(f"ok   {recorder.count}/{budget}  {path}")
+        except AssertionError as exc:
+            failures += 1
+            print(f"FAIL {path}\n{exc}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
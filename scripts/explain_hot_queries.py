@@ -0,0 +1,121 @@
+"""EXPLAIN regression check for the hot query predicates.
+
+Runs ``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`` for each hot query against
+the configured (seeded) database. The check fails if a Seq Scan actually read
+more than ``--max-seq-rows`` rows: rows returned plus rows removed by the
+filter, times loops. That is what a missing or unused index costs. Seq Scans
+that stop early are not flagged, e.g. under a LIMIT with a common predicate
+(``search_type_cc``: Limit -> Seq Scan stops after a few hundred rows) or on
+small tables; there a sequential scan is the right plan. The queries run
+for real (read-only, rolled back). Intended for CI after seeding, and locally
+after schema or query changes.
+
+Run with:
+    /path/to/venv/bin/python scripts/explain_hot_queries.py --max-seq-rows 1000
+"""
+import argparse
+import sys
+from datetime import timedelta
+
+from sqlalchemy import func, select, text
+
+from app.db.database import engine
+from app.db.models import Bike, Booking, Review
+from app.utils import tz
+
+
+def hot_queries(sample: dict) -> dict:
+    """Queries mirroring the filters used by the booking, search and review endpoints."""
+    start = tz.now() + timedelta(days=1)
+    end = start + timedelta(hours=4)
+    return {
+        "booking_overlap": select(Booking.id).where(
+            Booking.bike_id == sample["bike_id"],
+            Booking.status.in_(["pending", "confirmed"]),
+            Booking.start_time < end,
+            Booking.end_time > start,
+        ).limit(1),
+        "user_bookings": select(Booking).where(
+            Booking.customer_id == sample["customer_id"],
+        ).order_by(Booking.created_at.desc()).limit(50),
+        "search_type_cc": select(Bike).where(
+            Bike.bike_type == sample["bike_type"],
+            Bike.engine_cc >= 100,
+            Bike.engine_cc <= 300,
+        ).limit(50),
+        "search_shop_type": select(Bike).where(
+            Bike.shop_id == sample["shop_id"],
+            Bike.bike_type == sample["bike_type"],
+        ).limit(50),
+        "shop_reviews": select(Review).where(
+            Review.shop_id == sample["shop_id"],
+        ).order_by(Review.created_at.desc()).limit(50),
+        "review_eligibility": select(Booking.id).join(Bike, Booking.bike_id == Bike.id).where(
+            Booking.customer_id == sample["customer_id"],
+            Booking.status == "completed",
+            Bike.shop_id == sample["shop_id"],
+        ).limit(1),
+    }
+
+
+def pick_sample(conn) -> dict:
+    """Pick real ids from the seeded data so the planner sees realistic selectivity."""
+    bike = conn.execute(select(Bike.id, Bike.shop_id, Bike.bike_type).limit(1)).first()
+    customer_id = conn.execute(select(func.min(Booking.customer_id))).scalar()
+    if bike is None or customer_id is None:
+        raise SystemExit("Database has no bikes/bookings - seed it first (scripts/seed.py)")
+    return {
+        "bike_id": bike.id,
+        "shop_id": bike.shop_id,
+        "bike_type": bike.bike_type,
+        "customer_id": customer_id,
+    }
+
+
+def seq_scans(plan: dict) -> list[tuple[str, int]]:
+    """(relation, rows read) for every Seq Scan in an ANALYZEd plan tree."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        per_loop = plan.get("Actual Rows", 0) + plan.get("Rows Removed by Filter", 0)
+        found.append((plan.get("Relation Name", "?"), int(per_loop * plan.get("Actual Loops", 1))))
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-seq-rows", type=int, default=1000,
+                        help="Fail if a Seq Scan reads more than this many rows")
+    parser.add_argument("--analyze", action="store_true",
+                        help="Run ANALYZE on the hot tables first so the planner's statistics are fresh")
+    args = parser.parse_args()
+
+    failures = 0
+    with engine.connect() as conn:
+        if args.analyze:
+            for table in ("bookings", "bikes", "reviews"):
+                conn.execute(text(f"ANALYZE {table}"))
+            conn.commit()  # statistics are transactional; the EXPLAINs below are rolled back on close
+
+        sample = pick_sample(conn)
+        for name, query in hot_queries(sample).items():
+            compiled = query.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+            result = conn.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {compiled.string}", compiled.params
+            )
+            plan = result.scalar()[0]["Plan"]
+            offenders = [(rel, rows) for rel, rows in seq_scans(plan) if rows > args.max_seq_rows]
+            buffers = plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0)
+            if offenders:
+                failures += 1
+                details = ", ".join(f"{rel} ({rows} rows read)" for rel, rows in offenders)
+                print(f"FAIL {name}: seq scan on {details}")
+            else:
+                print(f"ok   {name}: {plan['Node Type']} ({plan['Actual Total Time']:.2f} ms, {buffers} buffers)")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
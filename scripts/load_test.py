@@ -0,0 +1,337 @@
+"""End-to-end load test: weighted user journeys against the real app.
+
+Starts ``uvicorn app.main:app`` on a free local port (``--workers``), with
+rate limiting disabled, against the configured database. Alternatively it
+can target a running server (``--base-url``) or call the app in-process
+(``--in-process``, no network, handy with SQLite). Pass ``--seed-scale``
+to populate the database first with scripts/seed.py.
+
+Virtual users loop over weighted journeys:
+
+- browse: search -> shop detail -> shop reviews
+- book:   search -> shop detail -> login -> quote -> book
+- full:   book, then owner login -> confirm -> complete -> customer review
+
+Credentials come from the database (seeded users share the password
+``password``). Each request is recorded under its templated endpoint. The
+report gives p50/p95/p99 latency, throughput, and rates of rejected (an
+expected business 4xx such as an overlapping booking) and failed (5xx,
+unexpected status, transport error) requests. It also shows how many
+journeys finished. Results are saved as JSON with the git commit.
+``--compare`` prints the changes against an earlier result file.
+
+Run with:
+    /path/to/venv/bin/python scripts/load_test.py --seed-scale small --users 50 --duration 60
+    /path/to/venv/bin/python scripts/load_test.py --users 50 --duration 60 --compare load-results/previous.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import numpy as np
+from sqlalchemy import select
+
+from app.db.database import engine
+from app.db.models import Bike, Shop, User
+
+PASSWORD = "password"
+JOURNEY_WEIGHTS = {"browse": 0.55, "book": 0.30, "full": 0.15}
+VEHICLE_TYPES = ["scooty", "bike", "car"]
+
+
+class Rejected(Exception):
+    """A step got an expected-but-unsuccessful answer; the journey stops there."""
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.outcomes: dict[str, dict[str, int]] = defaultdict(lambda: {"ok": 0, "rejected": 0, "failed": 0})
+        self.journeys: dict[str, dict[str, int]] = defaultdict(lambda: {"started": 0, "completed": 0})
+        self.recording = False
+
+    async def call(self, client: httpx.AsyncClient, endpoint: str, method: str, url: str,
+                   ok=(200,), rejected=(), **kwargs) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            outcome = "ok" if response.status_code in ok else "rejected" if response.status_code in rejected else "failed"
+        except httpx.HTTPError:
+            response, outcome = None, "failed"
+        if self.recording:
+            self.latencies[endpoint].append(time.perf_counter() - start)
+            self.outcomes[endpoint][outcome] += 1
+        if outcome != "ok":
+            raise Rejected(endpoint)
+        return response
+
+
+def load_accounts(limit: int = 2000) -> dict:
+    """Customer emails and owners' bikes to drive the journeys with."""
+    with engine.connect() as conn:
+        customers = conn.execute(
+            select(User.email).where(User.user_type == "customer").order_by(User.id).limit(limit)
+        ).scalars().all()
+        fleet = conn.execute(
+            select(Bike.id, Bike.shop_id, User.email)
+            .join(Shop, Bike.shop_id == Shop.id).join(User, Shop.owner_id == User.id)
+            .where(Bike.is_available.is_(True)).order_by(Bike.id).limit(limit * 5)
+        ).all()
+    if not customers or not fleet:
+        raise SystemExit("No customers or bikes in the database - seed it first (--seed-scale small)")
+    return {"customers": list(customers), "bikes": [tuple(row) for row in fleet]}
+
+
+class Journeys:
+    def __init__(self, recorder: Recorder, accounts: dict, reuse_tokens: bool):
+        self.rec = recorder
+        self.customers = accounts["customers"]
+        self.bikes = accounts["bikes"]
+        self.reuse_tokens = reuse_tokens
+        self.tokens: dict[str, str] = {}
+
+    async def login(self, client, email: str) -> dict:
+        token = self.tokens.get(email) if self.reuse_tokens else None
+        if token is None:
+            response = await self.rec.call(
+                client, "POST /api/v1/login", "POST", "/api/v1/login",
+                data={"username": email, "password": PASSWORD}, rejected=(403,),
+            )
+            token = self.tokens[email] = response.json()["access_token"]
+        return {"Authorization": f"Bearer {token}"}
+
+    async def browse(self, client, rng: random.Random) -> tuple[int, int, str]:
+        params = {"vehicle_type": rng.choice(VEHICLE_TYPES), "is_available": "true", "limit": 20}
+        await self.rec.call(client, "GET /api/v1/search/vehicles", "GET", "/api/v1/search/vehicles", params=params)
+        bike_id, shop_id, owner = rng.choice(self.bikes)
+        await self.rec.call(client, "GET /api/v1/shops/{shop_id}/detail", "GET", f"/api/v1/shops/{shop_id}/detail")
+        return bike_id, shop_id, owner
+
+    async def run(self, name: str, client, rng: random.Random) -> None:
+        bike_id, shop_id, owner = await self.browse(client, rng)
+        if name == "browse":
+            await self.rec.call(client, "GET /api/v1/shops/{shop_id}/reviews", "GET", f"/api/v1/shops/{shop_id}/reviews")
+            return
+
+        customer = await self.login(client, rng.choice(self.customers))
+        start = (datetime.now(timezone.utc) + timedelta(days=rng.randint(1, 90), hours=rng.randint(0, 23))).replace(
+            minute=0, second=0, microsecond=0
+        )
+        end = start + timedelta(hours=rng.choice([1, 2, 3, 4, 8, 24, 48]))
+        window = {"start_time": start.isoformat(), "end_time": end.isoformat()}
+        await self.rec.call(client, "POST /api/v1/quotes", "POST", "/api/v1/quotes",
+                            json={"bike_ids": [bike_id], "windows": [window]}, headers=customer)
+        booking = (await self.rec.call(
+            client, "POST /api/v1/bookings/", "POST", "/api/v1/bookings/",
+            json={"bike_id": bike_id, **window}, headers=customer, ok=(201,), rejected=(400, 409),
+        )).json()
+        if name == "book":
+            return
+
+        owner_headers = await self.login(client, owner)
+        await self.rec.call(client, "POST /api/v1/bookings/{booking_id}/confirm", "POST",
+                            f"/api/v1/bookings/{booking['id']}/confirm", headers=owner_headers, rejected=(400, 409))
+        await self.rec.call(client, "POST /api/v1/bookings/{booking_id}/complete", "POST",
+                            f"/api/v1/bookings/{booking['id']}/complete", headers=owner_headers, rejected=(400, 409))
+        await self.rec.call(client, "POST /api/v1/shops/{shop_id}/reviews", "POST", f"/api/v1/shops/{shop_id}/reviews",
+                            json={"rating": rng.randint(3, 5), "comment": "Load test ride"}, headers=customer,
+                            ok=(201,), rejected=(400,))  # 400: already reviewed this shop
+
+
+async def virtual_user(index: int, client, journeys: Journeys, args, deadline: float) -> None:
+    rng = random.Random(args.seed * 100003 + index)
+    names, weights = list(JOURNEY_WEIGHTS), list(JOURNEY_WEIGHTS.values())
+    while time.monotonic() < deadline:
+        name = rng.choices(names, weights)[0]
+        recording = journeys.rec.recording
+        if recording:
+            journeys.rec.journeys[name]["started"] += 1
+        try:
+            await journeys.run(name, client, rng)
+            if recording:
+                journeys.rec.journeys[name]["completed"] += 1
+        except Rejected:
+            pass
+        if args.think_ms:
+            await asyncio.sleep(rng.expovariate(1000 / args.think_ms))
+
+
+async def drive(args, base_url: str | None, accounts: dict) -> tuple[Recorder, float]:
+    recorder = Recorder()
+    journeys = Journeys(recorder, accounts, args.reuse_tokens)
+    if base_url is None:
+        from app.main import app
+
+        app.state.limiter.enabled = False
+        transport, base_url = httpx.ASGITransport(app=app), "http://load-test"
+    else:
+        transport = httpx.AsyncHTTPTransport(retries=0)
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=30, limits=limits) as client:
+        deadline = time.monotonic() + args.warmup + args.duration
+        users = [asyncio.create_task(virtual_user(i, client, journeys, args, deadline)) for i in range(args.users)]
+        await asyncio.sleep(args.warmup)
+        recorder.recording = True
+        measured_from = time.monotonic()
+        await asyncio.gather(*users)
+        return recorder, time.monotonic() - measured_from
+
+
+def summarize(recorder: Recorder, seconds: float) -> dict:
+    endpoints = {}
+    for endpoint, latencies in sorted(recorder.latencies.items()):
+        ms = np.array(latencies) * 1000
+        outcomes = recorder.outcomes[endpoint]
+        count = len(latencies)
+        endpoints[endpoint] = {
+            "requests": count,
+            "throughput_rps": round(count / seconds, 2),
+            "p50_ms": round(float(np.percentile(ms, 50)), 2),
+            "p95_ms": round(float(np.percentile(ms, 95)), 2),
+            "p99_ms": round(float(np.percentile(ms, 99)), 2),
+            "max_ms": round(float(ms.max()), 2),
+            "rejected_rate": round(outcomes["rejected"] / count, 4),
+            "error_rate": round(outcomes["failed"] / count, 4),
+        }
+    total = sum(e["requests"] for e in endpoints.values())
+    failed = sum(recorder.outcomes[e]["failed"] for e in endpoints)
+    all_ms = np.concatenate([np.array(v) for v in recorder.latencies.values()]) * 1000 if total else np.zeros(1)
+    return {
+        "totals": {
+            "requests": total,
+            "seconds": round(seconds, 2),
+            "throughput_rps": round(total / seconds, 2),
+            "p50_ms": round(float(np.percentile(all_ms, 50)), 2),
+            "p95_ms": round(float(np.percentile(all_ms, 95)), 2),
+            "p99_ms": round(float(np.percentile(all_ms, 99)), 2),
+            "error_rate": round(failed / total, 4) if total else 0.0,
+        },
+        "endpoints": endpoints,
+        "journeys": {name: dict(counts) for name, counts in recorder.journeys.items()},
+    }
+
+
+def print_report(result: dict, baseline: dict | None) -> None:
+    print(f"\n{'endpoint':44} {'reqs':>7} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'rej%':>6} {'err%':>6}")
+    rows = list(result["endpoints"].items()) + [("TOTAL", result["totals"])]
+    for endpoint, e in rows:
+        line = (f"{endpoint:44} {e['requests']:>7} {e['throughput_rps']:>8.1f} {e['p50_ms']:>8.1f} "
+                f"{e['p95_ms']:>8.1f} {e['p99_ms']:>8.1f} {e.get('rejected_rate', 0) * 100:>6.1f} {e['error_rate'] * 100:>6.1f}")
+        old = baseline and (baseline["totals"] if endpoint == "TOTAL" else baseline["endpoints"].get(endpoint))
+        if old:
+            line += (f"   p95 {_delta(e['p95_ms'], old['p95_ms'])}"
+                     f"  rps {_delta(e['throughput_rps'], old['throughput_rps'])}")
+        print(line)
+    print("\njourneys: " + ", ".join(f"{n} {c['completed']}/{c['started']}" for n, c in result["journeys"].items()))
+
+
+def _delta(new: float, old: float) -> str:
+    return f"{(new - old) / old * 100:+6.1f}%" if old else "   n/a"
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers: int) -> tuple[subprocess.Popen, str]:
+    port = free_port()
+    env = {**os.environ, "RATE_LIMIT_ENABLED": "false"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(300):
+        try:
+            if httpx.get(f"{base_url}/health/live", timeout=1).status_code == 200:
+                return server, base_url
+        except httpx.HTTPError:
+            pass
+        if server.poll() is not None:
+            raise SystemExit("uvicorn exited during startup")
+        time.sleep(0.1)
+    server.terminate()
+    raise SystemExit("uvicorn did not become live within 30s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds before measuring")
+    parser.add_argument("--think-ms", type=float, default=0, help="Mean pause between journeys per user")
+    parser.add_argument("--seed", type=int, default=1, help="Journey RNG seed")
+    parser.add_argument("--reuse-tokens", action="store_true", help="Log each account in once (skips repeated bcrypt)")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--base-url", help="Load an already running server instead of starting one")
+    target.add_argument("--in-process", action="store_true", help="Call the ASGI app directly (no server, no network)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers when starting a server")
+    parser.add_argument("--seed-scale", help="Seed the database first with scripts/seed.py at this scale")
+    parser.add_argument("--output", help="Result JSON path (default: load-results/<time>-<commit>.json)")
+    parser.add_argument("--compare", help="Earlier result JSON to compare against")
+    args = parser.parse_args()
+
+    if args.seed_scale:
+        import seed
+
+        seed.generate(seed.build_parser().parse_args(["--scale", args.seed_scale]))
+    accounts = load_accounts()
+
+    server = None
+    base_url = args.base_url
+    if not args.base_url and not args.in_process:
+        server, base_url = start_server(args.workers)
+    try:
+        recorder, seconds = asyncio.run(drive(args, base_url, accounts))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(10)
+
+    commit = git_commit()
+    result = {
+        "meta": {
+            "commit": commit,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "target": args.base_url or ("in-process" if args.in_process else f"uvicorn x{args.workers}"),
+            "database": engine.dialect.name,
+            "args": vars(args),
+        },
+        **summarize(recorder, seconds),
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+
+    output = args.output or os.path.join(
+        "load-results", f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{commit or 'nogit'}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nsaved {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Check bike_inventory counters against active bookings and optionally repair them.
+
+The nightly scheduler already runs this (``inventory_reconcile``); use it to
+inspect drift on demand or to repair after an incident. Without --repair
+nothing is written.
+
+Run with:
+    /path/to/venv/bin/python scripts/reconcile_inventory.py
+    /path/to/venv/bin/python scripts/reconcile_inventory.py --repair --batch-size 500
+"""
+import argparse
+import sys
+
+from app.db.database import SessionLocal
+from app.db.inventory_reconcile import reconcile_inventory
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repair", action="store_true", help="Rewrite divergent counters (batched, locked per batch)")
+    parser.add_argument("--batch-size", type=int, help="Bikes per repair transaction (default: settings)")
+    parser.add_argument("--show", type=int, default=50, help="Print at most this many divergent bikes")
+    args = parser.parse_args()
+
+    shown = 0
+
+    def show(d):
+        nonlocal shown
+        if shown < args.show:
+            print(f"bike {d.bike_id:>9} shop {d.shop_id:>7}: total={d.total_quantity} "
+                  f"available={d.available_quantity} (expected {d.expected_available}) "
+                  f"rented={d.rented_quantity} (expected {d.expected_rented})")
+        shown += 1
+
+    db = SessionLocal()
+    try:
+        result = reconcile_inventory(db, repair=args.repair, batch_size=args.batch_size, on_divergence=show)
+    finally:
+        db.close()
+
+    if result.divergent > args.show:
+        print(f"... {result.divergent - args.show} more")
+    summary = f"{result.checked} bikes checked, {result.divergent} divergent"
+    if args.repair:
+        summary += f", {result.repaired} repaired, {result.skipped} skipped after version conflicts"
+    print(summary)
+    return 1 if (result.divergent and not args.repair) or result.skipped else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
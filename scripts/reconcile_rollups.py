@@ -0,0 +1,38 @@
+"""Rebuild booking_daily_rollup rows for a range of days from the bookings tables.
+
+The nightly scheduler already reconciles a window around today; use this to
+backfill after the migration or to repair a specific range.
+
+Run with:
+    /path/to/venv/bin/python scripts/reconcile_rollups.py --start 2025-01-01 --end 2025-12-31
+"""
+import argparse
+from datetime import date, timedelta
+
+from app.db.database import SessionLocal
+from app.db.rollups import reconcile_rollups
+
+# Reconcile in month-sized windows to keep each transaction short
+WINDOW_DAYS = 31
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--start", type=date.fromisoformat, required=True, help="First day (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, required=True, help="Last day, inclusive (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        window_start = args.start
+        while window_start <= args.end:
+            window_end = min(window_start + timedelta(days=WINDOW_DAYS - 1), args.end)
+            rows = reconcile_rollups(db, window_start, window_end)
+            print(f"{window_start} .. {window_end}: {rows} rollup rows")
+            window_start = window_end + timedelta(days=1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
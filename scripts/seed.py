@@ -1,197 +1,401 @@
-"""Seed script for RentWheels - inserts sample data into all tables.
+"""Generate synthetic RentWheels data at load-test scale.
 
-Run with:
-    /path/to/venv/bin/python scripts/seed.py
+Creates users, shops, bikes (with inventory), bookings and reviews with
+realistic skew: hot bikes take most bookings (heavy-tailed popularity),
+bookings peak in summer, on weekends and at mid-morning, most rentals last
+hours and some days, and ratings lean positive. Shop sizes and cities are
+skewed the same way.
+
+Rows are generated in numpy chunks and loaded with ``COPY ... FROM STDIN``
+on PostgreSQL (chunked ``executemany`` elsewhere), one transaction per
+chunk. Ids are assigned by the generator, continuing after the current
+maximum of each table, so existing data is kept and foreign keys need no
+round trips; sequences are advanced afterwards. The same ``--seed``,
+``--chunk-size`` and ``--now`` (default: the current time, which all
+timestamps are relative to) always produce the same rows.
+
+Every generated user has the password ``password`` (one bcrypt hash is
+shared - hashing millions would take hours) and the email
+``user<id>@example.com``. Booking prices use the bikes' base rates (no
+pricing rules); run scripts/reconcile_rollups.py afterwards to build the
+analytics rollups.
+
+Bookings obey the same rules as the booking API: a bike's pending and
+confirmed bookings never overlap and never outnumber its ``total_quantity``.
+Generated bookings that would break either rule become cancelled (or, if
+already over, completed). Inventory rows are written last, with
+``rented_quantity`` and ``available_quantity`` taken from the bookings that
+stayed active, so the counters match without a reconcile.
 
-The script is idempotent for known sample emails and will not duplicate entries.
+Run with:
+    /path/to/venv/bin/python scripts/seed.py --scale small
+    /path/to/venv/bin/python scripts/seed.py --scale large --seed 7 --chunk-size 200000
 """
-from datetime import timedelta
-from app.utils import tz
-from sqlalchemy.exc import IntegrityError
+import argparse
+import csv
+import io
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+from sqlalchemy import func, select, text
 
-from app.db.database import SessionLocal
-from app.db import models
+from app.db.database import engine
+from app.db.models import Bike, BikeInventory, Booking, Review, Shop, User
 from app.utils.utils import hash_password
 
+SCALES = {
+    #         users      shops   bikes    bookings     reviews
+    "tiny": (1_000, 20, 200, 5_000, 1_000),
+    "small": (20_000, 200, 5_000, 200_000, 50_000),
+    "medium": (200_000, 1_000, 50_000, 2_000_000, 500_000),
+    "large": (2_000_000, 5_000, 300_000, 20_000_000, 10_000_000),
+}
 
-def create_sample_data():
-    db = SessionLocal()
-    try:
-        # Users
-        admin_email = "admin@example.com"
-        owner_email = "owner@example.com"
-        customer_email = "customer@example.com"
-
-        admin = db.query(models.User).filter(models.User.email == admin_email).first()
-        if not admin:
-            admin = models.User(
-                email=admin_email,
-                password=hash_password("adminpass"),
-                phone_number="+10000000000",
-                user_type="shop_owner",
-            )
-            # set is_admin if model has attribute
-            if hasattr(admin, "is_admin"):
-                setattr(admin, "is_admin", True)
-            db.add(admin)
-            db.commit()
-            db.refresh(admin)
-            print(f"Created admin user id={admin.id}")
-        else:
-            print(f"Admin user already exists id={admin.id}")
-
-        owner = db.query(models.User).filter(models.User.email == owner_email).first()
-        if not owner:
-            owner = models.User(
-                email=owner_email,
-                password=hash_password("ownerpass"),
-                phone_number="+19999999999",
-                user_type="shop_owner",
-            )
-            db.add(owner)
-            db.commit()
-            db.refresh(owner)
-            print(f"Created owner user id={owner.id}")
-        else:
-            print(f"Owner user already exists id={owner.id}")
-
-        customer = db.query(models.User).filter(models.User.email == customer_email).first()
-        if not customer:
-            customer = models.User(
-                email=customer_email,
-                password=hash_password("customerpass"),
-                phone_number="+12222222222",
-                user_type="customer",
-            )
-            db.add(customer)
-            db.commit()
-            db.refresh(customer)
-            print(f"Created customer user id={customer.id}")
-        else:
-            print(f"Customer user already exists id={customer.id}")
-
-        # Shop (owned by owner)
-        shop = db.query(models.Shop).filter(models.Shop.owner_id == owner.id).first()
-        if not shop:
-            shop = models.Shop(
-                name="Downtown Rentals",
-                description="City center bike and scooty rentals",
-                owner_id=owner.id,
-                phone_number="+19990001111",
-                address="123 Main St",
-                city="Metropolis",
-                state="State",
-                zip_code="12345",
-                is_active=True,
-            )
-            db.add(shop)
-            db.commit()
-            db.refresh(shop)
-            print(f"Created shop id={shop.id}")
-        else:
-            print(f"Shop already exists id={shop.id}")
-
-        # Bikes / Vehicles
-        # Create a few vehicles: scooty 150cc, bike 250cc, car 1200cc
-        def get_or_create_bike(name, model, bike_type, engine_cc, price_day):
-            b = db.query(models.Bike).filter(models.Bike.name == name, models.Bike.shop_id == shop.id).first()
-            if not b:
-                b = models.Bike(
-                    shop_id=shop.id,
-                    name=name,
-                    model=model,
-                    bike_type=bike_type,
-                    engine_cc=engine_cc,
-                    description=f"{name} - {model}",
-                    price_per_hour=price_day * 10,  # arbitrary
-                    price_per_day=price_day,
-                    condition="good",
-                    is_available=True,
-                )
-                db.add(b)
-                db.commit()
-                db.refresh(b)
-                print(f"Created vehicle id={b.id} name={b.name} type={b.bike_type} cc={b.engine_cc}")
-            else:
-                print(f"Vehicle already exists id={b.id} name={b.name}")
-            return b
-
-        scooty = get_or_create_bike("Scooty One", "S150", "scooty", 150, 1500)
-        bike = get_or_create_bike("Roadster", "R250", "bike", 250, 2500)
-        car = get_or_create_bike("CityCar", "C1200", "car", 1200, 8000)
-
-        # Inventory
-        def get_or_create_inventory(bike_obj, total_qty):
-            inv = db.query(models.BikeInventory).filter(models.BikeInventory.bike_id == bike_obj.id).first()
-            if not inv:
-                inv = models.BikeInventory(
-                    bike_id=bike_obj.id,
-                    shop_id=bike_obj.shop_id,
-                    total_quantity=total_qty,
-                    available_quantity=total_qty,
-                    rented_quantity=0,
-                )
-                db.add(inv)
-                db.commit()
-                db.refresh(inv)
-                print(f"Created inventory id={inv.id} bike_id={inv.bike_id} total={inv.total_quantity}")
+HISTORY_DAYS = 730  # bookings start between two years ago ...
+FUTURE_DAYS = 60  # ... and two months ahead
+OWNER_SHARE = 0.7  # owners per shop; some owners run several shops
+
+FIRST_NAMES = np.array(["Aarav", "Maya", "Liam", "Noah", "Emma", "Olivia", "Arjun", "Sofia", "Lucas", "Zara",
+                        "Ethan", "Isha", "Mateo", "Chloe", "Ravi", "Nina", "Omar", "Lena", "Kai", "Priya"])
+LAST_NAMES = np.array(["Sharma", "Smith", "Garcia", "Khan", "Müller", "Rossi", "Tanaka", "Silva", "Patel", "Brown",
+                       "Nguyen", "Kim", "Lopez", "Singh", "Wilson", "Cohen", "Ali", "Novak", "Martin", "Reyes"])
+CITIES = np.array(["Bangalore", "Mumbai", "Delhi", "Goa", "Pune", "Chennai", "Jaipur", "Hyderabad", "Kolkata",
+                   "Manali", "Rishikesh", "Udaipur", "Mysore", "Kochi", "Leh", "Shimla", "Ooty", "Pondicherry"])
+BIKE_TYPES = np.array(["scooty", "bike", "car"])
+BIKE_TYPE_WEIGHTS = np.array([0.40, 0.45, 0.15])
+ENGINE_CC = {"scooty": [110, 125, 150], "bike": [150, 200, 250, 350, 500], "car": [1000, 1200, 1500, 2000]}
+BASE_DAY_PRICE = {"scooty": 600, "bike": 1200, "car": 4000}  # cents, before noise
+MODELS = np.array(["Activa", "Jupiter", "Pulsar", "Classic", "Himalayan", "Duke", "Swift", "i20", "Nexon", "Thar"])
+CONDITIONS = np.array(["excellent", "good", "fair"])
+RATINGS = np.array([5, 4, 3, 2, 1])
+RATING_WEIGHTS = np.array([0.42, 0.30, 0.14, 0.07, 0.07])
+COMMENTS = np.array(["Great ride", "Smooth pickup", "Bike was clean", "Friendly staff", "Could be cheaper",
+                     "Brakes felt soft", "Would rent again", ""], dtype=object)
+
+TABLE_CODES = {"users": 1, "shops": 2, "bikes": 3, "bike_inventory": 4, "bookings": 5, "reviews": 6}
+
+
+def rng_for(seed: int, table: str, chunk: int) -> np.random.Generator:
+    """Independent, reproducible stream per (seed, table, chunk)."""
+    return np.random.default_rng([seed, TABLE_CODES[table], chunk])
+
+
+def zipf_weights(n: int, exponent: float, rng: np.random.Generator) -> np.ndarray:
+    """Popularity weights 1/rank**exponent, assigned to items in random order."""
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    rng.shuffle(weights)
+    return weights / weights.sum()
+
+
+def sample(cdf: np.ndarray, size: int, rng: np.random.Generator) -> np.ndarray:
+    """Indices drawn from a cumulative distribution (faster than rng.choice(p=...) on big arrays)."""
+    return np.minimum(np.searchsorted(cdf, rng.random(size), side="right"), len(cdf) - 1)
+
+
+def day_weights(first_day: np.datetime64, n_days: int) -> np.ndarray:
+    """Summer peak (about +60% in July vs January) and a 30% weekend uplift."""
+    days = first_day + np.arange(n_days)
+    day_of_year = (days - days.astype("datetime64[Y]")).astype(int)
+    season = 1.0 + 0.3 * np.sin(2 * np.pi * (day_of_year - 105) / 365.0)
+    weekday = (days.astype("datetime64[D]").view("int64") + 3) % 7  # Monday = 0
+    weights = season * np.where(weekday >= 5, 1.3, 1.0)
+    return weights / weights.sum()
+
+
+def schedule_active(bike, start, end, active, bike_total, schedules) -> np.ndarray:
+    """Which of the candidate active bookings fit their bike's schedule.
+
+    ``schedules[bike]`` holds the (start, end) windows accepted so far (across
+    chunks); a candidate is accepted if the bike has a free unit and the window
+    overlaps none of them.
+    """
+    keep = np.zeros(len(bike), dtype=bool)
+    candidates = np.flatnonzero(active)
+    starts = start[candidates].astype("int64").tolist()
+    ends = end[candidates].astype("int64").tolist()
+    for i, b, s, e in zip(candidates.tolist(), bike[candidates].tolist(), starts, ends):
+        windows = schedules.setdefault(b, [])
+        if len(windows) < bike_total[b] and all(e <= ws or s >= we for ws, we in windows):
+            windows.append((s, e))
+            keep[i] = True
+    return keep
+
+
+HOUR_WEIGHTS = np.array([0.2, 0.1, 0.1, 0.1, 0.2, 0.5, 1.5, 3, 5, 6, 5, 4, 3.5, 3, 3.5, 3, 2.5, 2, 1.5, 1, 0.8, 0.6, 0.4, 0.3])
+HOUR_CDF = np.cumsum(HOUR_WEIGHTS / HOUR_WEIGHTS.sum())
+
+
+class Loader:
+    """Writes column chunks with COPY (PostgreSQL) or executemany, and keeps per-table stats."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.copy = engine.dialect.name == "postgresql"
+        self.stats: dict[str, tuple[int, float]] = {}
+
+    def write(self, table, columns: dict) -> None:
+        start = time.perf_counter()
+        n = len(next(iter(columns.values())))
+        names = list(columns)
+        with self.engine.begin() as conn:
+            if self.copy:
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(zip(*(_csv_column(columns[name]) for name in names)))
+                buffer.seek(0)
+                cursor = conn.connection.cursor()
+                cursor.copy_expert(f"COPY {table.name} ({', '.join(names)}) FROM STDIN WITH (FORMAT csv)", buffer)
             else:
-                print(f"Inventory already exists id={inv.id} bike_id={inv.bike_id}")
-            return inv
-
-        inv1 = get_or_create_inventory(scooty, 5)
-        inv2 = get_or_create_inventory(bike, 3)
-        inv3 = get_or_create_inventory(car, 2)
-
-        # Booking by customer for one bike
-        # Create a booking with start now, end tomorrow
-        existing_booking = db.query(models.Booking).filter(models.Booking.customer_id == customer.id, models.Booking.bike_id == bike.id).first()
-        if not existing_booking:
-            start = tz.now()
-            end = start + timedelta(days=1)
-            total_price = bike.price_per_day
-            booking = models.Booking(
-                customer_id=customer.id,
-                bike_id=bike.id,
-                start_time=start,
-                end_time=end,
-                status="confirmed",
-                total_price=total_price,
-            )
-            db.add(booking)
-            # decrement inventory available_quantity and increment rented_quantity if inventory exists
-            if inv2 and inv2.available_quantity > 0:
-                inv2.available_quantity -= 1
-                inv2.rented_quantity += 1
-                db.add(inv2)
-            db.commit()
-            db.refresh(booking)
-            print(f"Created booking id={booking.id} customer_id={booking.customer_id} bike_id={booking.bike_id}")
-        else:
-            print(f"Booking already exists id={existing_booking.id}")
-
-        # Summary counts
-        users_count = db.query(models.User).count()
-        shops_count = db.query(models.Shop).count()
-        bikes_count = db.query(models.Bike).count()
-        inv_count = db.query(models.BikeInventory).count()
-        bookings_count = db.query(models.Booking).count()
-        print("Summary:")
-        print(f" Users: {users_count}")
-        print(f" Shops: {shops_count}")
-        print(f" Bikes: {bikes_count}")
-        print(f" Inventories: {inv_count}")
-        print(f" Bookings: {bookings_count}")
-
-    except IntegrityError as e:
-        db.rollback()
-        print(f"IntegrityError: {e}")
-    except Exception as e:
-        db.rollback()
-        print(f"Error: {e}")
-    finally:
-        db.close()
+                values = [_python_column(columns[name]) for name in names]
+                conn.execute(table.insert(), [dict(zip(names, row)) for row in zip(*values)])
+        rows, seconds = self.stats.get(table.name, (0, 0.0))
+        self.stats[table.name] = (rows + n, seconds + time.perf_counter() - start)
+
+    def reset_sequence(self, table) -> None:
+        if self.copy:
+            with self.engine.begin() as conn:
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), (SELECT max(id) FROM {table.name}))"
+                ))
+
+
+def _csv_column(column):
+    if isinstance(column, np.ndarray) and np.issubdtype(column.dtype, np.datetime64):
+        strings = np.datetime_as_string(column, unit="s")
+        strings[np.isnat(column)] = ""  # NULL
+        return strings.tolist()
+    return column.tolist() if isinstance(column, np.ndarray) else column
+
+
+def _python_column(column):
+    if isinstance(column, np.ndarray) and np.issubdtype(column.dtype, np.datetime64):
+        return column.astype("datetime64[us]").tolist()  # datetime.datetime (None for NaT)
+    return column.tolist() if isinstance(column, np.ndarray) else column
+
+
+def next_id(table) -> int:
+    with engine.connect() as conn:
+        return (conn.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+def chunks(total: int, size: int):
+    for index, offset in enumerate(range(0, total, size)):
+        yield index, offset, min(size, total - offset)
+
+
+def generate(args) -> None:
+    n_users, n_shops, n_bikes, n_bookings, n_reviews = SCALES[args.scale]
+    n_users, n_shops, n_bikes = args.users or n_users, args.shops or n_shops, args.bikes or n_bikes
+    n_bookings = args.bookings if args.bookings is not None else n_bookings
+    n_reviews = args.reviews if args.reviews is not None else n_reviews
+    n_owners = max(1, int(n_shops * OWNER_SHARE))
+    if n_users <= n_owners:
+        raise SystemExit(f"--users must exceed the {n_owners} shop owners needed for {n_shops} shops")
+
+    loader = Loader(engine)
+    now = np.datetime64(args.now or datetime.now(timezone.utc).replace(tzinfo=None), "s")
+    password = hash_password("password")
+    setup_rng = np.random.default_rng([args.seed, 0])
+
+    # Users: the first n_owners are shop owners, the rest customers
+    first_user = next_id(User.__table__)
+    for index, offset, size in chunks(n_users, args.chunk_size):
+        rng = rng_for(args.seed, "users", index)
+        ids = np.arange(first_user + offset, first_user + offset + size)
+        created = now - rng.integers(0, HISTORY_DAYS * 86400, size).astype("timedelta64[s]")
+        loader.write(User.__table__, {
+            "id": ids,
+            "email": [f"user{i}@example.com" for i in ids.tolist()],
+            "password": [password] * size,
+            "firstname": rng.choice(FIRST_NAMES, size),
+            "lastname": rng.choice(LAST_NAMES, size),
+            "phone_number": [f"+91{n:010d}" for n in rng.integers(0, 10 ** 10, size).tolist()],
+            "user_type": np.where(ids - first_user < n_owners, "shop_owner", "customer"),
+            "created_at": created,
+            "updated_at": created,
+        })
+        report(loader, "users", offset + size, n_users)
+    owners = np.arange(first_user, first_user + n_owners)
+    customers = (first_user + n_owners, first_user + n_users)  # half-open id range
+
+    # Shops: Zipf-skewed cities; owners[i % n_owners] so some owners run several shops
+    first_shop = next_id(Shop.__table__)
+    shop_ids = np.arange(first_shop, first_shop + n_shops)
+    city_cdf = np.cumsum(zipf_weights(len(CITIES), 1.0, setup_rng))
+    for index, offset, size in chunks(n_shops, args.chunk_size):
+        rng = rng_for(args.seed, "shops", index)
+        ids = shop_ids[offset:offset + size]
+        created = now - rng.integers(HISTORY_DAYS * 86400 // 2, HISTORY_DAYS * 86400, size).astype("timedelta64[s]")
+        loader.write(Shop.__table__, {
+            "id": ids,
+            "name": [f"Rentals #{i}" for i in ids.tolist()],
+            "description": ["Bikes, scooties and cars for rent"] * size,
+            "owner_id": owners[np.arange(offset, offset + size) % n_owners],
+            "phone_number": [f"+91{n:010d}" for n in rng.integers(0, 10 ** 10, size).tolist()],
+            "address": [f"{n} Market Road" for n in rng.integers(1, 500, size).tolist()],
+            "city": CITIES[sample(city_cdf, size, rng)],
+            "state": [None] * size,
+            "zip_code": [f"{n:06d}" for n in rng.integers(100000, 999999, size).tolist()],
+            "is_active": np.ones(size, dtype=bool),
+            "created_at": created,
+            "updated_at": created,
+        })
+    report(loader, "shops", n_shops, n_shops)
+
+    # Bikes: shop sizes are skewed (a few big rental chains, many small shops); inventory is written after bookings
+    first_bike = next_id(Bike.__table__)
+    bike_total = np.zeros(n_bikes, dtype=np.int64)
+    bike_created = np.empty(n_bikes, dtype="datetime64[s]")
+    bike_shop = np.sort(shop_ids[sample(np.cumsum(zipf_weights(n_shops, 0.6, setup_rng)), n_bikes, setup_rng)])
+    bike_types = BIKE_TYPES[sample(np.cumsum(BIKE_TYPE_WEIGHTS), n_bikes, setup_rng)]
+    base = np.vectorize(BASE_DAY_PRICE.get)(bike_types)
+    price_per_day = (base * setup_rng.lognormal(0, 0.25, n_bikes)).astype(np.int64) // 10 * 10
+    price_per_hour = np.maximum(price_per_day // 6 // 10 * 10, 50)
+    for index, offset, size in chunks(n_bikes, args.chunk_size):
+        rng = rng_for(args.seed, "bikes", index)
+        ids = np.arange(first_bike + offset, first_bike + offset + size)
+        types = bike_types[offset:offset + size]
+        created = now - rng.integers(0, HISTORY_DAYS * 86400 // 2, size).astype("timedelta64[s]")
+        models = rng.choice(MODELS, size)
+        loader.write(Bike.__table__, {
+            "id": ids,
+            "shop_id": bike_shop[offset:offset + size],
+            "name": [f"{m} {i}" for m, i in zip(models.tolist(), ids.tolist())],
+            "model": models,
+            "bike_type": types,
+            "engine_cc": [int(rng.choice(ENGINE_CC[t])) for t in types.tolist()],
+            "description": [None] * size,
+            "price_per_hour": price_per_hour[offset:offset + size],
+            "price_per_day": price_per_day[offset:offset + size],
+            "condition": CONDITIONS[sample(np.cumsum([0.3, 0.55, 0.15]), size, rng)],
+            "is_available": rng.random(size) > 0.03,
+            "created_at": created,
+            "updated_at": created,
+        })
+        bike_total[offset:offset + size] = rng.choice([1, 1, 1, 2, 2, 3, 5], size)
+        bike_created[offset:offset + size] = created
+        report(loader, "bikes", offset + size, n_bikes)
+
+    # Bookings: hot bikes, seasonal/weekly/daily peaks, mostly hourly rentals; active ones fit their bike's stock
+    first_booking = next_id(Booking.__table__)
+    schedules: dict[int, list[tuple[int, int]]] = {}  # bike index -> accepted active windows
+    bike_weights = setup_rng.lognormal(0, 1.3, n_bikes)  # heavy tail: ~20% of bikes get ~2/3 of bookings
+    bike_weights /= bike_weights.sum()
+    bike_cdf = np.cumsum(bike_weights)
+    first_day = (now - np.timedelta64(HISTORY_DAYS, "D")).astype("datetime64[D]")
+    day_cdf = np.cumsum(day_weights(first_day, HISTORY_DAYS + FUTURE_DAYS))
+    for index, offset, size in chunks(n_bookings, args.chunk_size):
+        rng = rng_for(args.seed, "bookings", index)
+        bike = sample(bike_cdf, size, rng)
+        start = (
+            (first_day + sample(day_cdf, size, rng)).astype("datetime64[s]")
+            + (sample(HOUR_CDF, size, rng) * 3600).astype("timedelta64[s]")
+            + (rng.integers(0, 4, size) * 900).astype("timedelta64[s]")
+        )
+        daily = rng.random(size) < 0.3
+        hours = np.where(daily, 0, np.minimum(rng.geometric(0.35, size), 12))
+        days = np.where(daily, np.minimum(rng.geometric(0.45, size), 14), 0)
+        seconds = days * 86400 + hours * 3600
+        end = start + seconds.astype("timedelta64[s]")
+        price = days * price_per_day[bike] + np.minimum(hours * price_per_hour[bike], price_per_day[bike])
+
+        past, future = end < now, start > now
+        roll = rng.random(size)
+        status = np.select(
+            [past & (roll < 0.80), past & (roll < 0.95), past, future & (roll < 0.70), future & (roll < 0.90), future],
+            ["completed", "cancelled", "confirmed", "confirmed", "pending", "cancelled"],
+            default="confirmed",  # in progress
+        )
+        active = np.isin(status, ["pending", "confirmed"])
+        rejected = active & ~schedule_active(bike, start, end, active, bike_total, schedules)
+        status = np.where(rejected, np.where(past, "completed", "cancelled"), status)
+        created = np.minimum(start - (rng.exponential(5 * 86400, size)).astype("timedelta64[s]"), now)
+        confirmed = np.isin(status, ["confirmed", "completed"])
+        nat = np.datetime64("NaT", "s")
+        loader.write(Booking.__table__, {
+            "id": np.arange(first_booking + offset, first_booking + offset + size),
+            "customer_id": rng.integers(*customers, size),
+            "bike_id": first_bike + bike,
+            "start_time": start,
+            "end_time": end,
+            "status": status,
+            "total_price": price,
+            "created_at": created,
+            "updated_at": np.where(status == "completed", end, created),
+            "confirmed_at": np.where(confirmed, created + np.timedelta64(600, "s"), nat),
+            "completed_at": np.where(status == "completed", end, nat),
+        })
+        report(loader, "bookings", offset + size, n_bookings)
+
+    # Inventory: counters from the bookings that stayed active
+    first_inventory = next_id(BikeInventory.__table__)
+    rented = np.zeros(n_bikes, dtype=np.int64)
+    for b, windows in schedules.items():
+        rented[b] = len(windows)
+    for index, offset, size in chunks(n_bikes, args.chunk_size):
+        created = bike_created[offset:offset + size]
+        loader.write(BikeInventory.__table__, {
+            "id": np.arange(first_inventory + offset, first_inventory + offset + size),
+            "bike_id": np.arange(first_bike + offset, first_bike + offset + size),
+            "shop_id": bike_shop[offset:offset + size],
+            "total_quantity": bike_total[offset:offset + size],
+            "available_quantity": bike_total[offset:offset + size] - rented[offset:offset + size],
+            "rented_quantity": rented[offset:offset + size],
+            "version": np.ones(size, dtype=np.int64),
+            "created_at": created,
+            "updated_at": created,
+        })
+        report(loader, "bike_inventory", offset + size, n_bikes)
+
+    # Reviews: busier shops get more reviews; ratings lean positive
+    first_review = next_id(Review.__table__)
+    shop_weights = np.bincount(np.searchsorted(shop_ids, bike_shop), weights=bike_weights, minlength=n_shops)
+    shop_cdf = np.cumsum(shop_weights / shop_weights.sum())
+    for index, offset, size in chunks(n_reviews, args.chunk_size):
+        rng = rng_for(args.seed, "reviews", index)
+        created = now - rng.integers(0, HISTORY_DAYS * 86400, size).astype("timedelta64[s]")
+        comments = rng.choice(COMMENTS, size)
+        loader.write(Review.__table__, {
+            "id": np.arange(first_review + offset, first_review + offset + size),
+            "customer_id": rng.integers(*customers, size),
+            "shop_id": shop_ids[sample(shop_cdf, size, rng)],
+            "rating": RATINGS[sample(np.cumsum(RATING_WEIGHTS), size, rng)],
+            "comment": [c or None for c in comments.tolist()],
+            "created_at": created,
+            "updated_at": created,
+        })
+        report(loader, "reviews", offset + size, n_reviews)
+
+    for table in (User, Shop, Bike, BikeInventory, Booking, Review):
+        loader.reset_sequence(table.__table__)
+
+    print("\ntable              rows      seconds      rows/s")
+    for name, (rows, seconds) in loader.stats.items():
+        print(f"{name:14} {rows:>12,} {seconds:>10.1f} {rows / seconds if seconds else 0:>12,.0f}")
+
+
+def report(loader: Loader, name: str, done: int, total: int) -> None:
+    rows, seconds = loader.stats.get(name, (0, 0.0))
+    print(f"{name:10} {done:>12,}/{total:,}  {rows / seconds if seconds else 0:>10,.0f} rows/s", flush=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="small", help="Preset sizes (overridable below)")
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--shops", type=int)
+    parser.add_argument("--bikes", type=int)
+    parser.add_argument("--bookings", type=int)
+    parser.add_argument("--reviews", type=int)
+    parser.add_argument("--seed", type=int, default=42, help="Same seed and chunk size give the same data")
+    parser.add_argument("--now", type=datetime.fromisoformat, help="Reference UTC time, e.g. 2026-06-01T00:00:00")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Rows per COPY/executemany transaction")
+    return parser
+
+
+def main():
+    generate(build_parser().parse_args())
 
 
 if __name__ == "__main__":
-    create_sample_data()
+    main()
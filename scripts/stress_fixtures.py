@@ -0,0 +1,110 @@
+"""Throwaway data and the inventory oracle shared by the concurrency scripts.
+
+check_cart_concurrency.py, bench_bike_locks.py and check_booking_races.py
+each seed an owner, customers, one shop and its bikes, hammer the API, then
+check that every bike's counters still match its active bookings:
+
+    rented_quantity    == pending + confirmed bookings
+    available_quantity == total_quantity - rented_quantity
+
+Deleting the seeded users afterwards cascades to their shop, bikes,
+inventory and bookings.
+"""
+import uuid
+from collections import Counter
+
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
+
+from app.api.v1.oauth2 import create_access_token
+from app.db.database import SessionLocal
+from app.db.models import Bike, BikeInventory, Booking, Shop, User
+
+ACTIVE_STATUSES = ("pending", "confirmed")
+
+
+def make_user(kind: str, label: str) -> User:
+    return User(
+        email=f"{label.lower().replace(' ', '-')}-{uuid.uuid4().hex[:8]}@example.com", password="x",
+        firstname=label.split()[0], lastname="Check", phone_number="0000000000", user_type=kind,
+    )
+
+
+def seed_shop(label: str, n_bikes: int, n_customers: int, quantity: int) -> tuple[int, list[int], list[int]]:
+    """Create owner, customers, shop and bikes; return (owner_id, customer_ids, bike_ids)."""
+    db = SessionLocal()
+    try:
+        owner = make_user("shop_owner", label)
+        customers = [make_user("customer", label) for _ in range(n_customers)]
+        db.add_all([owner, *customers])
+        db.flush()
+        shop = Shop(name=label, owner_id=owner.id, phone_number="0000000000", address=f"1 {label} St", city=label)
+        db.add(shop)
+        db.flush()
+        bikes = [
+            Bike(shop_id=shop.id, name=f"{label} {i}", model="T", bike_type="bike", price_per_hour=100, price_per_day=1000)
+            for i in range(n_bikes)
+        ]
+        db.add_all(bikes)
+        db.flush()
+        db.add_all([
+            BikeInventory(bike_id=b.id, shop_id=shop.id, total_quantity=quantity,
+                          available_quantity=quantity, rented_quantity=0)
+            for b in bikes
+        ])
+        db.commit()
+        return owner.id, [c.id for c in customers], [b.id for b in bikes]
+    finally:
+        db.close()
+
+
+def auth_headers(user_id: int) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'user_id': user_id})}"}
+
+
+def active_bookings(db, bike_ids: list[int]) -> Counter:
+    """Pending + confirmed bookings per bike."""
+    return Counter(dict(
+        db.query(Booking.bike_id, func.count(Booking.id)).filter(
+            Booking.bike_id.in_(bike_ids), Booking.status.in_(ACTIVE_STATUSES)
+        ).group_by(Booking.bike_id).all()
+    ))
+
+
+def overlapping_pairs(db, bike_ids: list[int]) -> int:
+    """Pairs of active bookings on the same bike whose windows overlap."""
+    other = aliased(Booking)
+    return db.query(func.count()).select_from(Booking).join(
+        other, (other.bike_id == Booking.bike_id) & (other.id > Booking.id)
+    ).filter(
+        Booking.bike_id.in_(bike_ids), Booking.status.in_(ACTIVE_STATUSES), other.status.in_(ACTIVE_STATUSES),
+        Booking.start_time < other.end_time, Booking.end_time > other.start_time,
+    ).scalar()
+
+
+def counter_drift(bike_ids: list[int]) -> list[str]:
+    """One line per bike whose inventory counters disagree with its active bookings."""
+    db = SessionLocal()
+    try:
+        active = active_bookings(db, bike_ids)
+        problems = []
+        for inventory in db.query(BikeInventory).filter(BikeInventory.bike_id.in_(bike_ids)).order_by(BikeInventory.bike_id):
+            rented = active[inventory.bike_id]
+            if inventory.rented_quantity != rented or inventory.available_quantity != inventory.total_quantity - rented:
+                problems.append(
+                    f"bike {inventory.bike_id}: total={inventory.total_quantity} "
+                    f"available={inventory.available_quantity} (expected {inventory.total_quantity - rented}) "
+                    f"rented={inventory.rented_quantity} (expected {rented})"
+                )
+        return problems
+    finally:
+        db.close()
+
+
+def cleanup(user_ids: list[int]) -> None:
+    db = SessionLocal()
+    try:
+        db.query(User).filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()